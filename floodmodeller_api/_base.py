@@ -22,14 +22,33 @@ import logging
 from pathlib import Path
 from typing import NoReturn
 
+from . import backup as _backup
 from .backup import File
-from .diff import check_item_with_dataframe_equal
+from .diff import check_digest_equal, check_item_with_dataframe_equal
+from .snapshot import read_snapshot, write_snapshot
 from .to_from_json import Jsonable
 from .units._base import Unit
 from .units.iic import IIC
 from .urban1d._base import UrbanSubsection, UrbanUnit
 from .util import FloodModellerAPIError, handle_exception
 
+# attributes which don't need to be the same for two files to be equal
+_NOT_COMPARED = frozenset(
+    (
+        "_filepath",
+        "_raw_data",
+        "_raw_snapshot",
+        "_gxy_filepath",
+        "_gxy_data",
+        "_xmltree",
+        "_xsd",
+        "_xsdschema",
+        "_schema",
+        "file",
+        "_log_path",
+    ),
+)
+
 
 class FMFile(Jsonable):
     """Base class for all Flood Modeller File types"""
@@ -39,7 +58,12 @@ class FMFile(Jsonable):
     MAX_DIFF = 25
     ENCODING = "cp1252"
 
-    def __init__(self, filepath: str | Path | None = None, **kwargs):
+    def __init__(
+        self,
+        filepath: str | Path | None = None,
+        backup: bool | None = None,
+        **kwargs,
+    ):
         if filepath is not None:
             self._filepath = Path(filepath)
             # * Add check or fix for path lengths greater than DOS standard length of 260 characters
@@ -54,11 +78,15 @@ class FMFile(Jsonable):
                     f"then use the .save() method to save to a new filepath"
                 )
                 raise FileNotFoundError(msg)
-            # If the file is not a ZZN file, then perform a backup
+            # If the file is not a ZZN file, then perform a backup, unless disabled globally or for this file
             # This performs a conditional back up, only copying the file if an equivalent copy doesn't already exist
             if self._filetype != "ZZN":
                 file = File(path=self._filepath)
-                file.backup()
+                if _backup.BACKUPS_ENABLED if backup is None else backup:
+                    if _backup.BACKGROUND_BACKUPS:
+                        _backup.backup_in_background(file)
+                    else:
+                        file.backup()
                 # Add the file object as a property to expose the restore method
                 self.file = file
 
@@ -96,6 +124,7 @@ class FMFile(Jsonable):
             raise UserWarning(msg)
 
         string = self._write()
+        _backup.flush(self._filepath)  # so a pending backup isn't made of the updated file
         with open(self._filepath, "w", encoding=self.ENCODING, newline="\r\n") as _file:
             _file.write(string)
         logging.info("%s File Updated!", self._filepath)
@@ -110,14 +139,52 @@ class FMFile(Jsonable):
             Path.mkdir(filepath.parent)
 
         string = self._write()
+        _backup.flush(filepath)
         with open(filepath, "w", encoding=self.ENCODING, newline="\r\n") as _file:
             _file.write(string)
         self._filepath = filepath  # Updates the filepath attribute to the given path
 
         logging.info("%s File Saved to: %s", self._filetype, filepath)
 
+    def to_snapshot(self, filepath: str | Path) -> None:
+        """Writes the object to a binary snapshot file. Reading the snapshot with
+        ``from_snapshot()`` is much faster than reading the original file, so snapshots can be used
+        to cache files or pass them between processes. Snapshots can only be read by the same
+        version of the API.
+
+        Args:
+            filepath (str | Path): Path of the snapshot file to write.
+        """
+        write_snapshot(self, filepath)
+
+    @classmethod
+    def from_snapshot(cls, filepath: str | Path):
+        """Reads an object from a snapshot file written by ``to_snapshot()``. Snapshots are
+        pickles, so only read snapshots from a trusted source.
+
+        Args:
+            filepath (str | Path): Path of the snapshot file.
+
+        Raises:
+            TypeError: If the snapshot is of a different class.
+
+        Returns:
+            The object, as it was when the snapshot was written.
+        """
+        obj = read_snapshot(filepath)
+        if not isinstance(obj, cls):
+            msg = f"Snapshot contains a {type(obj).__name__} object, not {cls.__name__}"
+            raise TypeError(msg)
+        return obj
+
+    def _get_snapshot_state(self) -> dict:
+        return self.__dict__
+
+    def _set_snapshot_state(self, state: dict) -> None:
+        self.__dict__.update(state)
+
     @handle_exception(when="compare")
-    def _diff(self, other, force_print=False) -> None:
+    def _diff(self, other, force_print=False, max_report=None) -> None:
         def _format_diff(diff_list, max_items=None) -> str:
             return "\n".join(
                 f"  {name}:  {reason}"
@@ -127,7 +194,7 @@ class FMFile(Jsonable):
         if self._filetype != other._filetype:
             msg = "Cannot compare objects of different filetypes"
             raise TypeError(msg)
-        diff = self._get_diff(other)
+        diff = self._get_diff(other, max_report=max_report)
         if diff[0]:
             logging.info("No difference, files are equivalent")
             return
@@ -140,33 +207,35 @@ class FMFile(Jsonable):
         )
         logging.info("Files not equivalent, %s difference(s) found:\n%s", len(diff[1]), differences)
 
-    def _get_diff(self, other):
-        return self.__eq__(other, return_diff=True)  # pylint: disable=unnecessary-dunder-call
+    def _get_diff(self, other, max_report=None):
+        return self.__eq__(  # pylint: disable=unnecessary-dunder-call
+            other,
+            return_diff=True,
+            max_report=max_report,
+        )
+
+    def _get_digest_state(self) -> dict:
+        return {key: item for key, item in self.__dict__.items() if key not in _NOT_COMPARED}
 
     def _handle_exception(self, err, when) -> NoReturn:
         filepath_or_none = self._filepath if hasattr(self, "_filepath") else None
         raise FloodModellerAPIError(err, when, self._filetype, filepath_or_none) from err
 
-    def __eq__(self, other, return_diff=False):
+    def __eq__(self, other, return_diff=False, max_report=None):
         if not isinstance(other, FMFile):
             return NotImplemented if not return_diff else (False, ["Type mismatch"])
 
+        if not return_diff:
+            result = check_digest_equal(self, other)
+            if result is not None:
+                return result
+
         result = True
         diff = []
         try:
             for key, item in self.__dict__.items():
                 try:
-                    if key in (
-                        "_filepath",
-                        "_raw_data",
-                        "_gxy_filepath",
-                        "_gxy_data",
-                        "_xmltree",
-                        "_xsd",
-                        "_xsdschema",
-                        "file",
-                        "_log_path",
-                    ):
+                    if key in _NOT_COMPARED:
                         continue
                     _result, diff = check_item_with_dataframe_equal(
                         item,
@@ -174,6 +243,7 @@ class FMFile(Jsonable):
                         name=f"{self._filetype}->{key}",
                         diff=diff,
                         special_types=(Unit, IIC, UrbanUnit, UrbanSubsection),
+                        max_report=max_report,
                     )
                     if not _result:
                         result = False
@@ -16,19 +16,231 @@ address: Jacobs UK Limited, Flood Modeller, Cottons Centre, Cottons Lane, London
 
 from __future__ import annotations
 
+import atexit
+import difflib
 import filecmp
+import gzip
+import json
 import logging
+import os
 import re
+import sqlite3
 import tempfile
-from datetime import datetime
-from hashlib import sha1
+import threading
+import time
+import warnings
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import closing, contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from hashlib import sha1, sha256
 from pathlib import Path
-from shutil import copy
-
-import pandas as pd
+from shutil import copyfileobj
 
 from .to_from_json import Jsonable
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Files are only backed up when loaded while this is True. It can also be overridden for a single
+# file using the 'backup' argument of each file class, e.g. DAT(filepath, backup=False)
+BACKUPS_ENABLED = True
+
+# Backups are made on a background thread pool when this is True, so files can be read while they
+# are backed up. Pending backups are completed by flush(), which is also called at exit.
+BACKGROUND_BACKUPS = False
+BACKGROUND_WORKERS = 4
+
+# Backups are compressed with 'zstd' (if the zstandard package is installed, otherwise 'gzip'),
+# 'gzip' or not at all if None
+COMPRESSION: str | None = None
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+# When True, the previous backup of a file is replaced by the lines changed between it and each new
+# backup, so only the newest backup of each file is stored in full
+DELTA_BACKUPS = False
+DELTA_SUFFIX = ".delta"
+
+CHUNK_SIZE = 2**20
+
+# Seconds to wait for another process to finish writing to the backup catalogue
+CATALOGUE_TIMEOUT = 30
+
+LEGACY_BACKUP_PATTERN = re.compile(r"^[0-9a-f]{40}_")
+
+# Backups are named by the time they're made to the microsecond, which is unique within a process
+BACKUP_DTTM_FORMAT = "%Y-%m-%d-%H-%M-%S-%f"
+_last_dttm = datetime.min
+_dttm_lock = threading.Lock()
+
+
+@dataclass
+class RetentionPolicy:
+    """Limits on the backups kept, applied by ``BackupControl.evict()`` after each new backup.
+    Backups are removed oldest first until every limit is met, and a limit of None is unlimited.
+
+    Args:
+        max_versions (int, optional): Maximum number of backups kept for each file.
+        max_bytes (int, optional): Maximum total size of the stored backups, counting contents
+            shared by several backups once.
+        max_age (timedelta, optional): Maximum age of a backup.
+    """
+
+    max_versions: int | None = None
+    max_bytes: int | None = None
+    max_age: timedelta | None = None
+
+    @property
+    def is_unlimited(self) -> bool:
+        return self.max_versions is None and self.max_bytes is None and self.max_age is None
+
+
+# Retention policy applied to all backups, e.g. backup.RETENTION_POLICY.max_versions = 10
+RETENTION_POLICY = RetentionPolicy()
+
+
+def file_digest(path: str | Path) -> str:
+    """Returns the SHA-256 digest of the contents of a file, read in chunks"""
+    digest = sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _get_compression() -> str | None:
+    if COMPRESSION not in COMPRESSION_SUFFIXES:
+        msg = f"Unsupported backup compression: '{COMPRESSION}'. Use 'zstd', 'gzip' or None."
+        raise ValueError(msg)
+    if COMPRESSION == "zstd" and zstandard is None:
+        return "gzip"
+    return COMPRESSION
+
+
+def _open_compressed(path: Path, mode: str, compression: str | None):
+    if compression == "gzip":
+        return gzip.open(path, mode)
+    if compression == "zstd":
+        if zstandard is None:
+            msg = f"The zstandard package is required to read {path}"
+            raise ImportError(msg)
+        return zstandard.open(path, mode)
+    return open(path, mode)
+
+
+def _open_backup(path: Path):
+    """Opens a stored backup for reading, decompressing it according to its suffix"""
+    compression = {suffix: name for name, suffix in COMPRESSION_SUFFIXES.items() if name}
+    return _open_compressed(path, "rb", compression.get(path.suffix))
+
+
+def _stored_suffix(filename: str) -> str:
+    """Returns everything after the file id and datetime, e.g. '.DAT.delta.gz'"""
+    idx = filename.find(".")
+    return "" if idx < 0 else filename[idx:]
+
+
+def line_delta(new: bytes, old: bytes) -> list:
+    """Describes how to rebuild 'old' from the lines of 'new', as a list of [start, end] ranges of
+    lines copied from 'new' and strings of lines only in 'old'"""
+    new_lines = new.splitlines(keepends=True)
+    old_lines = old.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, new_lines, old_lines)
+    delta: list = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append([i1, i2])
+        elif j2 > j1:
+            # bytes are decoded as latin-1 so that any byte round trips through json
+            delta.append(b"".join(old_lines[j1:j2]).decode("latin-1"))
+    return delta
+
+
+def apply_line_delta(new: bytes, delta: list) -> bytes:
+    """Rebuilds the contents described by a delta from 'line_delta'"""
+    new_lines = new.splitlines(keepends=True)
+    parts = [
+        b"".join(new_lines[op[0] : op[1]]) if isinstance(op, list) else op.encode("latin-1")
+        for op in delta
+    ]
+    return b"".join(parts)
+
+
+def _unique_dttm() -> str:
+    """Returns the current time as a string for a backup filename. Each call in a process returns a
+    later time than the last, so backups of a file made in quick succession never share a name."""
+    global _last_dttm
+    with _dttm_lock:
+        _last_dttm = max(datetime.now(), _last_dttm + timedelta(microseconds=1))
+        return _last_dttm.strftime(BACKUP_DTTM_FORMAT)
+
+
+# Catalogues which have been initialised by this process
+_initialised_catalogues: set[Path] = set()
+_catalogues_lock = threading.Lock()
+
+_executor: ThreadPoolExecutor | None = None
+_pending: dict[Path, Future] = {}
+_pending_lock = threading.Lock()
+
+
+def backup_in_background(file: File) -> Future:
+    """Backs up a file on the background thread pool. Backups of the same file are made in the
+    order they are submitted.
+
+    Args:
+        file (File): The file to back up.
+
+    Returns:
+        Future: Completed once the backup has been made.
+    """
+    global _executor
+    key = file.path.absolute()
+    with _pending_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                BACKGROUND_WORKERS,
+                thread_name_prefix="floodmodeller_api_backup",
+            )
+            atexit.register(flush)
+        future = _executor.submit(_backup_after, file, _pending.get(key))
+        _pending[key] = future
+    future.add_done_callback(lambda done: _discard(key, done))
+    return future
+
+
+def _backup_after(file: File, previous: Future | None) -> None:
+    if previous is not None:
+        wait([previous])
+    try:
+        file.backup()
+    except Exception as e:
+        logging.warning("Unable to back up %s: %s", file.path, e)
+        raise
+
+
+def _discard(key: Path, future: Future) -> None:
+    with _pending_lock:
+        if _pending.get(key) is future:
+            del _pending[key]
+
+
+def flush(path: str | Path | None = None, timeout: float | None = None) -> None:
+    """Waits for pending background backups to complete.
+
+    Args:
+        path (str | Path, optional): Only wait for backups of this file. Defaults to all files.
+        timeout (float, optional): Maximum number of seconds to wait. Defaults to no limit.
+    """
+    with _pending_lock:
+        if path is None:
+            futures = list(_pending.values())
+        else:
+            futures = [f for f in (_pending.get(Path(path).absolute()),) if f is not None]
+    wait(futures, timeout)
+
 
 class BackupControl(Jsonable):
     """
@@ -39,15 +251,20 @@ class BackupControl(Jsonable):
         temp_dir (str): The temporary directory used for backups.
         backup_dirname (str): The name of the backup directory.
         backup_dir (str): The full path to the backup directory.
-        backup_csv_path (str): The full path to the backup CSV file.
+        catalogue_path (str): The full path to the SQLite catalogue of backups.
+        objects_dir (str): The directory holding a single copy of each backed up file content,
+            named by its digest. Backups are hard links to these where possible.
 
     Methods:
-        _init_backup(): Initialises the backup directory and creates a CSV file for logging backup information.
+        _init_backup(): Initialises the backup directory and the catalogue of backups. This is done
+            when the catalogue is first used, so a file which isn't backed up doesn't touch the
+            backup directory.
         clear_backup(): Removes all backup files in the backup directory.
+        evict(): Removes backups exceeding the retention policy.
 
     Usage:
         The BackUp class can be used to create backups of files and directories. The backups are stored in a temporary
-        directory and are logged in a CSV file. The backups can be cleared using the clear_backup method.
+        directory and are recorded in a catalogue. The backups can be cleared using the clear_backup method.
 
     Example:
         # Create a new BackUp object
@@ -73,26 +290,119 @@ class BackupControl(Jsonable):
         self.temp_dir = tempfile.gettempdir()
         self.backup_dirname = "floodmodeller_api_backup"
         self.backup_dir = Path(self.temp_dir, self.backup_dirname)
-        self.backup_csv_path = Path(self.backup_dir, "file-backups.csv")
-        self._init_backup()
+        self.catalogue_path = Path(self.backup_dir, "file-backups.sqlite")
+        self.objects_dir = Path(self.backup_dir, "objects")
+
+    @property
+    def backup_csv_path(self) -> Path:
+        """Path of the CSV file which recorded backups before the SQLite catalogue was added.
+
+        .. deprecated::
+            Backups are no longer recorded in this file, use ``catalogue_path`` instead.
+        """
+        warnings.warn(
+            "backup_csv_path is deprecated as backups are no longer recorded in a CSV file, "
+            "use catalogue_path instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return Path(self.backup_dir, "file-backups.csv")
+
+    def _ensure_initialised(self) -> None:
+        """
+        Initialises the backup directory and the catalogue, if not already done by this process.
+        """
+        with _catalogues_lock:
+            if self.catalogue_path in _initialised_catalogues and self.catalogue_path.exists():
+                return
+            self._init_backup()
+            _initialised_catalogues.add(self.catalogue_path)
 
     def _init_backup(self):
         """
-        Initialises the backup directory and creates a CSV file for logging backup information.
+        Initialises the backup directory and the catalogue of backups.
         """
         # Create the backup directory if it doesn't exist
         if not self.backup_dir.exists():
-            self.backup_dir.mkdir()
+            self.backup_dir.mkdir(exist_ok=True)  # may be created by another process meanwhile
             logging.info(
                 "%s: Initialised backup directory at %s",
                 self.__class__.__name__,
                 self.backup_dir,
             )
 
-        # Create the backup CSV file if it doesn't exist
-        if not self.backup_csv_path.exists():
-            with open(self.backup_csv_path, "w", encoding=self.ENCODING) as f:
-                f.write("path,file_id,dttm\n")
+        self.objects_dir.mkdir(exist_ok=True)
+
+        is_new = not self.catalogue_path.exists()
+        if not is_new and "base" in self._catalogue_columns():
+            return  # the catalogue is up to date, so there's no need to lock it
+        with self._locked_catalogue() as con:
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS backups ("
+                "filename TEXT PRIMARY KEY, file_id TEXT NOT NULL, path TEXT NOT NULL, "
+                "dttm TEXT NOT NULL, digest TEXT, size INTEGER NOT NULL, created REAL NOT NULL, "
+                "base TEXT)",
+            )
+            columns = [row[1] for row in con.execute("PRAGMA table_info(backups)")]
+            if "base" not in columns:
+                con.execute("ALTER TABLE backups ADD COLUMN base TEXT")
+            con.execute(
+                "CREATE INDEX IF NOT EXISTS backups_file_id ON backups (file_id, filename)",
+            )
+            con.execute("CREATE INDEX IF NOT EXISTS backups_created ON backups (created)")
+            if is_new:
+                self._index_existing_backups(con)
+
+    def _catalogue_columns(self) -> list[str]:
+        with closing(sqlite3.connect(self.catalogue_path, timeout=CATALOGUE_TIMEOUT)) as con:
+            return [row[1] for row in con.execute("PRAGMA table_info(backups)")]
+
+    def _index_existing_backups(self, con: sqlite3.Connection) -> None:
+        """
+        Adds backups made before the catalogue existed, so they can still be listed and restored.
+        """
+        for f in self.backup_dir.iterdir():
+            if not (f.is_file() and LEGACY_BACKUP_PATTERN.match(f.name)):
+                continue
+            if DELTA_SUFFIX in f.suffixes:
+                continue  # can't be restored without knowing the backup it's relative to
+            stat = f.stat()
+            file_id, dttm = f.name.removesuffix(_stored_suffix(f.name)).split("_", 1)
+            con.execute(
+                "INSERT OR IGNORE INTO backups "
+                "(filename, file_id, path, dttm, digest, size, created) "
+                "VALUES (?, ?, '', ?, NULL, ?, ?)",
+                (f.name, file_id, dttm, stat.st_size, stat.st_mtime),
+            )
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Opens a connection to the catalogue, holding the write lock until the block is complete.
+        Write ahead logging lets other processes keep reading the catalogue in the meantime.
+        """
+        self._ensure_initialised()
+        with self._locked_catalogue() as con:
+            yield con
+
+    @contextmanager
+    def _locked_catalogue(self):
+        with closing(
+            sqlite3.connect(self.catalogue_path, timeout=CATALOGUE_TIMEOUT, isolation_level=None),
+        ) as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("BEGIN IMMEDIATE")
+            try:
+                yield con
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+            con.execute("COMMIT")
+
+    def _query(self, sql: str, parameters: tuple = ()) -> list[tuple]:
+        self._ensure_initialised()
+        with closing(sqlite3.connect(self.catalogue_path, timeout=CATALOGUE_TIMEOUT)) as con:
+            return con.execute(sql, parameters).fetchall()
 
     def clear_backup(self, file_id="*"):
         """
@@ -101,20 +411,120 @@ class BackupControl(Jsonable):
             file_id (str): The ID of the file to clear, default value is "*" to clear all files
                 If this is called from the file class then the file Id of that file will be used
         """
-        # If the user wants to clear a specific file, then suffix * to match it
-        if file_id != "*":
-            file_id = f"{file_id}*"
+        where, parameters = ("", ()) if file_id == "*" else (" WHERE file_id = ?", (file_id,))
+        with self._transaction() as con:
+            removed = con.execute(f"SELECT filename, digest FROM backups{where}", parameters)
+            removed = removed.fetchall()
+            con.execute(f"DELETE FROM backups{where}", parameters)
+        self._remove_backup_files(removed)
+
+    def evict(self, policy: RetentionPolicy | None = None) -> int:
+        """
+        Removes the oldest backups until the retention policy is met.
 
-        files = self.backup_dir.glob(file_id)
-        for f in files:
-            Path(f).unlink()
+        Args:
+            policy (RetentionPolicy, optional): Limits on the backups kept. Defaults to the
+                module level ``RETENTION_POLICY``.
+
+        Returns:
+            int: The number of backups removed.
+        """
+        policy = policy or RETENTION_POLICY
+        if policy.is_unlimited:
+            return 0
+
+        with self._transaction() as con:
+            filenames = set()
+            if policy.max_versions is not None:
+                filenames.update(self._excess_versions(con, policy.max_versions))
+            if policy.max_age is not None:
+                cutoff = time.time() - policy.max_age.total_seconds()
+                rows = con.execute("SELECT filename FROM backups WHERE created < ?", (cutoff,))
+                filenames.update(filename for (filename,) in rows)
+            if policy.max_bytes is not None:
+                filenames.update(self._excess_bytes(con, policy.max_bytes, filenames))
+
+            removed = [
+                con.execute(
+                    "SELECT filename, digest FROM backups WHERE filename = ?",
+                    (filename,),
+                ).fetchone()
+                for filename in filenames
+            ]
+            con.executemany(
+                "DELETE FROM backups WHERE filename = ?",
+                [(filename,) for filename in filenames],
+            )
+        self._remove_backup_files(removed)
+        return len(removed)
+
+    @staticmethod
+    def _excess_versions(con: sqlite3.Connection, max_versions: int) -> list[str]:
+        rows = con.execute(
+            "SELECT filename FROM ("
+            "SELECT filename, ROW_NUMBER() OVER (PARTITION BY file_id ORDER BY filename DESC) AS n "
+            "FROM backups) WHERE n > ?",
+            (max_versions,),
+        )
+        return [filename for (filename,) in rows]
+
+    @staticmethod
+    def _excess_bytes(con: sqlite3.Connection, max_bytes: int, removed: set[str]) -> list[str]:
+        """
+        Finds the oldest backups to remove so that the stored contents fit within max_bytes.
+        Contents shared by several backups are only freed once all of them are removed.
+        """
+        rows = con.execute(
+            "SELECT filename, COALESCE(digest, filename), size FROM backups ORDER BY created",
+        ).fetchall()
+        users: dict[str, int] = {}
+        sizes: dict[str, int] = {}
+        for filename, content, size in rows:
+            if filename not in removed:
+                users[content] = users.get(content, 0) + 1
+                sizes[content] = size
+        total = sum(sizes.values())
+
+        excess = []
+        for filename, content, _ in rows:
+            if total <= max_bytes:
+                break
+            if filename in removed:
+                continue
+            excess.append(filename)
+            users[content] -= 1
+            if users[content] == 0:
+                total -= sizes[content]
+        return excess
+
+    def _remove_backup_files(self, removed: list[tuple[str, str | None]]) -> None:
+        """
+        Removes the files of backups deleted from the catalogue, then any stored contents which are
+        no longer used by a backup.
+        """
+        for filename, digest in removed:
+            Path(self.backup_dir, filename).unlink(missing_ok=True)
+            if digest is not None:
+                object_path = Path(self.objects_dir, digest + _stored_suffix(filename))
+                self._remove_unused_object(object_path)
+
+    @staticmethod
+    def _remove_unused_object(object_path: Path) -> None:
+        try:
+            # an object only linked to by itself isn't used by any backup
+            if object_path.stat().st_nlink <= 1:
+                object_path.unlink(missing_ok=True)
+        except FileNotFoundError:
+            pass
 
 
 def parse_backup_dttm(path):
-    # Extract datetime from string
-    datetime_str = re.search(r"\d{4}-\d{2}-\d{2}-\d{2}-\d{2}-\d{2}", path).group(0)
+    # Extract datetime from string, which only has microseconds in backups made since they were added
+    match = re.search(r"\d{4}(-\d{2}){5}(-\d{6})?", path)
     # Convert datetime string to datetime object
-    return datetime.strptime(datetime_str, "%Y-%m-%d-%H-%M-%S")
+    if match.group(2) is None:
+        return datetime.strptime(match.group(0), "%Y-%m-%d-%H-%M-%S")
+    return datetime.strptime(match.group(0), BACKUP_DTTM_FORMAT)
 
 
 class BackupFile:
@@ -122,21 +532,24 @@ class BackupFile:
     Defines a backed up file and functionality to restore it
 
     Args:
-        path (str): The path to the file that you want to back up or retrieve.
+        path (str | Path): The path to the backup.
         file_id (str): A unique identifier for the file generated by hashing its absolute path.
 
     Attributes:
-        path (Path): The absolute path to the original file.
-        dttm (str): The datetime that the original file was loaded and backed up in the format '%Y-%m-%d-%H-%M-%S'.
-            Identifies a unique backup.
+        path (str | Path): The path to the backup.
+        dttm (datetime): The datetime that the original file was loaded and backed up, parsed from the
+            filename in the format '%Y-%m-%d-%H-%M-%S-%f'. Identifies a unique backup.
         file_id (str): A unique identifier for the file generated by hashing its absolute path.
+        base (BackupFile): The newer backup that this backup is stored as a delta against, or None
+            if it is stored in full.
 
     """
 
-    def __init__(self, file_id: str, path: str):
+    def __init__(self, file_id: str, path: str | Path, base: BackupFile | None = None):
         self.file_id = file_id
         self.path = path
         self.dttm = parse_backup_dttm(str(path))
+        self.base = base
 
     def restore(self, to):
         """
@@ -145,7 +558,27 @@ class BackupFile:
         Args:
             to (str): The path to where you want to restore the file.
         """
-        copy(self.path, to)
+        if self.base is not None:
+            Path(to).write_bytes(self.read_bytes())
+            return
+        with _open_backup(Path(self.path)) as src, open(to, "wb") as dst:
+            copyfileobj(src, dst, CHUNK_SIZE)
+
+    def read_bytes(self) -> bytes:
+        """
+        Returns the contents of the backed up file, rebuilding them from newer backups if needed.
+        """
+        deltas = []
+        backup = self
+        while backup.base is not None:
+            deltas.append(backup)
+            backup = backup.base
+        with _open_backup(Path(backup.path)) as f:
+            contents = f.read()
+        for delta_backup in reversed(deltas):
+            with _open_backup(Path(delta_backup.path)) as f:
+                contents = apply_line_delta(contents, json.loads(f.read()))
+        return contents
 
     def __repr__(self):
         return f"BackupFile(file_id={self.file_id}, path = {self.path})"
@@ -161,11 +594,11 @@ class File(BackupControl):
     Attributes:
         path (Path): The absolute path to the original file.
         ext (str): The file extension.
-        dttm_str (str): The current date and time as a string in the format '%Y-%m-%d-%H-%M-%S'.
+        dttm_str (str): The current date and time as a string in the format '%Y-%m-%d-%H-%M-%S-%f'.
         file_id (str): A unique identifier for the file generated by hashing its absolute path.
         backup_dir (str): The path to the directory where backup files will be saved.
         backup_filename (str): The name of the backup file, constructed from the unique file id, the datetime it was loaded and the extension.
-        backup_csv_path (str): The path to the backup CSV file where information about each backup is logged.
+        catalogue_path (str): The path to the catalogue where information about each backup is recorded.
 
      Methods:
         backup(self) -> None:
@@ -183,7 +616,7 @@ class File(BackupControl):
 
         _make_backup(self) -> None:
             Makes a backup of the file. This function copies the file to the backup directory with a unique filename.
-            It also logs a row in the backup csv file to help find a particular backup when inspecting the file system.
+            It also records the backup in the catalogue, which is used to list the backups of each file.
 
         list_backups(self) -> List[str]:
             Lists backed up versions of the File, ordered from newest to oldest.
@@ -204,7 +637,7 @@ class File(BackupControl):
             msg = "File not found!"
             raise OSError(msg)
         self.ext = self.path.suffix
-        self.dttm_str = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+        self.dttm_str = _unique_dttm()
         self._generate_file_id()
         self._generate_file_name()
         super().__init__(**args)
@@ -228,28 +661,122 @@ class File(BackupControl):
         """
         self.backup_filename = self.file_id + "_" + self.dttm_str + self.ext
 
-    def _make_backup(self) -> None:
+    def _make_backup(self, digest: str, previous: tuple[str, str | None] | None = None) -> None:
         """
-        Make a backup of the file. This function copies the file to the backup directory with a unique filename.
-        It also logs a row in the backup csv file to help find a particular backup when inspecting the file system.
+        Make a backup of the file. The contents of the file are stored once per digest, and the backup is a hard link to
+        these with a unique filename, or a copy of the file if hard links aren't supported.
+        It also records the backup in the catalogue, which is used to list the backups of each file.
+        In delta mode, the previous backup given by its filename and digest is then replaced by a delta.
         """
-        # Construct the path and copy the file
-        backup_filepath = Path(self.backup_dir, self.backup_filename)
-        copy(self.path, backup_filepath)
-        # Log an entry to the csv to make it easy to find the file
-        log_str = f"{self.path!s},{self.file_id},{self.dttm_str}\n"
-        with open(self.backup_csv_path, "a", encoding=self.ENCODING) as f:
-            f.write(log_str)
+        compression = _get_compression()
+        suffix = COMPRESSION_SUFFIXES[compression]
+        if previous is not None and previous[0].startswith(self.backup_filename):
+            # the file has changed since this object last backed it up, so this is a new version
+            self.dttm_str = _unique_dttm()
+            self._generate_file_name()
+        filename = self.backup_filename + suffix
+        backup_filepath = Path(self.backup_dir, filename)
+        backup_filepath.unlink(missing_ok=True)
+        object_path = self._object_path(digest, suffix)
+        try:
+            if not object_path.exists():
+                # copied under a temporary name first, so a partial copy is never used
+                tmp_path = object_path.with_name(
+                    f"{object_path.name}.{os.getpid()}-{threading.get_ident()}.tmp",
+                )
+                self._store(tmp_path, compression)
+                tmp_path.replace(object_path)
+            os.link(object_path, backup_filepath)
+        except OSError:
+            self._store(backup_filepath, compression)
+        with self._transaction() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO backups "
+                "(filename, file_id, path, dttm, digest, size, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    filename,
+                    self.file_id,
+                    str(self.path),
+                    self.dttm_str,
+                    digest,
+                    backup_filepath.stat().st_size,
+                    time.time(),
+                ),
+            )
+
+        # a backup can't be stored relative to itself
+        if DELTA_BACKUPS and previous is not None and previous[0] != filename:
+            self._replace_with_delta(*previous, filename, compression)
+
+    def _store(self, path: Path, compression: str | None) -> None:
+        """Streams the contents of the file to path, compressing them on the way"""
+        with open(self.path, "rb") as src, _open_compressed(path, "wb", compression) as dst:
+            copyfileobj(src, dst, CHUNK_SIZE)
+
+    def _replace_with_delta(
+        self,
+        previous_filename: str,
+        previous_digest: str | None,
+        filename: str,
+        compression: str | None,
+    ) -> None:
+        """
+        Replaces the previous backup with the lines needed to rebuild it from the new backup, if that is
+        smaller. Older deltas are relative to the previous backup, so are unaffected.
+        """
+        previous_path = Path(self.backup_dir, previous_filename)
+        if not previous_path.exists():
+            return
+        with _open_backup(previous_path) as f:
+            delta = line_delta(self.path.read_bytes(), f.read())
+
+        suffix = _stored_suffix(previous_filename)
+        delta_filename = (
+            previous_filename.removesuffix(suffix)
+            + _stored_suffix(self.backup_filename)
+            + DELTA_SUFFIX
+            + COMPRESSION_SUFFIXES[compression]
+        )
+        delta_path = Path(self.backup_dir, delta_filename)
+        with _open_compressed(delta_path, "wb", compression) as f:
+            f.write(json.dumps(delta, separators=(",", ":")).encode())
+        delta_size = delta_path.stat().st_size
+        if delta_size >= previous_path.stat().st_size:
+            delta_path.unlink()
+            return
+
+        with self._transaction() as con:
+            con.execute(
+                "UPDATE backups SET filename = ?, digest = NULL, size = ?, base = ? "
+                "WHERE filename = ?",
+                (delta_filename, delta_size, filename, previous_filename),
+            )
+            con.execute(
+                "UPDATE backups SET base = ? WHERE base = ?",
+                (delta_filename, previous_filename),
+            )
+        self._remove_backup_files([(previous_filename, previous_digest)])
+
+    def _object_path(self, digest: str, suffix: str = "") -> Path:
+        return Path(self.objects_dir, digest + self.ext + suffix)
 
     def list_backups(self) -> list:
         """
         List backed up versions of the File, ordered from newest to oldest.
         """
-        backup_files = list(self.backup_dir.glob(f"{self.file_id}*"))
-        backup_files.sort(reverse=True)
-        if len(backup_files) <= 0:
-            return []
-        return [BackupFile(file_id=self.file_id, path=path) for path in backup_files]
+        rows = self._query(
+            "SELECT filename, base FROM backups WHERE file_id = ? ORDER BY filename DESC",
+            (self.file_id,),
+        )
+        backups: dict[str, BackupFile] = {}
+        for filename, base in rows:
+            path = Path(self.backup_dir, filename)
+            # the base of a delta is always a newer backup, so is listed first
+            if not path.exists() or (base is not None and base not in backups):
+                continue
+            backups[filename] = BackupFile(file_id=self.file_id, path=path, base=backups.get(base))
+        return list(backups.values())
 
     def backup(self) -> None:
         """
@@ -257,20 +784,29 @@ class File(BackupControl):
         This function will make a backup of a file, only if there isn't already an equivalent backup in the temporary folder.
         Backups are saved in the users Temporary Files (see `tempfile.gettempdir()` or `File.backup_dir`).
         """
-        # get the backups of that file
-        backups = self.list_backups()
-        # If there aren't any backups then backup the file
-        if len(backups) == 0 or not filecmp.cmp(self.path, backups[0].path):
-            self._make_backup()
-        # If the file doesn't match the last backup then do a back up
+        digest = file_digest(self.path)
+        # get the latest backup of that file
+        latest = self._query(
+            "SELECT filename, digest FROM backups WHERE file_id = ? ORDER BY filename DESC LIMIT 1",
+            (self.file_id,),
+        )
+        # If there aren't any backups, or the file doesn't match the last backup, then backup the file
+        if len(latest) == 0 or not self._matches(latest[0][0], latest[0][1], digest):
+            self._make_backup(digest, previous=latest[0] if latest else None)
+            self.evict()
+
+    def _matches(self, backup_filename: str, backup_digest: str | None, digest: str) -> bool:
+        """Checks whether a backup has the same contents as the file with the given digest"""
+        backup_path = Path(self.backup_dir, backup_filename)
+        if not backup_path.exists():
+            return False
+        if backup_digest is not None:
+            return backup_digest == digest
+        # backups made before the catalogue recorded digests are compared directly
+        return filecmp.cmp(self.path, backup_path, shallow=False)
 
     def clear_backup(self):
         """
-        Clears all backups for the file and removes entries from the logs
+        Clears all backups for the file and removes their entries from the catalogue
         """
-        # Clear the backup
         super().clear_backup(file_id=self.file_id)
-        # Drop the files entries from the log
-        backup_logs = pd.read_csv(self.backup_csv_path)
-        backup_logs = backup_logs[backup_logs.file_id != self.file_id]
-        backup_logs.to_csv(self.backup_csv_path, index=False)
@@ -8,3 +8,7 @@ DEFAULT_SCHEMA_LOCATION = SCHEMA_URI_TPL.format(LATEST_SCHEMA_VERSION)
 DEFAULT_NAMESPACE = r"https://www.floodmodeller.com"
 XSI_NAMESPACE = r"http://www.w3.org/2001/XMLSchema-instance"
 XSI_SCHEMA_LOCATION_KEY = f"{{{XSI_NAMESPACE}}}schemaLocation"
+
+# Codes of messages in simulation ".exy" files, below which they are errors or warnings
+EXY_ERROR_MAX = 2000
+EXY_WARNING_MAX = 3000
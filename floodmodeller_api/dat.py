@@ -16,23 +16,40 @@ address: Jacobs UK Limited, Flood Modeller, Cottons Centre, Cottons Lane, London
 
 from __future__ import annotations
 
+import logging
 from collections import defaultdict
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from . import units
 from ._base import FMFile
+from .diff import structural_diff
 from .units._base import Unit
 from .units._helpers import join_10_char, split_10_char, to_float, to_int
+from .units.conduits import CONVEYANCE_SUBTYPES
+from .units.conveyance import CONVEYANCE_CACHE, calculate_conveyance_curves, interpolate_geometry
 from .util import handle_exception
 from .validation.validation import _validate_unit
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    import pandas as pd
+
+    from .diff import StructuralDiff
+    from .units.conveyance import SectionGeometry
+
+# units which may be connected within a reach of sections
+REACH_UNIT_TYPES = ("RIVER", "CONDUIT", "INTERPOLATE", "REPLICATE")
+
 
 class DAT(FMFile):
     """Reads and write Flood Modeller datafile format '.dat'
 
     Args:
         dat_filepath (str, optional): Full filepath to dat file. If not specified, a new DAT class will be created. Defaults to None.
+        backup (bool, optional): Whether to back up the file when it is loaded. Defaults to None,
+            which uses ``floodmodeller_api.backup.BACKUPS_ENABLED``.
 
     Output:
         Initiates 'DAT' class object
@@ -51,11 +68,12 @@ class DAT(FMFile):
         dat_filepath: str | Path | None = None,
         with_gxy: bool = False,
         from_json: bool = False,
+        backup: bool | None = None,
     ) -> None:
         if from_json:
             return
         if dat_filepath is not None:
-            FMFile.__init__(self, dat_filepath)
+            FMFile.__init__(self, dat_filepath, backup=backup)
             self._read()
 
         else:
@@ -94,7 +112,12 @@ class DAT(FMFile):
                 gxy_file.write(gxy_string)
             self._gxy_filepath = new_gxy_path
 
-    def diff(self, other: DAT, force_print: bool = False) -> None:
+    def diff(
+        self,
+        other: DAT,
+        force_print: bool = False,
+        max_report: int | None = None,
+    ) -> None:
         """Compares the DAT class against another DAT class to check whether they are
         equivalent, or if not, what the differences are. Two instances of a DAT class are
         deemed equivalent if all of their attributes are equal except for the filepath and
@@ -110,8 +133,26 @@ class DAT(FMFile):
             other (floodmodeller_api.DAT): Other instance of a DAT class
             force_print (bool): Forces the API to print every difference found, rather than
                 just the first 25 differences. Defaults to False.
+            max_report (int, optional): Maximum number of changed cells to list for each table of
+                data, such as river section data. Defaults to None, which lists every changed cell.
+        """
+        self._diff(other, force_print=force_print, max_report=max_report)
+
+    def structural_diff(self, other: DAT) -> StructuralDiff:
+        """Compares the units of the DAT class against those of another DAT class, matching
+        units by their type and name. Unlike ``diff()``, this reports which units have been
+        added, removed, renamed, moved or modified, and for modified units the old and new value
+        of each changed attribute. Only units are compared, not the general parameters or
+        initial conditions.
+
+        Args:
+            other (floodmodeller_api.DAT): Other instance of a DAT class
+
+        Returns:
+            StructuralDiff: Changes to the units in ``other`` relative to this DAT, which can be
+            printed for a summary of the changes.
         """
-        self._diff(other, force_print=force_print)
+        return structural_diff(self._all_units, other._all_units)
 
     @handle_exception(when="calculate next unit in")
     def next(self, unit: Unit) -> Unit | list[Unit] | None:
@@ -1002,6 +1043,187 @@ class DAT(FMFile):
 
             self._gxy_data = self._gxy_data.replace(old, new)
 
+    @handle_exception(when="calculate conveyance curves for")
+    def conveyance_curves(
+        self,
+        sections: Iterable[str] | None = None,
+        workers: int = 1,
+        max_levels: int | None = None,
+    ) -> dict[str, pd.Series]:
+        """Calculates the conveyance curves of many river sections and conduits in a single call.
+        This gives the same results as ``RIVER.conveyance`` and ``CONDUIT.conveyance``, but is much
+        faster for a large number of sections as their geometry is calculated in batches. All of
+        these share the same cache of previously calculated curves.
+
+        The geometry of interpolate and replicate sections is resolved from the sections around
+        them in the DAT, within the same reach. An interpolate section is interpolated between the
+        nearest upstream and downstream sections by distance, and a replicate section copies the
+        section immediately upstream, lowered by its bed level drop.
+
+        Args:
+            sections (Iterable[str], optional): Names of the sections or conduits to calculate.
+                Defaults to all river, interpolate and replicate sections, and all 'SECTION',
+                'RECTANGULAR' and 'CIRCULAR' conduits in the DAT. Any interpolate or replicate
+                sections whose geometry cannot be resolved, and any names shared by a section
+                and a conduit, are skipped with a warning.
+            workers (int, optional): Number of processes used to calculate the curves. Defaults
+                to 1.
+            max_levels (int, optional): If given, the water levels of each section are sampled
+                adaptively, calculating at most this many levels. Levels are concentrated where
+                conveyance curves or decreases, so spikes are still found at full resolution
+                while smooth parts of the curve are sampled more coarsely. Defaults to None,
+                meaning conveyance is calculated every 0.05 m.
+
+        Raises:
+            ValueError: Raised if a section is not in the DAT, is not a supported section or
+                conduit, is the name of both a section and a conduit, or if its geometry cannot be
+                resolved.
+
+        Returns:
+            dict[str, pd.Series]: Conveyance curve of each section, indexed by water level.
+        """
+        positions = {id(unit): idx for idx, unit in enumerate(self._all_units)}
+        resolved: dict[int, tuple[SectionGeometry, bool]] = {}
+
+        names, geometries, closed = [], [], []
+        for name, unit in self._get_conveyance_units(sections):
+            try:
+                geometry, is_closed = self._get_conveyance_geometry(positions[id(unit)], resolved)
+            except ValueError:
+                if sections is not None:
+                    raise
+                logging.warning("Skipping conveyance for '%s' as its geometry is unknown", name)
+                continue
+            names.append(name)
+            geometries.append(geometry)
+            closed.append(is_closed)
+
+        curves = calculate_conveyance_curves(
+            geometries,
+            workers=workers,
+            cache=CONVEYANCE_CACHE,
+            closed=closed,
+            max_levels=max_levels,
+        )
+        return dict(zip(names, curves))
+
+    def _get_conveyance_units(self, sections: Iterable[str] | None) -> list[tuple[str, Unit]]:
+        if sections is not None:
+            return [(name, self._get_conveyance_unit(name)) for name in sections]
+
+        river_sections = {
+            name: unit
+            for name, unit in self.sections.items()
+            if not isinstance(unit, units.RIVER) or unit.subtype == "SECTION"
+        }
+        conduits = {
+            name: unit
+            for name, unit in self.conduits.items()
+            if unit.subtype in CONVEYANCE_SUBTYPES
+        }
+
+        # a label shared by a section and a conduit can't be told apart in the returned curves
+        shared = river_sections.keys() & conduits.keys()
+        for name in sorted(shared):
+            logging.warning(
+                "Skipping conveyance for '%s' as it is both a section and a conduit",
+                name,
+            )
+        return [
+            (name, unit)
+            for name, unit in (*river_sections.items(), *conduits.items())
+            if name not in shared
+        ]
+
+    def _get_conveyance_unit(self, name: str) -> Unit:
+        if name in self.sections and name in self.conduits:
+            msg = (
+                f"Unable to calculate conveyance for '{name}' as it is both a section and a conduit"
+            )
+            raise ValueError(msg)
+        if name in self.sections:
+            return self.sections[name]
+        if name in self.conduits:
+            return self.conduits[name]
+        msg = f"Unable to calculate conveyance for '{name}' as it is not a section or conduit"
+        raise ValueError(msg)
+
+    def _get_conveyance_geometry(
+        self,
+        idx: int,
+        resolved: dict[int, tuple[SectionGeometry, bool]],
+    ) -> tuple[SectionGeometry, bool]:
+        """Returns the geometry of the unit at the index within the DAT, and whether it is closed,
+        resolving interpolate and replicate sections from the sections around them"""
+        if idx in resolved:
+            return resolved[idx]
+
+        unit = self._all_units[idx]
+        if isinstance(unit, units.RIVER) and unit.subtype == "SECTION":
+            geometry, closed = unit._get_conveyance_geometry(), False
+        elif isinstance(unit, units.CONDUIT):
+            geometry, closed = unit._get_conveyance_geometry(), True
+        elif isinstance(unit, units.REPLICATE):
+            upstream_idx, _ = self._find_reach_section(idx, -1)
+            (x, y, n, rpl, panel_markers), closed = self._get_conveyance_geometry(
+                upstream_idx,
+                resolved,
+            )
+            geometry = (x, y - unit.bed_level_drop, n, rpl, panel_markers)
+        elif isinstance(unit, units.INTERPOLATE):
+            upstream_idx, upstream_distance = self._find_reach_section(idx, -1)
+            downstream_idx, downstream_distance = self._find_reach_section(idx, 1)
+            upstream, closed = self._get_conveyance_geometry(upstream_idx, resolved)
+            downstream, downstream_closed = self._get_conveyance_geometry(downstream_idx, resolved)
+            if closed != downstream_closed:
+                msg = f"Unable to interpolate '{unit.name}' between a river section and a conduit."
+                raise ValueError(msg)
+            weight = upstream_distance / (upstream_distance + downstream_distance)
+            geometry = interpolate_geometry(upstream, downstream, weight)
+        else:
+            msg = (
+                f"Unable to calculate conveyance for '{unit.name}' as it is not a river section "
+                "or conduit."
+            )
+            raise ValueError(msg)
+
+        resolved[idx] = geometry, closed
+        return resolved[idx]
+
+    def _find_reach_section(self, idx: int, step: int) -> tuple[int, float]:
+        """Finds the nearest section upstream (step=-1) or downstream (step=1) of the unit at the
+        index within the same reach, skipping interpolate sections. Returns the index of the
+        section and its distance from the unit."""
+        distance = 0.0
+        current = idx
+        while True:
+            neighbour = current + step
+            dist_to_next = getattr(self._all_units[min(current, neighbour)], "dist_to_next", 0)
+            if (
+                not 0 <= neighbour < len(self._all_units)
+                or dist_to_next <= 0
+                or self._all_units[neighbour]._unit not in REACH_UNIT_TYPES
+            ):
+                direction = "upstream" if step < 0 else "downstream"
+                msg = (
+                    f"Unable to calculate conveyance for '{self._all_units[idx].name}' as there "
+                    f"is no {direction} section within its reach."
+                )
+                raise ValueError(msg)
+
+            distance += dist_to_next
+            current = neighbour
+            if not isinstance(self._all_units[current], units.INTERPOLATE):
+                break
+
+        if step > 0 and isinstance(self._all_units[current], units.REPLICATE):
+            msg = (
+                f"Unable to calculate conveyance for '{self._all_units[idx].name}' as it is "
+                "upstream of a replicate section."
+            )
+            raise ValueError(msg)
+        return current, distance
+
     def get_network(self) -> tuple[list[Unit], list[tuple[Unit, Unit]]]:
         """Generates a network representation of units and their connections.
 
@@ -14,15 +14,312 @@ If you have any query about this program or this License, please contact us at s
 address: Jacobs UK Limited, Flood Modeller, Cottons Centre, Cottons Lane, London, SE1 2QG, United Kingdom.
 """
 
+from __future__ import annotations
+
+import bisect
+import contextlib
+import hashlib
+import marshal
+import math
+import weakref
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .units._base import Unit
+
+DIGEST_SIZE = 16
+
+# Digests of the attributes of API objects which can only be changed by assigning them, e.g.
+# numbers and strings, keyed by the id of the object. Only kept for classes which set
+# _digest_cached, and which remove their digest whenever an attribute is assigned (see Unit)
+_fixed_digests: dict[int, bytes] = {}
+_FIXED_TYPES = (str, int, float, type(None), np.generic)
+
+# Floats in DataFrames are treated as equal if they differ by no more than this
+FLOAT_TOLERANCE = 0.0
+
+
+class DigestUnavailableError(Exception):
+    """Raised when an item contains something which can't be reduced to a content digest, in
+    which case equality is checked by comparing the items directly"""
+
+
+def check_digest_equal(item_a, item_b) -> bool | None:
+    """Checks whether two items are equivalent by comparing their content digests. The digests
+    follow the same rules as ``check_item_with_dataframe_equal``, so this gives the same answer
+    without building a list of differences, and stops as soon as an attribute differs.
+
+    Args:
+        item_a: First item, e.g. a Unit or FMFile.
+        item_b: Second item.
+
+    Returns:
+        bool | None: Whether the items are equivalent, or None if they couldn't be digested.
+    """
+    # shared so that an object held in several places (e.g. a unit in both 'sections' and
+    # '_all_units') is only digested once
+    if FLOAT_TOLERANCE:
+        # digests can only match values exactly
+        return None
+
+    memo: dict[int, bytes] = {}
+    try:
+        if type(item_a) is type(item_b) and hasattr(item_a, "_get_digest_state"):
+            state_a = item_a._get_digest_state()
+            state_b = item_b._get_digest_state()
+            if state_a.keys() == state_b.keys():
+                cached = getattr(item_a, "_digest_cached", False)
+                if cached and fixed_digest(item_a, state_a) != fixed_digest(item_b, state_b):
+                    return False
+                # stops at the first attribute which differs
+                return all(
+                    content_digest(item, memo) == content_digest(state_b[key], memo)
+                    for key, item in state_a.items()
+                    if not (cached and isinstance(item, _FIXED_TYPES))
+                )
+        return content_digest(item_a, memo) == content_digest(item_b, memo)
+    except Exception:
+        # e.g. an item which can't be digested, so leave it to the full comparison
+        return None
+
+
+def content_digest(item, memo: dict[int, bytes] | None = None) -> bytes:  # noqa: C901, PLR0911
+    """Returns a canonical digest of an item's contents. Items considered equivalent by
+    ``check_item_with_dataframe_equal`` have the same digest, e.g. the order of dictionary keys
+    is ignored, ``1 == 1.0`` and empty DataFrames are all equivalent.
+
+    API classes are digested from the state returned by their ``_get_digest_state()`` method.
+
+    Digests are recalculated on every call rather than stored on the item, as DataFrames and
+    lists can be changed in place without the item knowing. The memo only lives for a single
+    comparison, while the items can't change.
+
+    Args:
+        item: Item to digest.
+        memo (dict[int, bytes], optional): Digests of API objects already seen, keyed by id.
+
+    Raises:
+        DigestUnavailableError: If the item contains a type which can't be digested.
+
+    Returns:
+        bytes: Digest of the item.
+    """
+    if item is None:
+        return b"n"
+    if isinstance(item, str):
+        return b"s" + item.encode("utf-8", "surrogatepass")
+    if isinstance(item, (bool, int, float, np.bool_, np.integer, np.floating)):
+        return _number_digest(item)
+    if memo is None:
+        memo = {}
+    if isinstance(item, dict):
+        # keys are matched by lookup, so their order doesn't matter
+        entries = sorted(
+            _join(content_digest(key, memo), content_digest(value, memo))
+            for key, value in item.items()
+        )
+        return _hash(b"d", entries)
+    if isinstance(item, (list, tuple)):
+        # a list is never equal to a tuple
+        tag = b"l" if isinstance(item, list) else b"t"
+        return _hash(tag, [content_digest(value, memo) for value in item])
+    if isinstance(item, (set, frozenset)):
+        return _hash(b"e", sorted(content_digest(value, memo) for value in item))
+    if isinstance(item, pd.DataFrame):
+        return _dataframe_digest(item)
+    if isinstance(item, pd.Series):
+        return _series_digest(item)
+    if hasattr(item, "_get_digest_state"):
+        key = id(item)
+        if key not in memo:
+            parts = _object_digest_parts(item, memo)
+            memo[key] = _hash(b"o", [type(item).__name__.encode(), *parts])
+        return memo[key]
+
+    msg = f"Unable to digest item of type {type(item).__name__}"
+    raise DigestUnavailableError(msg)
+
+
+def _object_digest_parts(item, memo: dict[int, bytes]) -> list[bytes]:
+    state = item._get_digest_state()
+    if not getattr(item, "_digest_cached", False):
+        return [content_digest(state, memo)]
+    changeable = {
+        name: value for name, value in state.items() if not isinstance(value, _FIXED_TYPES)
+    }
+    return [fixed_digest(item, state), content_digest(changeable, memo)]
+
+
+def fixed_digest(item, state: dict) -> bytes:
+    """Returns the digest of the attributes of an API object which can only be changed by
+    assigning them, i.e. numbers, strings and None, reusing the digest from earlier comparisons
+    until the object removes it with ``forget_digest``. Attributes such as DataFrames and lists can
+    be changed in place without the object knowing, so are digested on every comparison.
+
+    Args:
+        item: API object, whose class sets ``_digest_cached``.
+        state (dict): State of the object, as returned by its ``_get_digest_state()`` method.
 
-def check_item_with_dataframe_equal(  # noqa: C901, PLR0912
+    Raises:
+        DigestUnavailableError: If an attribute can't be digested, e.g. a nan.
+
+    Returns:
+        bytes: Digest of the attributes.
+    """
+    key = id(item)
+    cached = _fixed_digests.get(key)
+    if cached:
+        return cached
+    digest = _hash(
+        b"d",
+        sorted(
+            _join(content_digest(name), content_digest(value))
+            for name, value in state.items()
+            if isinstance(value, _FIXED_TYPES)
+        ),
+    )
+    if cached is None:
+        # removed with the object, so that its id can't match a later object
+        weakref.finalize(item, _fixed_digests.pop, key, None)
+    _fixed_digests[key] = digest
+    return digest
+
+
+def forget_digest(item) -> None:
+    """Removes the cached digest of an API object, e.g. when one of its attributes is assigned"""
+    key = id(item)
+    if key in _fixed_digests:
+        _fixed_digests[key] = b""  # kept until the object is removed, see fixed_digest
+
+
+def _hash(tag: bytes, parts) -> bytes:
+    return hashlib.blake2b(tag + _join(*parts), digest_size=DIGEST_SIZE).digest()
+
+
+def _join(*parts: bytes) -> bytes:
+    # marshal length-prefixes each part, and version 2 doesn't depend on object identity
+    return marshal.dumps(parts, 2)
+
+
+def _number_digest(number) -> bytes:
+    if isinstance(number, np.generic):
+        number = number.item()
+    if isinstance(number, float):
+        if math.isnan(number):
+            # nan is never equal to itself, so must be compared directly
+            msg = "Unable to digest nan"
+            raise DigestUnavailableError(msg)
+        return b"f" + repr(number + 0.0).encode()  # + 0.0 so that -0.0 == 0.0
+    as_float = float(number)
+    if as_float == number:
+        # an integer is equal to the float with the same value
+        return b"f" + repr(as_float + 0.0).encode()
+    return b"i" + repr(int(number)).encode()
+
+
+def _array_digest(values: Any) -> bytes:
+    """Digests the values of a column or index in the same way as ``DataFrame.equals``, i.e.
+    treating missing values as equal to each other"""
+    values = np.asarray(values).ravel()
+    if values.dtype.kind == "f":
+        # + 0.0 so that -0.0 == 0.0, and every missing value is the same nan
+        values = values + 0.0
+        missing = np.isnan(values)
+        if missing.any():
+            values[missing] = np.nan
+        return _join(values.dtype.str.encode(), values.tobytes())
+    if values.dtype.kind in "biumM":
+        return _join(values.dtype.str.encode(), np.ascontiguousarray(values).tobytes())
+    if values.dtype.kind == "O":
+        if pd.api.types.infer_dtype(values, skipna=False) == "string":
+            # the repr of a list of strings is unambiguous, and much quicker than digesting each
+            return b"a" + repr(values.tolist()).encode("utf-8", "surrogatepass")
+        return _hash(b"a", [_element_digest(value) for value in values])
+    msg = f"Unable to digest array of type {values.dtype}"
+    raise DigestUnavailableError(msg)
+
+
+def _element_digest(value) -> bytes:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return b"n"
+    if value is pd.NA:
+        return b"N"
+    if value is pd.NaT:
+        return b"T"
+    return content_digest(value)
+
+
+def _dtype_name(dtype) -> bytes:
+    return (dtype.str if isinstance(dtype, np.dtype) else str(dtype)).encode()
+
+
+def _index_digest(index: pd.Index) -> bytes:
+    # indexes are equal if their values are, so a RangeIndex, float index or object index of
+    # numbers can match an int one
+    values = index.to_numpy()
+    if values.dtype.kind == "O":
+        inferred = pd.api.types.infer_dtype(values, skipna=False)
+        if inferred in ("floating", "mixed-integer-float", "empty"):
+            return _array_digest(values.astype("float64"))
+        if inferred == "integer":
+            with contextlib.suppress(OverflowError):  # ints outside int64 are digested as objects
+                values = values.astype("int64")
+    if values.dtype.kind in "iu" and (len(values) == 0 or np.abs(values).max() <= 2**53):
+        return _array_digest(values.astype("float64"))
+    if values.dtype.kind == "f":
+        return _array_digest(values.astype("float64"))
+    return _array_digest(values.astype(object))
+
+
+def _dataframe_digest(df: pd.DataFrame) -> bytes:
+    if len(df) == 0:
+        # empty DataFrames are always considered equal
+        return b"D"
+    # columns are only equal if their dtypes are
+    dtypes = df.dtypes.to_numpy()
+    dtype_names = [_dtype_name(dtype) for dtype in dtypes]
+    parts = [
+        _index_digest(df.index),
+        _join(*(content_digest(label) for label in df.columns)),
+        _join(*dtype_names),
+    ]
+
+    # one conversion of the whole frame is much quicker than accessing each column, then the
+    # columns of each dtype are cast back to that dtype and digested together
+    values = df.to_numpy()
+    columns_by_dtype = defaultdict(list)
+    for idx, dtype_name in enumerate(dtype_names):
+        columns_by_dtype[dtype_name].append(idx)
+    for idxs in columns_by_dtype.values():
+        dtype = dtypes[idxs[0]]
+        block = values[:, idxs]
+        if isinstance(dtype, np.dtype) and dtype.kind != "O":
+            block = block.astype(dtype, copy=False)
+        parts.append(_array_digest(block))
+    return _hash(b"D", parts)
+
+
+def _series_digest(series: pd.Series) -> bytes:
+    if len(series) == 0:
+        return b"D"
+    values = _join(_dtype_name(series.dtype), _array_digest(series.to_numpy()))
+    return _hash(b"S", [_index_digest(series.index), values])
+
+
+def check_item_with_dataframe_equal(  # noqa: C901, PLR0913
     item_a,
     item_b,
     name,
     diff,
     special_types=(),
+    max_report=None,
 ):
     result = True
     try:
@@ -33,6 +330,7 @@ def check_item_with_dataframe_equal(  # noqa: C901, PLR0912
                 name,
                 diff,
                 special_types,
+                max_report,
             )
         elif isinstance(item_a, list):
             result, diff = check_list_with_dataframe_equal(
@@ -41,6 +339,7 @@ def check_item_with_dataframe_equal(  # noqa: C901, PLR0912
                 name,
                 diff,
                 special_types,
+                max_report,
             )
         elif isinstance(item_a, (pd.DataFrame, pd.Series)):
             if isinstance(item_a.index, pd.RangeIndex):
@@ -48,27 +347,13 @@ def check_item_with_dataframe_equal(  # noqa: C901, PLR0912
             if isinstance(item_b.index, pd.RangeIndex):
                 item_b.index = item_b.index.astype("int")
             if not item_a.equals(item_b) and len(item_a) + len(item_b) != 0:
-                result = False
-                if isinstance(item_a, pd.Series):
-                    item_a = pd.DataFrame(item_a).reset_index()
-                    item_b = pd.DataFrame(item_b).reset_index()
-
-                df_diff = pd.concat([item_a, item_b]).drop_duplicates(keep=False)
-                rows = df_diff.index.unique().to_list()
-                msg = f"{len(rows)} row(s) not equal:\n"
-                row_diffs = []
-                for row in rows:
-                    for col in df_diff.columns:
-                        if True not in df_diff.loc[row, col].duplicated().to_numpy():
-                            vals = df_diff.loc[row, col].to_numpy()
-                            row_diffs.append(
-                                f"    Row: {row}, Col: '{col}' - left: {vals[0]}, right: {vals[1]}",
-                            )
-                msg += "\n".join(row_diffs)
-                diff.append((name, msg))
+                msg = _describe_dataframe_diff(item_a, item_b, max_report)
+                if msg is not None:
+                    result = False
+                    diff.append((name, msg))
         elif isinstance(item_a, special_types):
             # item is a Unit or other fmapi class
-            result, new_diff = item_a._get_diff(item_b)
+            result, new_diff = item_a._get_diff(item_b, max_report=max_report)
             new_diff = [(f"{name}->{new_name}", new_item) for new_name, new_item in new_diff]
             diff.extend(new_diff)
         elif item_a != item_b:
@@ -81,7 +366,14 @@ def check_item_with_dataframe_equal(  # noqa: C901, PLR0912
     return result, diff
 
 
-def check_dict_with_dataframe_equal(dict_a, dict_b, name, diff, special_types):
+def check_dict_with_dataframe_equal(  # noqa: PLR0913
+    dict_a,
+    dict_b,
+    name,
+    diff,
+    special_types,
+    max_report=None,
+):
     """Used to recursively check equivalence where there may be dataframe objects"""
     result = True
     try:
@@ -93,6 +385,7 @@ def check_dict_with_dataframe_equal(dict_a, dict_b, name, diff, special_types):
                     name=f"{name}->{key}",
                     diff=diff,
                     special_types=special_types,
+                    max_report=max_report,
                 )
                 if not _result:
                     result = False
@@ -112,7 +405,19 @@ def check_dict_with_dataframe_equal(dict_a, dict_b, name, diff, special_types):
     return result, diff
 
 
-def check_list_with_dataframe_equal(list_a, list_b, name, diff, special_types):
+def check_list_with_dataframe_equal(  # noqa: PLR0913
+    list_a,
+    list_b,
+    name,
+    diff,
+    special_types,
+    max_report=None,
+):
+    if not isinstance(list_b, list):
+        # e.g. a tuple, which is never equal to a list
+        diff.append((name, f"{list_a} != {list_b}"))
+        return False, diff
+
     result = True
     try:
         for idx, item in enumerate(list_a):
@@ -122,6 +427,7 @@ def check_list_with_dataframe_equal(list_a, list_b, name, diff, special_types):
                 name=f"{name}->itm[{idx}]",
                 diff=diff,
                 special_types=special_types,
+                max_report=max_report,
             )
             if not _result:
                 result = False
@@ -134,3 +440,313 @@ def check_list_with_dataframe_equal(list_a, list_b, name, diff, special_types):
         diff.append((name, "Error encountered when comparing"))
 
     return result, diff
+
+
+def _align(index_a: pd.Index, index_b: pd.Index):
+    """Matches up the labels of two indexes, by label if both are unique or otherwise by
+    position. Returns the matched labels, their positions in each index and the labels only in
+    each index."""
+    if index_a.is_unique and index_b.is_unique:
+        in_b = index_a.isin(index_b)
+        labels = index_a[in_b]
+        only_a = index_a[~in_b]
+        only_b = index_b[~index_b.isin(index_a)]
+        return labels, index_a.get_indexer(labels), index_b.get_indexer(labels), only_a, only_b
+
+    length = min(len(index_a), len(index_b))
+    positions = np.arange(length)
+    return index_a[:length], positions, positions, index_a[length:], index_b[length:]
+
+
+def _moved_labels(positions: np.ndarray) -> np.ndarray:
+    """Boolean mask of the matched labels which are in a different order in the other index,
+    given their positions in it"""
+    ranks = np.argsort(np.argsort(positions, kind="stable"), kind="stable")
+    return ranks != np.arange(len(positions))
+
+
+def _changed_values(values_a: np.ndarray, values_b: np.ndarray) -> np.ndarray:
+    """Boolean mask of the values which differ, treating missing values as equal to each other
+    and floats within ``FLOAT_TOLERANCE`` of each other as equal"""
+    if values_a.dtype.kind in "biuf" and values_b.dtype.kind in "biuf":
+        values_a = values_a.astype("float64")
+        values_b = values_b.astype("float64")
+        same = (values_a == values_b) | (np.isnan(values_a) & np.isnan(values_b))
+        if FLOAT_TOLERANCE:
+            same |= np.abs(values_a - values_b) <= FLOAT_TOLERANCE
+        return ~same
+
+    values_a = values_a.astype(object)
+    values_b = values_b.astype(object)
+    same = np.asarray(values_a == values_b, dtype=bool)
+    return ~(same | (pd.isna(values_a) & pd.isna(values_b)))
+
+
+def _describe_dataframe_diff(  # noqa: C901, PLR0912
+    df_a: pd.DataFrame | pd.Series,
+    df_b: pd.DataFrame | pd.Series,
+    max_report: int | None = None,
+) -> str | None:
+    """Describes the differences between two DataFrames (or Series), aligning their rows and
+    columns by label and comparing each column as a whole.
+
+    Args:
+        df_a (pd.DataFrame | pd.Series): Left DataFrame.
+        df_b (pd.DataFrame | pd.Series): Right DataFrame.
+        max_report (int, optional): Maximum number of changed cells to list. Defaults to None,
+            which lists every changed cell.
+
+    Returns:
+        str | None: Description of the differences, including rows or columns in a different
+            order, or None if the only differences are floats within ``FLOAT_TOLERANCE`` of each
+            other.
+    """
+    if isinstance(df_a, pd.Series) and isinstance(df_b, pd.Series):
+        # compared as a single column, regardless of the series names
+        column_name = df_a.name if df_a.name is not None else "value"
+        df_a = df_a.to_frame(name=column_name)
+        df_b = df_b.to_frame(name=column_name)
+
+    rows, rows_a, rows_b, only_rows_a, only_rows_b = _align(df_a.index, df_b.index)
+    cols, cols_a, cols_b, only_cols_a, only_cols_b = _align(df_a.columns, df_b.columns)
+    columns_a = [column for _, column in df_a.items()]
+    columns_b = [column for _, column in df_b.items()]
+
+    lines = []
+    for label, only in (("left", only_rows_a), ("right", only_rows_b)):
+        if len(only) > 0:
+            lines.append(f"    Row(s) only in {label}: {only.to_list()[:max_report]}")
+    for label, only in (("left", only_cols_a), ("right", only_cols_b)):
+        if len(only) > 0:
+            lines.append(f"    Col(s) only in {label}: {only.to_list()[:max_report]}")
+
+    moved_rows = _moved_labels(rows_b)
+    if moved_rows.any():
+        lines.append(f"    Row(s) in a different order: {rows[moved_rows].to_list()[:max_report]}")
+    moved_cols = _moved_labels(cols_b)
+    if moved_cols.any():
+        lines.append(f"    Col(s) in a different order: {cols[moved_cols].to_list()[:max_report]}")
+
+    mask = np.zeros((len(rows), len(cols)), dtype=bool)
+    values = []
+    for idx, (col, col_a, col_b) in enumerate(zip(cols, cols_a, cols_b)):
+        column_a = columns_a[col_a]
+        column_b = columns_b[col_b]
+        if column_a.dtype != column_b.dtype:
+            lines.append(
+                f"    Col: '{col}' - dtype left: {column_a.dtype}, right: {column_b.dtype}",
+            )
+        values_a = column_a.to_numpy()[rows_a]
+        values_b = column_b.to_numpy()[rows_b]
+        mask[:, idx] = _changed_values(values_a, values_b)
+        values.append((values_a, values_b))
+
+    if not lines and not mask.any():
+        if FLOAT_TOLERANCE:
+            return None
+        # e.g. index labels which are equal but of a different type
+        lines.append("    Values are equal but the tables are not identical")
+
+    changed_rows, changed_cols = np.nonzero(mask)
+    n_cells = len(changed_rows)
+    if max_report is not None and n_cells > max_report:
+        changed_rows = changed_rows[:max_report]
+        changed_cols = changed_cols[:max_report]
+    for row, col in zip(changed_rows, changed_cols):
+        values_a, values_b = values[col]
+        lines.append(
+            f"    Row: {rows[row]}, Col: '{cols[col]}' - "
+            f"left: {values_a[row]}, right: {values_b[row]}",
+        )
+    if n_cells > len(changed_rows):
+        lines.append(f"    ...and {n_cells - len(changed_rows)} more cell(s) not equal")
+
+    n_rows = (mask.any(axis=1) | moved_rows).sum() + len(only_rows_a) + len(only_rows_b)
+    return f"{n_rows} row(s) not equal:\n" + "\n".join(lines)
+
+
+@dataclass()
+class UnitDelta:
+    """Class to hold the changes to a single unit found by a structural diff.
+
+    Args:
+        unit_type (str): Unit type, e.g. 'RIVER'.
+        name (str | None): Unit name.
+        fields (dict[str, tuple[Any, Any]]): Old and new value of each attribute which differs.
+    """
+
+    unit_type: str
+    name: str | None
+    fields: dict[str, tuple[Any, Any]] = field(default_factory=dict)
+
+    def __str__(self) -> str:
+        return f"{self.unit_type} '{self.name}': {', '.join(self.fields)}"
+
+
+@dataclass()
+class StructuralDiff:
+    """Class to hold the unit-level changes between two sets of units, e.g. two DAT files.
+
+    Args:
+        added (list[Unit]): Units only in the other set.
+        removed (list[Unit]): Units only in the first set.
+        renamed (list[tuple[Unit, Unit]]): Pairs of (old, new) units which only differ by name.
+        moved (list[Unit]): Units in the other set which have moved relative to the units around
+            them.
+        modified (list[UnitDelta]): Changes to units in both sets.
+    """
+
+    added: list[Unit] = field(default_factory=list)
+    removed: list[Unit] = field(default_factory=list)
+    renamed: list[tuple[Unit, Unit]] = field(default_factory=list)
+    moved: list[Unit] = field(default_factory=list)
+    modified: list[UnitDelta] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return any((self.added, self.removed, self.renamed, self.moved, self.modified))
+
+    def __str__(self) -> str:
+        lines = [
+            f"({len(self.added)} added, {len(self.removed)} removed, {len(self.renamed)} renamed,"
+            f" {len(self.moved)} moved, {len(self.modified)} modified)",
+        ]
+        lines.extend(f"  Added: {_unit_label(unit)}" for unit in self.added)
+        lines.extend(f"  Removed: {_unit_label(unit)}" for unit in self.removed)
+        lines.extend(f"  Renamed: {_unit_label(old)} -> '{new.name}'" for old, new in self.renamed)
+        lines.extend(f"  Moved: {_unit_label(unit)}" for unit in self.moved)
+        lines.extend(f"  Modified: {delta}" for delta in self.modified)
+        return "\n".join(lines)
+
+
+def _unit_label(unit: Unit) -> str:
+    return f"{unit.unit} '{unit.name}'"
+
+
+def _unit_keys(units: Sequence[Unit]) -> dict[tuple, Unit]:
+    # any repeated (type, name) pairs are matched in the order they appear
+    occurrences: dict[tuple, int] = defaultdict(int)
+    keyed = {}
+    for unit in units:
+        key = (unit.unit, unit.name)
+        keyed[(*key, occurrences[key])] = unit
+        occurrences[key] += 1
+    return keyed
+
+
+def _field_equal(item_a, item_b, name: str, memo: dict[int, bytes]) -> bool:
+    if (
+        isinstance(item_a, pd.DataFrame)
+        and isinstance(item_b, pd.DataFrame)
+        and item_a.equals(item_b)
+    ):
+        # comparing a pair of tables directly is quicker than digesting both
+        return True
+    if not FLOAT_TOLERANCE:
+        try:
+            return content_digest(item_a, memo) == content_digest(item_b, memo)
+        except DigestUnavailableError:
+            pass
+    return check_item_with_dataframe_equal(item_a, item_b, name, [])[0]
+
+
+def _unit_delta(unit_a: Unit, unit_b: Unit, memo: dict[int, bytes]) -> UnitDelta | None:
+    state_a = unit_a._get_digest_state()
+    state_b = unit_b._get_digest_state()
+    fields = {}
+    for key in [*state_a, *(key for key in state_b if key not in state_a)]:
+        old = state_a.get(key)
+        new = state_b.get(key)
+        if key not in state_a or key not in state_b or not _field_equal(old, new, key, memo):
+            fields[key] = (old, new)
+    if type(unit_a) is not type(unit_b):
+        fields["__class__"] = (type(unit_a).__name__, type(unit_b).__name__)
+    return UnitDelta(unit_b.unit, unit_b.name, fields) if fields else None
+
+
+def _content_without_name(unit: Unit, memo: dict[int, bytes]) -> bytes | None:
+    state = {key: item for key, item in unit._get_digest_state().items() if key != "_name"}
+    try:
+        return _join(unit.unit.encode(), type(unit).__name__.encode(), content_digest(state, memo))
+    except DigestUnavailableError:
+        return None
+
+
+def _moved(positions: list[int]) -> set[int]:
+    """Finds the fewest positions which must have moved for the rest to be in order, i.e. all
+    those not in the longest increasing subsequence"""
+    tails: list[int] = []  # last position of the best subsequence of each length
+    tail_idx: list[int] = []
+    previous = [-1] * len(positions)
+    for idx, position in enumerate(positions):
+        length = bisect.bisect_left(tails, position)
+        previous[idx] = tail_idx[length - 1] if length > 0 else -1
+        if length == len(tails):
+            tails.append(position)
+            tail_idx.append(idx)
+        else:
+            tails[length] = position
+            tail_idx[length] = idx
+
+    in_order = set()
+    idx = tail_idx[-1] if tail_idx else -1
+    while idx != -1:
+        in_order.add(idx)
+        idx = previous[idx]
+    return set(range(len(positions))) - in_order
+
+
+def structural_diff(units_a: Sequence[Unit], units_b: Sequence[Unit]) -> StructuralDiff:
+    """Compares two sets of units, matching units by their type and name rather than comparing
+    the sets item by item.
+
+    Units which only appear in one set, but whose contents match a unit of the same type in the
+    other set apart from their name, are reported as renamed. Units which appear in both sets are
+    reported as moved if they are out of order relative to the other matched units, and as
+    modified if any of their attributes differ.
+
+    Args:
+        units_a (Sequence[Unit]): First set of units, in order.
+        units_b (Sequence[Unit]): Other set of units, in order.
+
+    Returns:
+        StructuralDiff: Units added, removed, renamed, moved and modified in ``units_b``.
+    """
+    changes = StructuralDiff()
+    memo: dict[int, bytes] = {}
+    keyed_a = _unit_keys(units_a)
+    keyed_b = _unit_keys(units_b)
+    positions_b = {key: idx for idx, key in enumerate(keyed_b)}
+
+    matched = []
+    for key, unit_a in keyed_a.items():
+        if key not in keyed_b:
+            changes.removed.append(unit_a)
+            continue
+        unit_b = keyed_b[key]
+        matched.append(positions_b[key])
+        delta = _unit_delta(unit_a, unit_b, memo)
+        if delta is not None:
+            changes.modified.append(delta)
+    added = [unit for key, unit in keyed_b.items() if key not in keyed_a]
+
+    # a removed and an added unit with the same contents other than the name is a rename
+    removed_by_content: dict[bytes, deque[Unit]] = defaultdict(deque)
+    for unit in changes.removed:
+        content = _content_without_name(unit, memo)
+        if content is not None:
+            removed_by_content[content].append(unit)
+    renamed_units: set[int] = set()
+    for unit in added:
+        content = _content_without_name(unit, memo)
+        if content is not None and removed_by_content.get(content):
+            old = removed_by_content[content].popleft()
+            changes.renamed.append((old, unit))
+            renamed_units.update((id(old), id(unit)))
+        else:
+            changes.added.append(unit)
+    changes.removed = [unit for unit in changes.removed if id(unit) not in renamed_units]
+
+    units_b = list(keyed_b.values())
+    changes.moved = [units_b[matched[idx]] for idx in sorted(_moved(matched))]
+    return changes
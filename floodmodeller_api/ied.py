@@ -30,6 +30,8 @@ class IED(FMFile):
     """Reads and write Flood Modeller event data format '.ied'
     Args:
         ied_filepath (str, optional): Full filepath to ied file. If not specified, a new IED class will be created.
+        backup (bool, optional): Whether to back up the file when it is loaded. Defaults to None,
+            which uses ``floodmodeller_api.backup.BACKUPS_ENABLED``.
 
     Output:
         Initiates 'IED' class object
@@ -43,11 +45,16 @@ class IED(FMFile):
     _suffix: str = ".ied"
 
     @handle_exception(when="read")
-    def __init__(self, ied_filepath: str | Path | None = None, from_json: bool = False):
+    def __init__(
+        self,
+        ied_filepath: str | Path | None = None,
+        from_json: bool = False,
+        backup: bool | None = None,
+    ):
         if from_json:
             return
         if ied_filepath is not None:
-            FMFile.__init__(self, ied_filepath)
+            FMFile.__init__(self, ied_filepath, backup=backup)
 
             self._read()
 
@@ -271,7 +278,12 @@ class IED(FMFile):
 
         self._ied_struct = ied_struct
 
-    def diff(self, other: IED, force_print: bool = False) -> None:
+    def diff(
+        self,
+        other: IED,
+        force_print: bool = False,
+        max_report: int | None = None,
+    ) -> None:
         """Compares the IED class against another IED class to check whether they are
         equivalent, or if not, what the differences are. Two instances of an IED class are
         deemed equivalent if all of their attributes are equal except for the filepath and
@@ -287,8 +299,10 @@ class IED(FMFile):
             other (floodmodeller_api.IED): Other instance of an IED class
             force_print (bool): Forces the API to print every difference found, rather than
                 just the first 25 differences. Defaults to False.
+            max_report (int, optional): Maximum number of changed cells to list for each table of
+                data, such as river section data. Defaults to None, which lists every changed cell.
         """
-        self._diff(other, force_print=force_print)
+        self._diff(other, force_print=force_print, max_report=max_report)
 
     def update(self) -> None:
         """Updates the existing IED based on any altered attributes"""
@@ -30,9 +30,10 @@ import pandas as pd
 from tqdm import trange
 
 from ._base import FMFile
+from .constants import EXY_ERROR_MAX, EXY_WARNING_MAX
 from .diff import check_item_with_dataframe_equal
 from .ief_flags import flags
-from .logs import LF1, create_lf
+from .logs import LF1, ExySummary, create_lf, summarise_exy
 from .to_from_json import Jsonable
 from .util import handle_exception, is_windows
 from .zz import ZZN
@@ -64,6 +65,8 @@ class IEF(FMFile):
     Args:
         ief_filepath (str, optional): Full filepath to ief file. If not specified, a new IEF class
             will be created.. Defaults to None.
+        backup (bool, optional): Whether to back up the file when it is loaded. Defaults to None,
+            which uses ``floodmodeller_api.backup.BACKUPS_ENABLED``.
 
     Raises:
         TypeError: Raised if ief_filepath not pointing to valide IEF file
@@ -75,15 +78,20 @@ class IEF(FMFile):
 
     _filetype: str = "IEF"
     _suffix: str = ".ief"
-    ERROR_MAX = 2000
-    WARNING_MAX = 3000
+    ERROR_MAX = EXY_ERROR_MAX
+    WARNING_MAX = EXY_WARNING_MAX
 
     @handle_exception(when="read")
-    def __init__(self, ief_filepath: str | Path | None = None, from_json: bool = False):
+    def __init__(
+        self,
+        ief_filepath: str | Path | None = None,
+        from_json: bool = False,
+        backup: bool | None = None,
+    ):
         if from_json:
             return
         if ief_filepath is not None:
-            FMFile.__init__(self, ief_filepath)
+            FMFile.__init__(self, ief_filepath, backup=backup)
             self._read()
             self._log_path = self._filepath.with_suffix(".lf1")
         else:
@@ -434,7 +442,12 @@ class IEF(FMFile):
         if not existing_attr_deleted:
             super().__delattr__(name)
 
-    def diff(self, other: IEF, force_print: bool = False) -> None:
+    def diff(
+        self,
+        other: IEF,
+        force_print: bool = False,
+        max_report: int | None = None,
+    ) -> None:
         """Compares the IEF class against another IEF class to check whether they are
         equivalent, or if not, what the differences are. Two instances of an IEF class are
         deemed equivalent if all of their attributes are equal except for the filepath and
@@ -447,8 +460,10 @@ class IEF(FMFile):
             other (floodmodeller_api.IEF): Other instance of an IEF class
             force_print (bool): Forces the API to print every difference found, rather than
                 just the first 25 differences. Defaults to False.
+            max_report (int, optional): Maximum number of changed cells to list for each table of
+                data, such as river section data. Defaults to None, which lists every changed cell.
         """
-        self._diff(other, force_print=force_print)
+        self._diff(other, force_print=force_print, max_report=max_report)
 
     def update(self) -> None:
         """Updates the existing IEF based on any altered attributes"""
@@ -633,39 +648,39 @@ class IEF(FMFile):
                 else:
                     break  # stopped for another reason
 
-    def _summarise_exy(self):
-        """Reads and summarises associated exy file if available"""
+    def get_exy_summary(self, max_messages_per_code: int = 0) -> ExySummary:
+        """If a diagnostics file (.exy) for the simulation exists, this function summarises it
 
-        # Get results location
-        if hasattr(self, "Results"):
-            exy_path = Path(self.Results).with_suffix(".exy")
-            if not exy_path.is_absolute():
-                # set cwd to ief location and resolve path
-                exy_path = Path(self._filepath.parent, exy_path).resolve()
+        Args:
+            max_messages_per_code (int, optional): Number of messages to retain for each
+                diagnostic code. If 0, only the counts are kept. Defaults to 0.
 
-        else:
-            exy_path = self._filepath.with_suffix(".exy")
+        Returns:
+            floodmodeller_api.logs.ExySummary: Counts of errors, warnings and notes
+        """
+
+        exy_path = self._get_result_filepath(suffix="exy")
 
         if not exy_path.exists():
             msg = "Simulation results error log (.exy) not found"
             raise FileNotFoundError(msg)
 
-        exy_data = pd.read_csv(exy_path, names=["node", "timestep", "severity", "code", "summary"])
-        exy_data["type"] = exy_data["code"].apply(
-            lambda x: (
-                "Error" if x < self.ERROR_MAX else ("Warning" if x < self.WARNING_MAX else "Note")
-            ),
+        return summarise_exy(
+            exy_path,
+            error_max=self.ERROR_MAX,
+            warning_max=self.WARNING_MAX,
+            max_messages_per_code=max_messages_per_code,
         )
-        errors = len(exy_data[exy_data["type"] == "Error"])
-        warnings = len(exy_data[exy_data["type"] == "Warning"])
-        notes = len(exy_data[exy_data["type"] == "Note"])
 
-        details = f"({errors} Error(s), {warnings} Warning(s), {notes} Note(s) ) - Check ZZD for more details."
+    def _summarise_exy(self):
+        """Reads and summarises associated exy file if available"""
+
+        summary = self.get_exy_summary()
 
-        if errors > 0:
-            return 1, f"Simulation Failed! - {details}"
+        if summary.failed:
+            return 1, f"Simulation Failed! - {summary}"
 
-        return 0, f"Simulation Completed! - {details}"
+        return 0, f"Simulation Completed! - {summary}"
 
 
 class FlowTimeProfile(Jsonable):
@@ -748,6 +763,9 @@ class FlowTimeProfile(Jsonable):
             f"profile={self.profile},\n\tcomment={self.comment}\n)>"
         )
 
+    def _get_digest_state(self) -> dict:
+        return {key: value for key, value in self.__dict__.items() if key != "_csvfile"}
+
     def __eq__(self, other, return_diff=False):
         result = True
         diff = []
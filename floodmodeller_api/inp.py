@@ -32,6 +32,8 @@ class INP(FMFile):
 
     Args:
         inp_filepath (str, optional): Full filepath to inp file. If not specified, a new INP class will be created. Defaults to None.
+        backup (bool, optional): Whether to back up the file when it is loaded. Defaults to None,
+            which uses ``floodmodeller_api.backup.BACKUPS_ENABLED``.
 
     Output:
         Initiates 'INP' class object
@@ -45,11 +47,16 @@ class INP(FMFile):
     _suffix: str = ".inp"
 
     @handle_exception(when="read")
-    def __init__(self, inp_filepath: str | Path | None = None, from_json: bool = False):
+    def __init__(
+        self,
+        inp_filepath: str | Path | None = None,
+        from_json: bool = False,
+        backup: bool | None = None,
+    ):
         if from_json:
             return
         if inp_filepath is not None:
-            FMFile.__init__(self, inp_filepath)
+            FMFile.__init__(self, inp_filepath, backup=backup)
             self._read()
 
         else:
@@ -216,7 +223,12 @@ class INP(FMFile):
 
         self._inp_struct = inp_struct
 
-    def diff(self, other: INP, force_print: bool = False) -> None:
+    def diff(
+        self,
+        other: INP,
+        force_print: bool = False,
+        max_report: int | None = None,
+    ) -> None:
         """Compares the INP class against another INP class to check whether they are
         equivalent, or if not, what the differences are. Two instances of an INP class are
         deemed equivalent if all of their attributes are equal except for the filepath and
@@ -232,8 +244,10 @@ class INP(FMFile):
             other (floodmodeller_api.INP): Other instance of an INP class
             force_print (bool): Forces the API to print every difference found, rather than
                 just the first 25 differences. Defaults to False.
+            max_report (int, optional): Maximum number of changed cells to list for each table of
+                data, such as river section data. Defaults to None, which lists every changed cell.
         """
-        self._diff(other, force_print=force_print)
+        self._diff(other, force_print=force_print, max_report=max_report)
 
     def update(self) -> None:
         """Updates the existing INP based on any altered attributes"""
@@ -1,2 +1,4 @@
-from .lf import LF1, LF2, create_lf
+from .exy import ExySummary, summarise_exy
+from .lf import LF1, LF2, create_lf, discover_lf
 from .lf_params import error_2d_dict
+from .watcher import LogWatcher
@@ -0,0 +1,126 @@
+"""
+Flood Modeller Python API
+Copyright (C) 2025 Jacobs U.K. Limited
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program.  If not, see https://www.gnu.org/licenses/.
+
+If you have any query about this program or this License, please contact us at support@floodmodeller.com or write to the following
+address: Jacobs UK Limited, Flood Modeller, Cottons Centre, Cottons Lane, London, SE1 2QG, United Kingdom.
+"""
+
+from __future__ import annotations
+
+import csv
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from ..constants import EXY_ERROR_MAX, EXY_WARNING_MAX
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@dataclass()
+class ExyMessage:
+    """Class to represent a single diagnostic message from an '.exy' file.
+
+    Args:
+        node (str): Node label the message refers to (may be blank).
+        timestep (float): Simulation time of the message.
+        severity (int): Severity flag as written by the engine.
+        code (int): Diagnostic code.
+        summary (str): Message text.
+    """
+
+    node: str
+    timestep: float
+    severity: int
+    code: int
+    summary: str
+
+
+@dataclass()
+class ExySummary:
+    """Class to hold a one-pass summary of a Flood Modeller '.exy' diagnostics file.
+
+    Args:
+        errors (int): Number of messages with a code below ``EXY_ERROR_MAX``.
+        warnings (int): Number of messages with a code below ``EXY_WARNING_MAX``.
+        notes (int): Number of all remaining messages.
+        code_counts (Counter[int]): Number of messages per diagnostic code.
+        messages (dict[int, list[ExyMessage]]): First messages retained for each code.
+    """
+
+    errors: int = 0
+    warnings: int = 0
+    notes: int = 0
+    code_counts: Counter[int] = field(default_factory=Counter)
+    messages: dict[int, list[ExyMessage]] = field(default_factory=dict)
+
+    @property
+    def failed(self) -> bool:
+        return self.errors > 0
+
+    def __str__(self) -> str:
+        return (
+            f"({self.errors} Error(s), {self.warnings} Warning(s), {self.notes} Note(s) )"
+            " - Check ZZD for more details."
+        )
+
+
+def summarise_exy(
+    filepath: str | Path,
+    error_max: int = EXY_ERROR_MAX,
+    warning_max: int = EXY_WARNING_MAX,
+    max_messages_per_code: int = 0,
+) -> ExySummary:
+    """Summarises a Flood Modeller '.exy' diagnostics file in a single streaming pass.
+
+    Messages are classified by their code, so that codes below ``error_max`` are errors, codes
+    below ``warning_max`` are warnings and everything else is a note. The file is never loaded
+    into memory in full, so this is suitable for failing runs with millions of diagnostic lines.
+
+    Args:
+        filepath (str | Path): Full filepath to the '.exy' file.
+        error_max (int, optional): Upper (exclusive) code limit for errors. Defaults to 2000.
+        warning_max (int, optional): Upper (exclusive) code limit for warnings. Defaults to 3000.
+        max_messages_per_code (int, optional): Number of messages to retain for each code. If 0,
+            only the counts are kept. Defaults to 0.
+
+    Returns:
+        ExySummary: Counts of errors, warnings and notes, plus any retained messages.
+    """
+    summary = ExySummary()
+    with open(filepath, newline="") as exy_file:
+        for row in csv.reader(exy_file, skipinitialspace=True):
+            if len(row) < 4:  # noqa: PLR2004
+                continue  # skips blank or truncated lines
+            code = int(float(row[3]))
+
+            if code < error_max:
+                summary.errors += 1
+            elif code < warning_max:
+                summary.warnings += 1
+            else:
+                summary.notes += 1
+
+            summary.code_counts[code] += 1
+            if summary.code_counts[code] <= max_messages_per_code:
+                summary.messages.setdefault(code, []).append(
+                    ExyMessage(
+                        node=row[0].strip(),
+                        timestep=float(row[1]),
+                        severity=int(float(row[2])),
+                        code=code,
+                        summary=",".join(row[4:]).strip(),
+                    ),
+                )
+
+    return summary
@@ -18,14 +18,19 @@ from __future__ import annotations
 
 import datetime as dt
 import logging
+import pickle
+import threading
 import time
+from concurrent.futures import Future, InvalidStateError
+from contextlib import suppress
 from typing import TYPE_CHECKING
 
 import pandas as pd
 
 from .._base import FMFile
 from ..util import handle_exception
-from .lf_helpers import state_factory
+from ..version import __version__
+from .lf_helpers import parse_line, state_factory
 from .lf_params import (
     lf1_steady_data_to_extract,
     lf1_unsteady_data_to_extract,
@@ -47,26 +52,94 @@ class LF(FMFile):
         lf1_filepath (str): Full filepath to model log file
         data_to_extract (dict): Dictionary defining each line type to parse
         steady (bool): True if for a steady-state simulation
+        use_cache (bool): If True, parsed data is loaded from (or saved to) a sidecar cache file
 
     Output:
         Initiates 'LF' class object
     """
 
+    CACHE_SUFFIX = ".cache"
+
     @handle_exception(when="read")
     def __init__(
         self,
         lf_filepath: str | Path | None,
         data_to_extract: dict[str, dict],
         steady: bool = False,
+        use_cache: bool = False,
     ):
         FMFile.__init__(self, lf_filepath)
 
         self._data_to_extract = data_to_extract
+        self._steady = steady
         self._init_counters()
         self._init_parsers()
         self._state = state_factory(steady, self._extracted_data)
 
-        self._read()
+        # the cache key is taken before reading, so lines written while the log is read make the
+        # cache stale rather than being skipped when it is next opened
+        cache_key = self._cache_key() if use_cache else None
+        if cache_key is None or not self._load_cache(cache_key):
+            self._read()
+            if cache_key is not None:
+                self._save_cache(cache_key)
+
+    @property
+    def _cache_filepath(self) -> Path:
+        return self._filepath.with_name(self._filepath.name + self.CACHE_SUFFIX)
+
+    def _cache_key(self) -> tuple:
+        """Identifies the log file contents and the API version used to parse them"""
+
+        stat = self._filepath.stat()
+        return (self._filetype, self._steady, stat.st_size, stat.st_mtime_ns, __version__)
+
+    def _load_cache(self, cache_key: tuple) -> bool:
+        """Loads parsed data from the cache file, returning False if it is missing or stale"""
+
+        try:
+            with open(self._cache_filepath, "rb") as cache_file:
+                cached = pickle.load(cache_file)
+        except FileNotFoundError:
+            return False
+        except Exception:
+            logging.info("Ignoring unreadable log file cache: %s", self._cache_filepath)
+            return False
+
+        if cached.get("key") != cache_key:
+            return False
+
+        # parsers and state are restored so that read() continues from where the cache stopped
+        self._extracted_data = cached["extracted_data"]
+        self._state = cached["state"]
+        self._no_lines = cached["no_lines"]
+        self._no_iters = cached["no_iters"]
+        for key, value in cached["attributes"].items():
+            setattr(self, key, value)
+        self.info = cached["info"]
+        return True
+
+    def _save_cache(self, cache_key: tuple) -> None:
+        """Saves parsed data, including info and all DataFrames, to the cache file"""
+
+        cached = {
+            "key": cache_key,
+            "extracted_data": self._extracted_data,
+            "state": self._state,
+            "no_lines": self._no_lines,
+            "no_iters": self._no_iters,
+            "attributes": {
+                key: getattr(self, key)
+                for key, params in self._data_to_extract.items()
+                if params["data_type"] == "all"
+            },
+            "info": self.info,
+        }
+        try:
+            with open(self._cache_filepath, "wb") as cache_file:
+                pickle.dump(cached, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError:
+            logging.info("Unable to write log file cache: %s", self._cache_filepath)
 
     def _read(self, force_reread: bool = False, suppress_final_step: bool = False):
         # Read LF file
@@ -119,24 +192,9 @@ class LF(FMFile):
 
         # loop through lines that haven't already been read
         raw_lines = self._raw_data[self._no_lines :]
+        parsers = list(self._extracted_data.values())
         for raw_line in raw_lines:
-            # loop through parser types
-            for key in self._data_to_extract:
-                parser = self._extracted_data[key]
-
-                if parser.use_regex:
-                    if not (match := parser.prefix.match(raw_line)):
-                        continue
-                    end_of_line = match.group(1).lstrip()
-
-                elif raw_line.startswith(parser.prefix):
-                    # store everything after prefix
-                    end_of_line = raw_line.split(parser.prefix)[1].lstrip()
-
-                else:
-                    continue
-                parser.process_line(end_of_line)
-
+            for parser in parse_line(raw_line, parsers):
                 # index marks the end of an iteration
                 if parser.is_index is True:
                     self._sync_cols()
@@ -248,6 +306,8 @@ class LF1(LF):
     Args:
         lf1_filepath (str): Full filepath to model lf1 file
         steady (bool): True for steady-state simulations
+        use_cache (bool): If True, parsed data is loaded from (or saved to) a sidecar cache file
+            ('.lf1.cache'), which is reused while the log file is unchanged
 
     **Attributes (unsteady)**
 
@@ -278,13 +338,18 @@ class LF1(LF):
     _filetype: str = "LF1"
     _suffix: str = ".lf1"
 
-    def __init__(self, lf_filepath: str | Path | None, steady: bool = False):
+    def __init__(
+        self,
+        lf_filepath: str | Path | None,
+        steady: bool = False,
+        use_cache: bool = False,
+    ):
         if steady is False:
             data_to_extract = lf1_unsteady_data_to_extract
         else:
             data_to_extract = lf1_steady_data_to_extract
 
-        super().__init__(lf_filepath, data_to_extract, steady)
+        super().__init__(lf_filepath, data_to_extract, steady, use_cache)
 
 
 class LF2(LF):
@@ -292,6 +357,8 @@ class LF2(LF):
 
     Args:
         lf2_filepath (str): Full filepath to model lf2 file
+        use_cache (bool): If True, parsed data is loaded from (or saved to) a sidecar cache file
+            ('.lf2.cache'), which is reused while the log file is unchanged
 
     **Attributes**
 
@@ -316,59 +383,117 @@ class LF2(LF):
     _filetype: str = "LF2"
     _suffix: str = ".lf2"
 
-    def __init__(self, lf_filepath: str | Path | None):
+    def __init__(self, lf_filepath: str | Path | None, use_cache: bool = False):
         data_to_extract = {
             **lf1_unsteady_data_to_extract,
             **lf2_data_to_extract,
         }
 
-        super().__init__(lf_filepath, data_to_extract, steady=False)
+        super().__init__(lf_filepath, data_to_extract, steady=False, use_cache=use_cache)
 
 
-def create_lf(filepath: Path, suffix: str) -> LF1 | LF2 | None:
-    """Checks for a new log file, waiting for its creation if necessary"""
+def _no_log_file(reason: str) -> None:
+    logging.warning("No progress bar as %s. Simulation will continue as usual.", reason)
 
-    def _no_log_file(reason: str) -> None:
-        logging.warning("No progress bar as %s. Simulation will continue as usual.", reason)
 
-    # ensure progress bar is supported
-    if suffix not in {"lf1", "lf2"}:
-        _no_log_file("log file must have suffix lf1 or lf2")
-        return None
+def _wait_for_lf(
+    filepath: Path,
+    suffix: str,
+    timeout: float,
+    poll_interval: float,
+    future: Future,
+) -> LF1 | LF2 | None:
+    """Polls for a new log file, giving up early if ``future`` is cancelled"""
 
     # wait for log file to exist
-    log_file_exists = False
-    max_time = time.time() + LOG_TIMEOUT
+    max_time = time.time() + timeout
 
-    while not log_file_exists:
-        time.sleep(0.1)
+    while True:
+        time.sleep(poll_interval)
 
-        log_file_exists = filepath.is_file()
+        if filepath.is_file():
+            break
 
         # timeout
-        if (not log_file_exists) and (time.time() > max_time):
+        if time.time() > max_time:
             _no_log_file("log file is expected but not detected")
             return None
+        if future.cancelled():
+            return None
 
     # wait for new log file
-    old_log_file = True
-    max_time = time.time() + LOG_TIMEOUT
+    max_time = time.time() + timeout
 
-    while old_log_file:
-        time.sleep(0.1)
+    while True:
+        time.sleep(poll_interval)
 
         # difference between now and when log file was last modified
         last_modified_timestamp = filepath.stat().st_mtime
         last_modified = dt.datetime.fromtimestamp(last_modified_timestamp)
         time_diff_sec = (dt.datetime.now() - last_modified).total_seconds()
 
-        # it's old if it's over OLD_FILE seconds old
-        old_log_file = time_diff_sec > OLD_FILE
+        # it's new if it's been modified within OLD_FILE seconds
+        if time_diff_sec <= OLD_FILE:
+            break
 
         # timeout
-        if old_log_file and (time.time() > max_time):
+        if time.time() > max_time:
             _no_log_file("log file is from previous run")
             return None
+        if future.cancelled():
+            return None
 
     # create LF instance
     return LF1(filepath) if suffix == "lf1" else LF2(filepath)
+
+
+def discover_lf(
+    filepath: Path,
+    suffix: str,
+    timeout: float | None = None,
+    poll_interval: float = 0.1,
+) -> Future[LF1 | LF2 | None]:
+    """Checks for a new log file in a background thread, without blocking the caller.
+
+    The returned future resolves to the log file object once the log file exists and has been
+    modified within the last few seconds, or to None if no new log file is found before
+    ``timeout``. Cancelling the future stops the polling.
+
+    Args:
+        filepath (Path): Full filepath to the expected log file
+        suffix (str): Log file suffix, either 'lf1' or 'lf2'
+        timeout (float, optional): Seconds to wait for the log file to appear, and then again for
+            it to be modified. Defaults to ``LOG_TIMEOUT``.
+        poll_interval (float, optional): Seconds between checks. Defaults to 0.1.
+
+    Returns:
+        Future[LF1 | LF2 | None]: Future resolving to the 'LF1' or 'LF2' class object, or None
+    """
+    future: Future[LF1 | LF2 | None] = Future()
+
+    # ensure progress bar is supported
+    if suffix not in {"lf1", "lf2"}:
+        _no_log_file("log file must have suffix lf1 or lf2")
+        future.set_result(None)
+        return future
+
+    timeout = LOG_TIMEOUT if timeout is None else timeout
+
+    def _discover() -> None:
+        # the future may be cancelled at any point, in which case the outcome is discarded
+        with suppress(InvalidStateError):
+            try:
+                result = _wait_for_lf(filepath, suffix, timeout, poll_interval, future)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    threading.Thread(target=_discover, name=f"discover_lf({filepath})", daemon=True).start()
+    return future
+
+
+def create_lf(filepath: Path, suffix: str) -> LF1 | LF2 | None:
+    """Checks for a new log file, waiting for its creation if necessary"""
+
+    return discover_lf(filepath, suffix).result()
@@ -17,16 +17,27 @@ address: Jacobs UK Limited, Flood Modeller, Cottons Centre, Cottons Lane, London
 from __future__ import annotations
 
 import datetime as dt
+import re
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING
 
 import pandas as pd
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
 
 class Data(ABC):
-    def __init__(self, header: str, subheaders: list | None):
+    def __init__(
+        self,
+        header: str,
+        subheaders: list | None,
+        converter: Callable[[list], list] | None = None,
+    ):
         self.header = header
         self.no_values = 0
         self._subheaders = subheaders
+        self._converter = converter  # converts buffered raw values in bulk, if given
 
     @abstractmethod
     def update(self):
@@ -38,32 +49,58 @@ class Data(ABC):
 
 
 class LastData(Data):
-    def __init__(self, header: str, subheaders: list | None):
-        super().__init__(header, subheaders)
+    def __init__(
+        self,
+        header: str,
+        subheaders: list | None,
+        converter: Callable[[list], list] | None = None,
+    ):
+        super().__init__(header, subheaders, converter)
         self._value = None  # single value
+        self._is_converted = True
 
     def update(self, data):
         self._value = data
+        self._is_converted = self._converter is None
         self.no_values = 1
 
     def get_value(self, index_key=None, index_df=None):
+        if not self._is_converted:
+            self._value = self._converter([self._value])[0]
+            self._is_converted = True
         return self._value
 
 
 class AllData(Data):
-    def __init__(self, header: str, subheaders: list | None):
-        super().__init__(header, subheaders)
+    def __init__(
+        self,
+        header: str,
+        subheaders: list | None,
+        converter: Callable[[list], list] | None = None,
+    ):
+        super().__init__(header, subheaders, converter)
         self._value: list[object] = []
+        self._no_converted = 0  # number of values converted so far
 
     def update(self, data):
         self._value.append(data)
         self.no_values += 1
 
+    def _convert(self):
+        """Converts any raw values buffered since the last conversion"""
+
+        if self._converter is None or self._no_converted == len(self._value):
+            return
+
+        self._value[self._no_converted :] = self._converter(self._value[self._no_converted :])
+        self._no_converted = len(self._value)
+
     def get_value(
         self,
         index_key: str | None = None,
         index_df: pd.Series | None = None,
     ) -> pd.DataFrame:
+        self._convert()
         value_df = pd.DataFrame(self._value)
 
         # do nothing to empty dataframes
@@ -100,11 +137,16 @@ class AllData(Data):
         return value_df.set_index(index_key)
 
 
-def data_factory(data_type: str, header: str, subheaders: list | None = None):
+def data_factory(
+    data_type: str,
+    header: str,
+    subheaders: list | None = None,
+    converter: Callable[[list], list] | None = None,
+):
     if data_type == "last":
-        return LastData(header, subheaders)
+        return LastData(header, subheaders, converter)
     if data_type == "all":
-        return AllData(header, subheaders)
+        return AllData(header, subheaders, converter)
     msg = f'Unexpected data "{data_type}"'
     raise ValueError(msg)
 
@@ -159,14 +201,18 @@ class Parser(ABC):
         exclude
         is_index
         before_index
+
+    Parsers with ``buffered = True`` store raw strings as each line is read and only convert them
+    (in bulk, via ``_convert``) when the value is requested.
     """
 
     _nan: object
+    buffered: bool = False
 
     def __init__(  # noqa: PLR0913
         self,
         name: str,
-        prefix: str,
+        prefix: str | re.Pattern[str],
         data_type: str,
         exclude: str | None = None,
         is_index: bool | None = False,
@@ -175,7 +221,7 @@ class Parser(ABC):
     ):
         self._name = name
 
-        self.prefix = prefix
+        self.prefix = re.compile(prefix) if use_regex and isinstance(prefix, str) else prefix
         self.is_index = is_index
         self.before_index = before_index
 
@@ -184,12 +230,22 @@ class Parser(ABC):
         self.no_values = 0
 
         self.data_type = data_type
-        self.data = data_factory(data_type, name)
+        self.data = data_factory(
+            data_type,
+            name,
+            converter=self._convert if self.buffered else None,
+        )
         self.use_regex = use_regex
 
     def process_line(self, raw_line: str) -> None:
         """self._process_line with exception handling of expected nan values"""
 
+        if self.buffered:
+            # conversion is left until the value is requested
+            excluded = self._exclude and raw_line in self._exclude
+            self.data.update(self._nan if excluded else raw_line)
+            return
+
         try:
             processed_line = self._process_line(raw_line)
 
@@ -205,10 +261,17 @@ class Parser(ABC):
     def _process_line(self, raw: str) -> object:
         """Converts string to meaningful data"""
 
+    def _convert(self, raw_values: list) -> list:
+        """Converts a list of buffered strings (or nan values) to meaningful data"""
+
+        return [self._process_line(raw) if isinstance(raw, str) else raw for raw in raw_values]
+
 
 class DateTimeParser(Parser):
     """Extra argument from superclass    code: str"""
 
+    buffered = True
+
     def __init__(self, *args, **kwargs):
         self._code = kwargs.pop("code")
         super().__init__(*args, **kwargs)
@@ -218,10 +281,17 @@ class DateTimeParser(Parser):
         """Converts string to datetime"""
         return dt.datetime.strptime(raw, self._code)
 
+    def _convert(self, raw_values: list) -> list[dt.datetime]:
+        """Converts strings to datetimes in bulk"""
+
+        return list(pd.to_datetime(raw_values, format=self._code).to_pydatetime())
+
 
 class TimeParser(Parser):
     """Extra argument from superclass    code: str"""
 
+    buffered = True
+
     def __init__(self, *args, **kwargs):
         self._code = kwargs.pop("code")
         super().__init__(*args, **kwargs)
@@ -233,8 +303,16 @@ class TimeParser(Parser):
         raw, _, _ = raw.partition(" ")  # Temp fix to ignore '(+n d)' in EFT
         return dt.datetime.strptime(raw, self._code).time()
 
+    def _convert(self, raw_values: list) -> list[dt.time]:
+        """Converts strings to times in bulk"""
+
+        raw_values = [raw.partition(" ")[0] if isinstance(raw, str) else raw for raw in raw_values]
+        return list(pd.to_datetime(raw_values, format=self._code).time)
+
 
 class TimeDeltaHMSParser(Parser):
+    buffered = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._nan = pd.NaT
@@ -245,8 +323,15 @@ class TimeDeltaHMSParser(Parser):
         h, m, s = raw.split(":")
         return dt.timedelta(hours=int(h), minutes=int(m), seconds=int(s))
 
+    def _convert(self, raw_values: list) -> list[dt.timedelta]:
+        """Converts strings HH:MM:SS to timedeltas in bulk"""
+
+        return list(pd.to_timedelta(raw_values).to_pytimedelta())
+
 
 class TimeDeltaHParser(Parser):
+    buffered = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._nan = pd.NaT
@@ -257,8 +342,18 @@ class TimeDeltaHParser(Parser):
         h = raw.split("hrs")[0]
         return dt.timedelta(hours=float(h))
 
+    def _convert(self, raw_values: list) -> list[dt.timedelta]:
+        """Converts strings H (with decimal place and "hrs") to timedeltas in bulk"""
+
+        hours = pd.to_numeric(
+            [raw.split("hrs")[0] if isinstance(raw, str) else None for raw in raw_values],
+        )
+        return list(pd.to_timedelta(hours, unit="h").to_pytimedelta())
+
 
 class TimeDeltaSParser(Parser):
+    buffered = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._nan = pd.NaT
@@ -269,6 +364,14 @@ class TimeDeltaSParser(Parser):
         s = raw.split("s")[0]  # not necessary for simulation time
         return dt.timedelta(seconds=float(s))
 
+    def _convert(self, raw_values: list) -> list[dt.timedelta]:
+        """Converts strings S (with decimal place and "s") to timedeltas in bulk"""
+
+        seconds = pd.to_numeric(
+            [raw.split("s")[0] if isinstance(raw, str) else None for raw in raw_values],
+        )
+        return list(pd.to_timedelta(seconds, unit="s").to_pytimedelta())
+
 
 class FloatParser(Parser):
     def __init__(self, *args, **kwargs):
@@ -344,6 +447,8 @@ class TimeFloatMultParser(Parser):
 class TimeSplitParser(Parser):
     """Extra argument from superclass    code: str, split: str"""
 
+    buffered = True
+
     def __init__(self, *args, **kwargs):
         self._code = kwargs.pop("code")
         self._split = kwargs.pop("split")
@@ -354,3 +459,32 @@ class TimeSplitParser(Parser):
         """Converts string to time, removing everything after split"""
 
         return dt.datetime.strptime(raw.split(self._split)[0].strip(), self._code).time()
+
+    def _convert(self, raw_values: list) -> list[dt.time]:
+        """Converts strings to times in bulk, removing everything after split"""
+
+        raw_values = [
+            raw.split(self._split)[0].strip() if isinstance(raw, str) else raw for raw in raw_values
+        ]
+        return list(pd.to_datetime(raw_values, format=self._code).time)
+
+
+def parse_line(raw_line: str, parsers: Iterable[Parser]) -> Iterator[Parser]:
+    """Passes a line of a log file to each parser whose prefix it starts with, yielding each
+    parser once it has processed the line"""
+
+    for parser in parsers:
+        prefix = parser.prefix
+        if not isinstance(prefix, str):
+            if not (match := prefix.match(raw_line)):
+                continue
+            end_of_line = match.group(1).lstrip()
+
+        elif raw_line.startswith(prefix):
+            # store everything after prefix
+            end_of_line = raw_line.split(prefix)[1].lstrip()
+
+        else:
+            continue
+        parser.process_line(end_of_line)
+        yield parser
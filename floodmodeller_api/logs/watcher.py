@@ -0,0 +1,197 @@
+"""
+Flood Modeller Python API
+Copyright (C) 2025 Jacobs U.K. Limited
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program.  If not, see https://www.gnu.org/licenses/.
+
+If you have any query about this program or this License, please contact us at support@floodmodeller.com or write to the following
+address: Jacobs UK Limited, Flood Modeller, Cottons Centre, Cottons Lane, London, SE1 2QG, United Kingdom.
+"""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from . import lf
+from .lf_helpers import parse_line
+from .lf_params import lf1_unsteady_data_to_extract, lf2_data_to_extract
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Iterable
+
+    from .lf_helpers import Parser
+
+WATCHED_PARAMETERS = ("progress", "mass_error", "timestep", "elapsed")
+
+
+def _init_last_value_parsers(data_to_extract: dict[str, dict]) -> dict[str, Parser]:
+    """Creates Parser objects for the watched parameters, keeping only their latest value"""
+
+    parsers = {}
+    for key in WATCHED_PARAMETERS:
+        subdictionary = data_to_extract[key]
+        subdictionary_kwargs = {
+            k: v for k, v in subdictionary.items() if k not in ("class", "data_type")
+        }
+        parsers[key] = subdictionary["class"](name=key, data_type="last", **subdictionary_kwargs)
+    return parsers
+
+
+class _WatchedLog:
+    """Incremental reader for a single log file, only ever reading newly written bytes"""
+
+    def __init__(self, filepath: Path, fresh_only: bool):
+        self.filepath = filepath
+        self.status = "waiting"
+        self._fresh_only = fresh_only
+        self._added = time.time()
+        self._data_to_extract = (
+            lf1_unsteady_data_to_extract
+            if filepath.suffix.lower() == ".lf1"
+            else {**lf1_unsteady_data_to_extract, **lf2_data_to_extract}
+        )
+        self._reset()
+
+    def _reset(self):
+        self._offset = 0
+        self._parsers = _init_last_value_parsers(self._data_to_extract)
+
+    def _is_ready(self, stat: os.stat_result | None) -> bool:
+        """Non-blocking equivalent of the checks made by ``create_lf``"""
+
+        if stat is None:
+            timed_out = time.time() > self._added + lf.LOG_TIMEOUT
+            self.status = "not found" if timed_out else "waiting"
+            return False
+
+        # it's old if it's over OLD_FILE seconds old
+        is_old = time.time() - stat.st_mtime > lf.OLD_FILE
+        if self._fresh_only and self.status != "active" and is_old:
+            timed_out = time.time() > self._added + lf.LOG_TIMEOUT
+            self.status = "previous run" if timed_out else "waiting"
+            return False
+
+        self.status = "active"
+        return True
+
+    def refresh(self) -> None:
+        try:
+            stat = self.filepath.stat()
+        except OSError:
+            stat = None
+
+        if not self._is_ready(stat) or stat is None:  # stat is only None when not ready
+            return
+
+        if stat.st_size < self._offset:
+            # file has been rewritten, e.g. by a new run
+            self._reset()
+        if stat.st_size == self._offset:
+            return
+
+        with open(self.filepath, "rb") as lf_file:
+            lf_file.seek(self._offset)
+            new_bytes = lf_file.read()
+
+        # leave any partially written line until the next refresh
+        complete_bytes = new_bytes[: new_bytes.rfind(b"\n") + 1]
+        self._offset += len(complete_bytes)
+        for raw_line in complete_bytes.decode(lf.LF.ENCODING, errors="replace").splitlines():
+            # exhausted for the parsers' side effects, as only their latest values are kept
+            for _ in parse_line(raw_line.rstrip("\r"), self._parsers.values()):
+                pass
+
+    def latest(self) -> dict[str, object]:
+        latest: dict[str, object] = {"status": self.status}
+        for key, parser in self._parsers.items():
+            value = parser.data.get_value()
+            if isinstance(value, list):
+                value = value[-1]  # drop duplicate of the simulated time
+            latest[key] = value
+        return latest
+
+
+class LogWatcher:
+    """Follows many Flood Modeller log files ('.lf1' or '.lf2') at once, such as for a set of
+    concurrent simulations.
+
+    Unlike ``LF1``/``LF2``, only the latest value of each watched parameter is kept and each call
+    to ``refresh()`` only reads the bytes written since the previous call. Log files that do not
+    exist yet, or are left over from a previous run, are polled without blocking until they are
+    (re)written, using the same rules as the simulation progress bar.
+
+    Args:
+        filepaths (Iterable[str | Path], optional): Log files to watch.
+        fresh_only (bool, optional): If True, log files are ignored until they have been
+            modified within the last few seconds, so results from a previous run are not shown.
+            Defaults to True.
+
+    Output:
+        Initiates 'LogWatcher' class object
+    """
+
+    def __init__(self, filepaths: Iterable[str | Path] = (), fresh_only: bool = True):
+        self._fresh_only = fresh_only
+        self._logs: dict[Path, _WatchedLog] = {}
+        for filepath in filepaths:
+            self.add(filepath)
+
+    def add(self, filepath: str | Path) -> None:
+        """Adds a log file to be watched
+
+        Args:
+            filepath (str | Path): Full filepath to log file
+        """
+        filepath = Path(filepath)
+        if filepath.suffix.lower() not in {".lf1", ".lf2"}:
+            msg = f"Log file must have suffix lf1 or lf2: {filepath}"
+            raise ValueError(msg)
+        if filepath not in self._logs:
+            self._logs[filepath] = _WatchedLog(filepath, self._fresh_only)
+
+    def remove(self, filepath: str | Path) -> None:
+        """Stops watching a log file
+
+        Args:
+            filepath (str | Path): Full filepath to log file
+        """
+        del self._logs[Path(filepath)]
+
+    @property
+    def filepaths(self) -> list[Path]:
+        return list(self._logs)
+
+    def refresh(self) -> pd.DataFrame:
+        """Reads anything newly written to each log file and returns the latest values
+
+        Returns:
+            pd.DataFrame: DataFrame indexed by log filepath with columns 'status', 'progress',
+            'mass_error', 'timestep' and 'elapsed'
+        """
+        for log in self._logs.values():
+            log.refresh()
+        return self.to_dataframe()
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns the latest values without reading the log files
+
+        Returns:
+            pd.DataFrame: DataFrame indexed by log filepath with columns 'status', 'progress',
+            'mass_error', 'timestep' and 'elapsed'
+        """
+        return pd.DataFrame(
+            [log.latest() for log in self._logs.values()],
+            index=pd.Index(list(self._logs), name="filepath"),
+            columns=["status", *WATCHED_PARAMETERS],
+        )
@@ -0,0 +1,123 @@
+"""
+Flood Modeller Python API
+Copyright (C) 2025 Jacobs U.K. Limited
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program.  If not, see https://www.gnu.org/licenses/.
+
+If you have any query about this program or this License, please contact us at support@floodmodeller.com or write to the following
+address: Jacobs UK Limited, Flood Modeller, Cottons Centre, Cottons Lane, London, SE1 2QG, United Kingdom.
+"""
+
+from __future__ import annotations
+
+import pickle
+import struct
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .version import __version__
+
+if TYPE_CHECKING:
+    from ._base import FMFile
+
+MAGIC = b"FMSNAP\x00\x01"
+ALIGNMENT = 64
+_LENGTH = struct.Struct("<Q")
+
+
+def _padding(size: int) -> int:
+    return -size % ALIGNMENT
+
+
+def write_snapshot(obj: FMFile, filepath: str | Path) -> None:
+    """
+    Function to write a flood modeller object to a binary snapshot file.
+
+    The object is pickled (protocol 5) with the data of each DataFrame and array written separately
+    as raw, aligned blocks after it, so that reading the snapshot doesn't need to copy them.
+
+    Args:
+        obj (FMFile): Any flood modeller file object (dat, ied, ief...)
+        filepath (str | Path): Path of the snapshot file to write.
+    """
+    buffers: list[pickle.PickleBuffer] = []
+    payload = {"class": type(obj), "state": obj._get_snapshot_state()}
+    data = pickle.dumps(payload, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [buffer.raw() for buffer in buffers]
+    header = pickle.dumps(
+        {
+            "api_version": __version__,
+            "class": f"{type(obj).__module__}.{type(obj).__qualname__}",
+            "data_size": len(data),
+            "buffer_sizes": [raw.nbytes for raw in raw_buffers],
+        },
+        protocol=5,
+    )
+
+    with open(filepath, "wb") as snapshot_file:
+        snapshot_file.write(MAGIC)
+        snapshot_file.write(_LENGTH.pack(len(header)))
+        snapshot_file.write(header)
+        snapshot_file.write(data)
+        offset = len(MAGIC) + _LENGTH.size + len(header) + len(data)
+        for raw in raw_buffers:
+            snapshot_file.write(bytes(_padding(offset)))
+            offset += _padding(offset)
+            snapshot_file.write(raw)
+            offset += raw.nbytes
+
+
+def read_snapshot(filepath: str | Path) -> FMFile:
+    """
+    Function to read a flood modeller object from a snapshot written by ``write_snapshot``.
+
+    Snapshots are pickles, so only read snapshots from a trusted source.
+
+    Args:
+        filepath (str | Path): Path of the snapshot file.
+
+    Raises:
+        ValueError: If the file isn't a snapshot, or was written by a different version of the API.
+
+    Returns:
+        FMFile: The flood modeller object.
+    """
+    filepath = Path(filepath)
+    contents = bytearray(filepath.stat().st_size)
+    with open(filepath, "rb") as snapshot_file:
+        snapshot_file.readinto(contents)
+    view = memoryview(contents)
+
+    if bytes(view[: len(MAGIC)]) != MAGIC:
+        msg = f"{filepath} is not a Flood Modeller API snapshot"
+        raise ValueError(msg)
+    offset = len(MAGIC)
+    (header_size,) = _LENGTH.unpack_from(view, offset)
+    offset += _LENGTH.size
+    header = pickle.loads(view[offset : offset + header_size])
+    offset += header_size
+    if header["api_version"] != __version__:
+        msg = (
+            f"{filepath} was written by version {header['api_version']} of the API, but this is "
+            f"version {__version__}. Please recreate it from the original file."
+        )
+        raise ValueError(msg)
+
+    data = view[offset : offset + header["data_size"]]
+    offset += header["data_size"]
+    buffers = []
+    for size in header["buffer_sizes"]:
+        offset += _padding(offset)
+        buffers.append(view[offset : offset + size])
+        offset += size
+
+    payload = pickle.loads(data, buffers=buffers)
+    obj = payload["class"].__new__(payload["class"])
+    obj._set_snapshot_state(payload["state"])
+    return obj
@@ -1,9 +1,18 @@
+import filecmp
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import timedelta
+from hashlib import sha1
 from pathlib import Path
 
 import pandas as pd
 import pytest
 
-from floodmodeller_api.backup import BackupControl, File
+from floodmodeller_api import DAT, backup
+from floodmodeller_api.backup import BackupControl, File, RetentionPolicy, file_digest
 
 
 @pytest.fixture()
@@ -21,10 +30,41 @@ def file(test_workspace):
     return file
 
 
+@pytest.fixture()
+def isolated_backups(tmp_path, monkeypatch):
+    # a backup directory of its own, so eviction doesn't affect any other backups
+    monkeypatch.setattr(backup.tempfile, "gettempdir", lambda: str(tmp_path / "temp"))
+    (tmp_path / "temp").mkdir()
+    return tmp_path
+
+
+def read_catalogue(file):
+    with closing(sqlite3.connect(file.catalogue_path)) as con:
+        return pd.read_sql("SELECT * FROM backups", con)
+
+
+def new_version(path, version):
+    """A File whose backup filename differs from any made in the same second by earlier Files"""
+    file = File(path)
+    file.dttm_str += f"_{version}"
+    file._generate_file_name()
+    return file
+
+
+def make_versions(path, count):
+    """Backs up a file with different contents each time, returning the File of the last"""
+    for version in range(count):
+        path.write_text(f"version {version}")
+        file = new_version(path, f"{version:03}")
+        file.backup()
+    return file
+
+
 def test_init_backup(backup_control):
     """Has the backup been initialised correctly?"""
+    backup_control.clear_backup()
     assert backup_control.backup_dir.exists()
-    assert backup_control.backup_csv_path.exists()
+    assert backup_control.catalogue_path.exists()
 
 
 def test_generate_file_id(file, test_workspace):
@@ -71,13 +111,9 @@ def test_no_duplicate_backup(file, test_workspace):
     """The backup method should only backup if the file has changed"""
     # Don't Make Duplicate -------------------
     # Check that the file isn't backed up again if it hasn't changed
-    the_same_file = File(Path(test_workspace, "EX1.DAT"))
-    # Append something to the dttm string to ensure the filename is different to the previous backup
-    # If the two File objects are created in the same second then then will have identical file names
-    # The function should check for equivalence between file contents.
-    the_same_file.dttm_str = the_same_file.dttm_str + "_1"
-    # Generate a new file name
-    the_same_file._generate_file_name()
+    # If the two File objects are created in the same second then they will have identical file names,
+    # so use a different one. The function should check for equivalence between file contents.
+    the_same_file = new_version(Path(test_workspace, "EX1.DAT"), 1)
     # Attempt a backup
     the_same_file.backup()
     # Check that the file hasn't been created
@@ -86,20 +122,19 @@ def test_no_duplicate_backup(file, test_workspace):
 
 
 def test_backup_logs(file):
-    """Are backups being logged in the CSV?"""
+    """Are backups being recorded in the catalogue?"""
     # Clear the backup
     file.clear_backup()
-    # There shouldn't be any edits in the csv
-    backup_logs = pd.read_csv(file.backup_csv_path)
+    # There shouldn't be any entries in the catalogue
+    backup_logs = read_catalogue(file)
     backup_count = backup_logs[
         (backup_logs.file_id == file.file_id) & (backup_logs.dttm == file.dttm_str)
     ].shape[0]
     assert backup_count == 0
-    # Make a backup and assert it is in the CSV
+    # Make a backup and assert it is in the catalogue
     file.backup()
-    # Check edits to the backup CSV
-    # Check a row has been added to the csv for the file & version
-    backup_logs = pd.read_csv(file.backup_csv_path)
+    # Check a row has been added to the catalogue for the file & version
+    backup_logs = read_catalogue(file)
     backup_count = backup_logs[
         (backup_logs.file_id == file.file_id) & (backup_logs.dttm == file.dttm_str)
     ].shape[0]
@@ -115,3 +150,268 @@ def test_list_backups(file):
     backups = file.list_backups()
     expected_backup = Path(file.backup_dir, file.backup_filename)
     assert expected_backup in [backup.path for backup in backups]
+
+
+def test_backup_can_be_disabled(test_workspace, monkeypatch):
+    """Backups can be turned off for all files, or for a single file"""
+    dat_file = File(Path(test_workspace, "EX1.DAT"))
+    dat_file.clear_backup()
+
+    DAT(Path(test_workspace, "EX1.DAT"), backup=False)
+    assert len(dat_file.list_backups()) == 0
+
+    monkeypatch.setattr(backup, "BACKUPS_ENABLED", False)
+    dat = DAT(Path(test_workspace, "EX1.DAT"))
+    assert len(dat.file.list_backups()) == 0
+
+    DAT(Path(test_workspace, "EX1.DAT"), backup=True)
+    assert len(dat_file.list_backups()) == 1
+
+
+def test_disabled_backups_do_not_touch_backup_directory(isolated_backups, test_workspace):
+    """A file which isn't backed up doesn't create the backup directory or catalogue"""
+    dat = DAT(Path(test_workspace, "EX1.DAT"), backup=False)
+    assert not dat.file.backup_dir.exists()
+
+
+def test_backups_are_content_addressed(test_workspace, tmp_path):
+    """Files with the same contents share a single stored copy"""
+    # unique contents, so they aren't shared with other backups
+    contents = Path(test_workspace, "EX1.DAT").read_text() + str(tmp_path)
+    files = []
+    for name in ("a.DAT", "b.DAT"):
+        (tmp_path / name).write_text(contents)
+        files.append(File(tmp_path / name))
+        files[-1].backup()
+
+    digest = file_digest(tmp_path / "a.DAT")
+    object_path = files[0]._object_path(digest)
+    assert object_path.exists()
+    for file in files:
+        backups = file.list_backups()
+        assert len(backups) == 1
+        assert filecmp.cmp(backups[0].path, file.path, shallow=False)
+        if object_path.stat().st_nlink > 1:  # i.e. hard links are supported
+            assert Path(backups[0].path).samefile(object_path)
+
+    # a changed file is backed up again
+    with open(tmp_path / "a.DAT", "a") as f:
+        f.write("\n")
+    changed = new_version(tmp_path / "a.DAT", 1)
+    changed.backup()
+    assert len(changed.list_backups()) == 2
+
+    # stored contents are only removed once no backups use them
+    files[0].clear_backup()
+    assert object_path.exists() == Path(files[1].list_backups()[0].path).samefile(object_path)
+    files[1].clear_backup()
+    assert not object_path.exists()
+
+
+def test_existing_backups_are_catalogued(isolated_backups):
+    """Backups made before the catalogue existed can still be listed"""
+    backup_dir = isolated_backups / "temp" / "floodmodeller_api_backup"
+    backup_dir.mkdir()
+    path = isolated_backups / "a.DAT"
+    path.write_text("contents")
+    file_id = sha1(str(path.absolute()).encode()).hexdigest()
+    (backup_dir / f"{file_id}_2020-01-01-00-00-00.DAT").write_text("old contents")
+    (backup_dir / "file-backups.csv").write_text("path,file_id,dttm\n")
+
+    file = File(path)
+    backups = file.list_backups()
+    assert [b.path.name for b in backups] == [f"{file_id}_2020-01-01-00-00-00.DAT"]
+
+    file.backup()
+    assert len(file.list_backups()) == 2
+    file.clear_backup()
+    assert len(file.list_backups()) == 0
+    with pytest.deprecated_call():
+        assert file.backup_csv_path.exists()
+
+
+def test_retention_max_versions(isolated_backups):
+    """Only the newest versions of each file are kept"""
+    file_a = make_versions(isolated_backups / "a.DAT", 4)
+    file_b = make_versions(isolated_backups / "b.DAT", 2)
+
+    assert file_a.evict(RetentionPolicy(max_versions=2)) == 2
+    backups = file_a.list_backups()
+    assert [b.path.name[-7:-4] for b in backups] == ["003", "002"]
+    assert len(file_b.list_backups()) == 2
+    assert len(list(file_a.objects_dir.iterdir())) == len(list(file_a.backup_dir.glob("*.DAT")))
+
+
+def test_retention_max_age(isolated_backups):
+    """Backups older than the maximum age are removed"""
+    file = make_versions(isolated_backups / "a.DAT", 3)
+    with closing(sqlite3.connect(file.catalogue_path)) as con, con:
+        oldest = con.execute("SELECT MIN(filename) FROM backups").fetchone()[0]
+        two_hours_ago = time.time() - 7200
+        con.execute("UPDATE backups SET created = ? WHERE filename = ?", (two_hours_ago, oldest))
+
+    assert file.evict(RetentionPolicy(max_age=timedelta(hours=1))) == 1
+    assert oldest not in [b.path.name for b in file.list_backups()]
+    assert not (file.backup_dir / oldest).exists()
+
+
+def test_retention_max_bytes(isolated_backups):
+    """The oldest backups are removed until the stored contents fit, counting shared contents once"""
+    file_a = make_versions(isolated_backups / "a.DAT", 3)  # 9 bytes each
+    (isolated_backups / "b.DAT").write_text("version 2")  # shares contents with the newest a.DAT
+    file_b = File(isolated_backups / "b.DAT")
+    file_b.backup()
+
+    assert file_a.evict(RetentionPolicy(max_bytes=20)) == 1
+    assert len(file_a.list_backups()) == 2
+    assert len(file_b.list_backups()) == 1
+    assert file_a.evict(RetentionPolicy(max_bytes=9)) == 1
+    assert [b.path.name[-7:-4] for b in file_a.list_backups()] == ["002"]
+
+
+def test_retention_applied_after_backup(isolated_backups, monkeypatch):
+    """The module level retention policy is applied whenever a backup is made"""
+    monkeypatch.setattr(backup, "RETENTION_POLICY", RetentionPolicy(max_versions=3))
+    file = make_versions(isolated_backups / "a.DAT", 5)
+    assert len(file.list_backups()) == 3
+
+
+def test_concurrent_backups(isolated_backups):
+    """Backups made at the same time are all recorded in the catalogue"""
+    paths = []
+    for idx in range(20):
+        paths.append(isolated_backups / f"{idx}.DAT")
+        paths[-1].write_text(f"file {idx} {os.getpid()}")
+
+    def backup_file(path):
+        file = File(path)
+        file.backup()
+        return file
+
+    with ThreadPoolExecutor(8) as executor:
+        files = list(executor.map(backup_file, paths))
+
+    assert len(read_catalogue(files[0])) == len(paths)
+    for file in files:
+        assert len(file.list_backups()) == 1
+
+
+def test_opening_catalogue_does_not_lock_it(isolated_backups, monkeypatch):
+    """An up to date catalogue can be used by a new process while another is writing to it"""
+    file = make_versions(isolated_backups / "a.DAT", 1)
+    monkeypatch.setattr(backup, "_initialised_catalogues", set())
+    monkeypatch.setattr(backup, "CATALOGUE_TIMEOUT", 0.1)
+    with closing(sqlite3.connect(file.catalogue_path, isolation_level=None)) as con:
+        con.execute("BEGIN IMMEDIATE")
+        assert len(File(file.path).list_backups()) == 1
+        con.execute("ROLLBACK")
+
+
+def test_background_backups(isolated_backups, test_workspace, monkeypatch):
+    """Backups can be made in the background, completing before the file is updated"""
+    monkeypatch.setattr(backup, "BACKGROUND_BACKUPS", True)
+    original_backup = File.backup
+
+    def slow_backup(self):
+        time.sleep(0.2)
+        original_backup(self)
+
+    monkeypatch.setattr(File, "backup", slow_backup)
+    dat_path = isolated_backups / "EX1.DAT"
+    dat_path.write_bytes(Path(test_workspace, "EX1.DAT").read_bytes())
+
+    dat = DAT(dat_path)
+    assert len(dat.file.list_backups()) == 0  # still being made
+    dat.title = "Updated title"
+    dat.update()
+
+    backups = dat.file.list_backups()
+    assert len(backups) == 1
+    assert backups[0].path.read_bytes() == Path(test_workspace, "EX1.DAT").read_bytes()
+
+    file = new_version(dat_path, 1)
+    future = backup.backup_in_background(file)
+    backup.flush()
+    assert future.done()
+    assert len(file.list_backups()) == 2
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_compressed_backups(isolated_backups, test_workspace, monkeypatch, compression):
+    """Backups can be compressed, falling back to gzip if zstandard isn't installed"""
+    monkeypatch.setattr(backup, "COMPRESSION", compression)
+    path = isolated_backups / "EX1.DAT"
+    path.write_bytes(Path(test_workspace, "EX1.DAT").read_bytes())
+    file = File(path)
+    file.backup()
+
+    (stored,) = file.list_backups()
+    expected_suffix = ".zst" if compression == "zstd" and backup.zstandard else ".gz"
+    assert stored.path.suffix == expected_suffix
+    assert stored.path.stat().st_size < path.stat().st_size
+    stored.restore(isolated_backups / "restored.DAT")
+    assert (isolated_backups / "restored.DAT").read_bytes() == path.read_bytes()
+
+    file.backup()  # unchanged, so not backed up again
+    assert len(file.list_backups()) == 1
+
+
+def test_unsupported_compression(isolated_backups, monkeypatch):
+    monkeypatch.setattr(backup, "COMPRESSION", "lzma")
+    with pytest.raises(ValueError, match="Unsupported backup compression"):
+        make_versions(isolated_backups / "a.DAT", 1)
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_delta_backups(isolated_backups, test_workspace, monkeypatch, compression):
+    """Only the newest backup is stored in full, and every version can still be restored"""
+    monkeypatch.setattr(backup, "DELTA_BACKUPS", True)
+    monkeypatch.setattr(backup, "COMPRESSION", compression)
+    path = isolated_backups / "EX1.DAT"
+    lines = Path(test_workspace, "EX1.DAT").read_bytes().splitlines(keepends=True)
+    versions = [
+        b"".join(lines),
+        b"".join([*lines[:10], b"changed line\r\n", *lines[11:]]),
+        b"".join([*lines[:10], b"changed line\r\n", *lines[11:], b"appended\r\n"]),
+        b"".join(lines[5:]),
+    ]
+    for idx, contents in enumerate(versions):
+        path.write_bytes(contents)
+        file = new_version(path, idx)
+        file.backup()
+
+    backups = file.list_backups()
+    assert len(backups) == len(versions)
+    assert backups[0].base is None
+    assert all(b.base is backups[idx] for idx, b in enumerate(backups[1:]))
+    for stored, contents in zip(backups, reversed(versions)):
+        assert stored.read_bytes() == contents
+        stored.restore(isolated_backups / "restored.DAT")
+        assert (isolated_backups / "restored.DAT").read_bytes() == contents
+    for stored in backups[1:]:
+        assert stored.path.stat().st_size < len(versions[0]) / 10
+    assert len(list(file.objects_dir.iterdir())) == 1
+
+    # evicting the oldest backups leaves the rest restorable
+    assert file.evict(RetentionPolicy(max_versions=2)) == 2
+    backups = file.list_backups()
+    assert [b.read_bytes() for b in backups] == versions[:1:-1]
+
+
+def test_delta_backups_in_quick_succession(isolated_backups, monkeypatch):
+    """Backups made within the same second are distinct versions, and are never deltas of themselves"""
+    monkeypatch.setattr(backup, "DELTA_BACKUPS", True)
+    path = isolated_backups / "a.DAT"
+    versions = [b"first\r\nshared\r\n", b"second\r\nshared\r\n", b"third\r\nshared\r\n"]
+    path.write_bytes(versions[0])
+    File(path).backup()
+    path.write_bytes(versions[1])
+    file = File(path)
+    file.backup()
+    # the same object backs up the file again after it changes
+    path.write_bytes(versions[2])
+    file.backup()
+
+    backups = file.list_backups()
+    assert len({b.path for b in backups}) == len(versions)
+    assert [b.read_bytes() for b in backups] == versions[::-1]
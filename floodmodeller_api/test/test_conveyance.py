@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
@@ -9,15 +10,27 @@ from numpy.testing import assert_array_almost_equal
 from scipy.spatial.distance import directed_hausdorff
 
 from floodmodeller_api import DAT
+from floodmodeller_api.units import CONDUIT, RIVER
 from floodmodeller_api.units.conveyance import (
+    CONVEYANCE_CACHE,
+    MINIMUM_PERIMETER_THRESHOLD,
+    ConveyanceCache,
+    ConveyanceCacheStats,
+    calculate_closed_conveyance,
+    calculate_conveyance_curves,
     calculate_cross_section_conveyance,
     calculate_geometry,
     insert_intermediate_wls,
+    interpolate_geometry,
+    sum_conveyance,
 )
+from floodmodeller_api.util import FloodModellerAPIError
 
 if TYPE_CHECKING:
     from pathlib import Path
 
+    from floodmodeller_api.units.conveyance import SectionGeometry
+
 
 def test_calculate_cross_section_conveyance():
     x = np.array([0, 1, 2, 3, 4])
@@ -43,11 +56,31 @@ def test_insert_intermediate_wls():
     assert all(np.diff(result) <= threshold), "All gaps should be <= to the threshold"
 
 
+def test_insert_intermediate_wls_matches_linspace():
+    arr = np.unique(next(_random_sections(1))[1])
+    expected = np.concatenate(
+        [
+            *(
+                np.linspace(start, end, int((end - start) // 0.05) + 2, endpoint=False)
+                for start, end in zip(arr[:-1], arr[1:])
+            ),
+            arr[-1:],
+        ],
+    )
+    np.testing.assert_array_equal(insert_intermediate_wls(arr, 0.05), expected)
+
+
 @pytest.fixture(scope="module")
 def dat(test_workspace: Path):
     return DAT(test_workspace / "conveyance_test.dat")
 
 
+def river_geometry(dat: DAT, name: str) -> SectionGeometry:
+    section = dat.sections[name]
+    assert isinstance(section, RIVER)
+    return section._get_conveyance_geometry()
+
+
 @pytest.fixture(scope="module")
 def from_gui(test_workspace: Path):
     return pd.read_csv(test_workspace / "expected_conveyance.csv")
@@ -102,3 +135,306 @@ def test_calculate_geometry():
     assert_array_almost_equal(total_area, np.array([0, 2.185, 13.65]))
     assert_array_almost_equal(total_length, np.array([0, 6.808522, 15.145467]))
     assert_array_almost_equal(total_mannings, np.array([0, 28.383004, 34.959038]))
+
+
+@pytest.mark.parametrize("dat_name", ["conveyance_test.dat", "EX18.DAT", "network.dat"])
+@pytest.mark.parametrize("max_batch_size", [1, 2_000_000])
+def test_conveyance_curves_match_each_section(
+    test_workspace: Path,
+    dat_name: str,
+    max_batch_size: int,
+):
+    dat = DAT(test_workspace / dat_name)
+    CONVEYANCE_CACHE.clear()
+    with patch("floodmodeller_api.units.conveyance.MAX_BATCH_SIZE", max_batch_size):
+        curves = dat.conveyance_curves()
+    assert CONVEYANCE_CACHE.stats.misses == len(curves)
+
+    rivers = [name for name, unit in dat.sections.items() if isinstance(unit, RIVER)]
+    assert [name for name in curves if name in rivers] == rivers
+    for name, curve in curves.items():
+        if name in rivers:
+            expected = calculate_cross_section_conveyance(
+                *dat.sections[name]._get_conveyance_geometry(),
+            )
+        elif name in dat.conduits:
+            expected = calculate_closed_conveyance(
+                *dat.conduits[name]._get_conveyance_geometry()[:3],
+            )
+        else:
+            continue
+        pd.testing.assert_series_equal(curve, expected, check_exact=True)
+
+
+def test_conveyance_curves_in_parallel(dat: DAT):
+    curves = dat.conveyance_curves(["a", "c", "e3"], workers=2)
+    assert list(curves) == ["a", "c", "e3"]
+    for name, curve in curves.items():
+        expected = calculate_cross_section_conveyance(*river_geometry(dat, name))
+        pd.testing.assert_series_equal(curve, expected, check_exact=True)
+
+
+def _loop_sum_conveyance(y, rpl, panel_markers, water_levels, area, length, mannings):
+    """Previous implementation of sum_conveyance, looping over every panel and section"""
+    panel = panel_markers.cumsum()[:-1]
+
+    intersection = (y[:-2] < water_levels[:, np.newaxis]) & (y[1:-1] >= water_levels[:, np.newaxis])
+    section_markers = np.hstack([np.full((intersection.shape[0], 1), False), intersection])
+    section = section_markers.cumsum(axis=1)
+
+    conveyance = np.zeros_like(water_levels)
+
+    for i in range(panel.max() + 1):
+        in_panel = panel == i
+        if not in_panel.any():
+            continue
+
+        rpl_panel = np.sqrt(rpl[:-1][in_panel][0])
+        rpl_panel = 1 if rpl_panel == 0 else rpl_panel
+
+        for j in range(section.max() + 1):
+            in_section = section == j
+            in_panel_and_section = in_panel & in_section
+            if not in_panel_and_section.any():
+                continue
+
+            total_area = np.where(in_panel_and_section, area, 0).sum(axis=1)
+            total_length = np.where(in_panel_and_section, length, 0).sum(axis=1)
+            total_mannings = np.where(in_panel_and_section, mannings, 0).sum(axis=1)
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                conveyance += np.where(
+                    total_length >= MINIMUM_PERIMETER_THRESHOLD,
+                    total_area ** (5 / 3) * total_length ** (1 / 3) / (total_mannings * rpl_panel),
+                    0,
+                )
+
+    return pd.Series(conveyance, index=water_levels)
+
+
+def _random_sections(no_sections: int):
+    rng = np.random.default_rng(117)
+    for _ in range(no_sections):
+        no_points = rng.integers(3, 60)
+        x = np.cumsum(rng.uniform(0, 5, no_points))
+        y = np.round(rng.uniform(0, 10, no_points), 2)
+        n = rng.choice([0.0, 0.03, 0.05, 0.1], no_points)
+        rpl = rng.choice([0.0, 0.5, 1.0, 1.5], no_points)
+        panel_markers = rng.random(no_points) < 0.2
+        yield x, y, n, rpl, panel_markers
+
+
+def _assert_sum_conveyance_matches_loop_implementation(x, y, n, rpl, panel_markers):
+    water_levels = insert_intermediate_wls(np.unique(y), threshold=0.05)
+    geometry = calculate_geometry(x, y, n, water_levels)
+    expected = _loop_sum_conveyance(y, rpl, panel_markers, water_levels, *geometry)
+    actual = sum_conveyance(y, rpl, panel_markers, water_levels, *geometry)
+    # only the order in which values are summed has changed
+    pd.testing.assert_series_equal(actual, expected, check_exact=False, rtol=1e-12)
+
+
+@pytest.mark.parametrize("dat_name", ["conveyance_test.dat", "EX18.DAT", "network.dat", "EX6.DAT"])
+def test_sum_conveyance_matches_loop_implementation(test_workspace: Path, dat_name: str):
+    dat = DAT(test_workspace / dat_name)
+    for unit in dat.sections.values():
+        if isinstance(unit, RIVER) and unit.subtype == "SECTION":
+            _assert_sum_conveyance_matches_loop_implementation(*unit._get_conveyance_geometry())
+
+
+def test_sum_conveyance_matches_loop_implementation_with_panels():
+    for geometry in _random_sections(50):
+        _assert_sum_conveyance_matches_loop_implementation(*geometry)
+
+
+def test_conveyance_cache(dat: DAT):
+    geometries = [river_geometry(dat, name) for name in ("a", "b", "c")]
+    keys = [ConveyanceCache.key(geometry) for geometry in geometries]
+    assert len(set(keys)) == len(keys)
+    x, y, n, rpl, panel_markers = (values.copy() for values in geometries[0])
+    assert ConveyanceCache.key((x, y, n, rpl, panel_markers)) == keys[0]
+
+    cache = ConveyanceCache(max_size=2)
+    curves = calculate_conveyance_curves(geometries, cache=cache)
+    assert cache.stats == ConveyanceCacheStats(
+        hits=0,
+        misses=3,
+        evictions=1,
+        size=2,
+        nbytes=sum(curve.memory_usage(index=True) for curve in curves[1:]),
+    )
+
+    assert cache.get(keys[0]) is None
+    cached = cache.get(keys[2])
+    assert cached is not None
+    pd.testing.assert_series_equal(cached, curves[2])
+    cached.iloc[0] = -1  # a copy is returned, so the cache is unaffected
+    cached = cache.get(keys[2])
+    assert cached is not None
+    assert cached.iloc[0] == curves[2].iloc[0]
+
+    cache.max_bytes = curves[2].memory_usage(index=True)
+    cache.put(keys[2], curves[2])
+    assert cache.get(keys[1]) is None
+    assert cache.stats.size == 1
+
+
+def test_conveyance_cache_on_disk(dat: DAT, tmp_path: Path):
+    geometries = [river_geometry(dat, name) for name in ("a", "d")]
+    curves = calculate_conveyance_curves(geometries, cache=ConveyanceCache(directory=tmp_path))
+    assert len(list(tmp_path.glob("*.npy"))) == len(geometries)
+
+    cache = ConveyanceCache(directory=tmp_path)
+    with patch("floodmodeller_api.units.conveyance._calculate_batch") as calculate_batch:
+        cached_curves = calculate_conveyance_curves(geometries, cache=cache)
+    calculate_batch.assert_not_called()
+    assert cache.stats.hits == len(geometries)
+    for cached, curve in zip(cached_curves, curves):
+        pd.testing.assert_series_equal(cached, curve, check_exact=True)
+
+
+def test_rectangular_conduit_conveyance():
+    conduit = CONDUIT(
+        subtype="RECTANGULAR",
+        invert=10.0,
+        width=2.0,
+        height=1.5,
+        friction_eq="MANNING",
+        friction_on_invert=0.015,
+        friction_on_walls=0.015,
+        friction_on_soffit=0.015,
+    )
+    conveyance = conduit.conveyance
+    depth = conveyance.index.to_numpy() - 10.0
+    expected = (2.0 * depth) ** (5 / 3) / (0.015 * (2.0 + 2 * depth) ** (2 / 3))
+    assert conveyance.index[-1] == 11.5
+    np.testing.assert_allclose(conveyance.to_numpy(), expected, rtol=1e-12)
+
+
+def test_circular_conduit_conveyance(test_workspace: Path):
+    conduit = DAT(test_workspace / "EX18.DAT").conduits["C2"]
+    radius = conduit.diameter / 2
+    conveyance = conduit.conveyance
+
+    # half full, with the conduit approximated by straight segments
+    half_full = conveyance[conduit.invert + radius]
+    area = np.pi * radius**2 / 2
+    expected = area ** (5 / 3) / (conduit.friction_below_axis * (np.pi * radius) ** (2 / 3))
+    assert half_full == pytest.approx(expected, rel=1e-2)
+
+    # maximum conveyance is just below the crown
+    assert conveyance.index[-1] == pytest.approx(conduit.invert + conduit.diameter)
+    assert conduit.invert + 0.9 * conduit.diameter < conveyance.idxmax() < conveyance.index[-1]
+
+
+def test_unsupported_conduit_conveyance(test_workspace: Path):
+    dat = DAT(test_workspace / "All Units 4_6.DAT")
+    with pytest.raises(ValueError, match="not supported for 'SPRUNG' conduits"):
+        dat.conduits["UNIT012"].conveyance  # noqa: B018
+    with pytest.raises(FloodModellerAPIError, match="not supported for 'SPRUNG' conduits"):
+        dat.conveyance_curves(["UNIT012"])
+
+
+def test_conveyance_curves_of_unknown_or_shared_names(test_workspace: Path, caplog):
+    dat = DAT(test_workspace / "All Units 4_6.DAT")
+    with pytest.raises(FloodModellerAPIError, match="'missing' as it is not a section or conduit"):
+        dat.conveyance_curves(["missing"])
+
+    # give a conduit the same label as a river section
+    dat.conduits["derek"] = dat.conduits.pop("UNIT010")
+    with pytest.raises(
+        FloodModellerAPIError,
+        match="'derek' as it is both a section and a conduit",
+    ):
+        dat.conveyance_curves(["derek"])
+
+    curves = dat.conveyance_curves()
+    assert "derek" not in curves
+    assert {"UNIT007", "bernie", "gjjf", "k"} <= curves.keys()
+    assert "Skipping conveyance for 'derek' as it is both a section and a conduit" in caplog.text
+
+
+def test_interpolate_geometry(dat: DAT):
+    upstream = river_geometry(dat, "a")
+    downstream = river_geometry(dat, "c")
+
+    for weight, section in ((0, upstream), (1, downstream)):
+        expected = calculate_cross_section_conveyance(*section)
+        interpolated = calculate_cross_section_conveyance(
+            *interpolate_geometry(upstream, downstream, weight),
+        )
+        # compared at the levels of each point, as intermediate levels depend on the points
+        levels = np.unique(section[1]).tolist()
+        np.testing.assert_allclose(interpolated.loc[levels], expected.loc[levels], rtol=1e-9)
+
+    x, y, *_ = interpolate_geometry(upstream, downstream, 0.25)
+    assert x[0] == pytest.approx(0.75 * upstream[0][0] + 0.25 * downstream[0][0])
+    assert y[-1] == pytest.approx(0.75 * upstream[1][-1] + 0.25 * downstream[1][-1])
+
+
+def test_interpolate_conveyance_from_dat(test_workspace: Path):
+    dat = DAT(test_workspace / "ex4.DAT")
+    curves = dat.conveyance_curves(["DS.001", "DS.006"])
+
+    upstream = dat.sections["CSRD01"]._get_conveyance_geometry()
+    downstream = dat.sections["DS2"]._get_conveyance_geometry()
+    for name, distance in (("DS.001", 10), ("DS.006", 260)):
+        expected = calculate_cross_section_conveyance(
+            *interpolate_geometry(upstream, downstream, distance / 310),
+        )
+        pd.testing.assert_series_equal(curves[name], expected, check_exact=True)
+
+
+def test_replicate_conveyance_from_dat(test_workspace: Path):
+    dat = DAT(test_workspace / "EX18.DAT")
+    curves = dat.conveyance_curves(["C2", "C2_R1", "C2_R4"])
+
+    for name, drop in (("C2_R1", 0.2), ("C2_R4", 0.8)):
+        np.testing.assert_allclose(curves[name].to_numpy(), curves["C2"].to_numpy())
+        np.testing.assert_allclose(curves[name].index, curves["C2"].index - drop)
+
+
+def test_unresolved_interpolate_conveyance(test_workspace: Path):
+    dat = DAT(test_workspace / "defaultUnits.dat")
+    assert dat.conveyance_curves() == {}
+    with pytest.raises(FloodModellerAPIError, match="no upstream section within its reach"):
+        dat.conveyance_curves(["interDef"])
+
+
+def _spikes(conveyance: pd.Series) -> set[float]:
+    """Levels at which conveyance peaks before dropping by over 1% of its maximum"""
+    change = np.diff(conveyance.to_numpy())
+    is_spike = (change[:-1] > 0) & (change[1:] < -0.01 * conveyance.max())
+    return set(conveyance.index[1:-1][is_spike])
+
+
+@pytest.mark.parametrize("dat_name", ["conveyance_test.dat", "EX6.DAT", "ex4.DAT"])
+@pytest.mark.parametrize("max_levels", [10, 50])
+def test_adaptive_conveyance(test_workspace: Path, dat_name: str, max_levels: int):
+    dat = DAT(test_workspace / dat_name)
+    rivers = [
+        unit
+        for unit in dat.sections.values()
+        if isinstance(unit, RIVER) and unit.subtype == "SECTION"
+    ]
+    geometries = [unit._get_conveyance_geometry() for unit in rivers]
+    curves = calculate_conveyance_curves(geometries, max_levels=max_levels)
+
+    for geometry, curve in zip(geometries, curves):
+        full = calculate_cross_section_conveyance(*geometry)
+        adaptive = calculate_cross_section_conveyance(*geometry, max_levels=max_levels)
+        pd.testing.assert_series_equal(curve, adaptive, check_exact=True)
+
+        # a subset of the same levels, without missing any spikes
+        assert len(adaptive) <= max(max_levels, 2 * len(np.unique(geometry[1])))
+        np.testing.assert_allclose(adaptive, full[adaptive.index], rtol=1e-12)
+        assert _spikes(full) <= _spikes(adaptive)
+
+
+def test_adaptive_conveyance_cache(dat: DAT):
+    CONVEYANCE_CACHE.clear()
+    full = dat.conveyance_curves(["a"])["a"]
+    adaptive = dat.conveyance_curves(["a"], max_levels=10)["a"]
+    assert CONVEYANCE_CACHE.stats.misses == 2
+    assert len(adaptive) < len(full)
+    pd.testing.assert_series_equal(dat.conveyance_curves(["a"], max_levels=10)["a"], adaptive)
+    assert CONVEYANCE_CACHE.stats.hits == 1
@@ -2,9 +2,17 @@ import logging
 from pathlib import Path
 from unittest.mock import patch
 
+import numpy as np
+import pandas as pd
 import pytest
 
 from floodmodeller_api import DAT
+from floodmodeller_api.diff import (
+    DigestUnavailableError,
+    check_digest_equal,
+    check_item_with_dataframe_equal,
+    content_digest,
+)
 from floodmodeller_api.units import (
     JUNCTION,
     LATERAL,
@@ -262,7 +270,7 @@ def test_diff(test_workspace, caplog):
         dat_ex4.diff(dat_ex4_changed)
 
     assert caplog.text == (
-        "INFO     root:_base.py:141 Files not equivalent, 12 difference(s) found:\n"
+        "INFO     root:_base.py:208 Files not equivalent, 12 difference(s) found:\n"
         "  DAT->structures->MILLAu->RNWEIR..MILLAu->upstream_crest_height:  1.07 != 1.37\n"
         "  DAT->structures->MILLBu->RNWEIR..MILLBu->upstream_crest_height:  0.43 != 0.73\n"
         "  DAT->structures->ROAD1->RNWEIR..ROAD1->upstream_crest_height:  2.02 != 2.32\n"
@@ -278,6 +286,21 @@ def test_diff(test_workspace, caplog):
     )
 
 
+def test_diff_max_report(test_workspace):
+    dat = DAT(Path(test_workspace, "EX18.DAT"))
+    dat_changed = DAT(Path(test_workspace, "EX18.DAT"))
+    dat_changed.sections["S3"].data["Y"] += 1
+
+    differences = dat._get_diff(dat_changed, max_report=1)[1]
+    assert differences[0][0] == "DAT->sections->S3->RIVER.SECTION.S3->_data"
+    lines = differences[0][1].splitlines()
+    assert len(lines) == 3
+    assert lines[2].endswith("more cell(s) not equal")
+
+    unit_differences = dat.sections["S3"]._get_diff(dat_changed.sections["S3"], max_report=1)[1]
+    assert unit_differences[0][1] == differences[0][1]
+
+
 def test_diff_active_data(test_workspace):
     dat = DAT(Path(test_workspace, "ex4.DAT"))
     dat_copy = DAT(Path(test_workspace, "ex4.DAT"))
@@ -290,6 +313,116 @@ def test_diff_active_data(test_workspace):
     assert dat == dat_copy
 
 
+@pytest.mark.parametrize("dat_path", parameterise_glob("*.dat"), ids=id_from_path)
+def test_equality_matches_diff(dat_path):
+    """DAT: Check the quick digest comparison agrees with the full diff"""
+    if dat_path.name.startswith("duplicate_unit_test"):
+        pytest.skip("Skipping as invalid DAT (duplicate units)")
+
+    dat = DAT(dat_path)
+    dat_copy = DAT(dat_path)
+    assert check_digest_equal(dat, dat_copy) is True
+    assert dat._get_diff(dat_copy)[0]
+
+    for unit in dat_copy._all_units:
+        for key, value in vars(unit).items():
+            if isinstance(value, float):
+                setattr(unit, key, value + 1)
+                assert check_digest_equal(dat, dat_copy) is False
+                assert not dat._get_diff(dat_copy)[0]
+                setattr(unit, key, value)
+                break
+
+
+def test_equality_after_inplace_change(dat_ex3):
+    """DAT: Check changes made in place to a unit's data are picked up by =="""
+    dat_copy = DAT(dat_ex3._filepath)
+    section = dat_copy.sections["20"]
+    section.data.loc[section.data.index[0], "Y"] += 0.5
+    assert dat_ex3 != dat_copy
+    assert dat_ex3.sections["20"] != section
+
+    section.data.loc[section.data.index[0], "Y"] -= 0.5
+    assert dat_ex3 == dat_copy
+
+
+def test_structural_diff(test_workspace):
+    dat_ex4 = DAT(Path(test_workspace, "ex4.DAT"))
+    dat_ex4_changed = DAT(Path(test_workspace, "ex4_changed.DAT"))
+
+    changes = dat_ex4.structural_diff(dat_ex4_changed)
+    assert [(delta.unit_type, delta.name) for delta in changes.modified] == [
+        ("RNWEIR", "MILLAu"),
+        ("RNWEIR", "MILLBu"),
+        ("RNWEIR", "ROAD1"),
+        ("RNWEIR", "RAILRDu"),
+        ("RNWEIR", "CSRD01u"),
+        ("RNWEIR", "FOOTa"),
+    ]
+    assert changes.modified[0].fields == {"upstream_crest_height": (1.07, 1.37)}
+    assert changes.added == changes.removed == changes.renamed == changes.moved == []
+    assert not dat_ex4.structural_diff(DAT(Path(test_workspace, "ex4.DAT"))).has_changes
+
+
+def test_structural_diff_added_removed_renamed_moved(dat_ex3):
+    dat_copy = DAT(dat_ex3._filepath)
+    removed = dat_copy.sections["20"]
+    dat_copy.remove_unit(removed)
+    moved = dat_copy.sections["60"]
+    dat_copy.remove_unit(moved)
+    dat_copy.insert_unit(moved, add_at=-1)
+    dat_copy.insert_unit(RIVER(name="new_sec"), add_at=0)
+    dat_copy.sections["40"].name = "renamed"
+
+    changes = dat_ex3.structural_diff(dat_copy)
+    assert [unit.name for unit in changes.added] == ["new_sec"]
+    assert changes.removed == [dat_ex3.sections["20"]]
+    assert [(old.name, new.name) for old, new in changes.renamed] == [("40", "renamed")]
+    assert changes.moved == [moved]
+    assert changes.modified == []
+    assert str(changes).splitlines() == [
+        "(1 added, 1 removed, 1 renamed, 1 moved, 0 modified)",
+        "  Added: RIVER 'new_sec'",
+        "  Removed: RIVER '20'",
+        "  Renamed: RIVER '40' -> 'renamed'",
+        "  Moved: RIVER '60'",
+    ]
+
+
+def test_content_digest():
+    assert content_digest({"a": 1, "b": [2.0, "x"]}) == content_digest({"b": [2, "x"], "a": 1.0})
+    assert content_digest([2, "x"]) != content_digest((2, "x"))
+    assert not check_item_with_dataframe_equal([2, "x"], (2, "x"), "", [])[0]
+    assert content_digest(-0.0) == content_digest(0)
+    assert content_digest(1) != content_digest("1")
+    assert content_digest(pd.DataFrame()) == content_digest(pd.DataFrame(columns=["X", "Y"]))
+    assert content_digest(pd.Series([1.0, np.nan])) == content_digest(pd.Series([1.0, None]))
+    assert content_digest(pd.Series([1.0, 2.0])) != content_digest(pd.Series([1, 2]))
+    object_index = pd.Series([1.0, 2.0], index=pd.Index([0, 1], dtype=object))
+    assert content_digest(object_index) == content_digest(pd.Series([1.0, 2.0]))
+    with pytest.raises(DigestUnavailableError):
+        content_digest(float("nan"))
+    assert check_digest_equal(float("nan"), float("nan")) is None
+
+
+def test_cached_unit_digest_follows_changes(dat_fp):
+    """The cached digest of a unit is updated when the unit is changed, by assignment or in place"""
+    dat_a = DAT(dat_fp)
+    dat_b = DAT(dat_fp)
+    name, section_a = next(iter(dat_a.sections.items()))
+    section_b = dat_b.sections[name]
+    assert section_a == section_b
+
+    section_b.dist_to_next += 1
+    assert section_a != section_b
+    section_b.dist_to_next -= 1
+    assert section_a == section_b
+
+    section_b.data.loc[0, "X"] += 1
+    assert section_a != section_b
+    assert not section_a._get_diff(section_b)[0]
+
+
 @pytest.fixture()
 def expected_edges() -> list[tuple[str, str]]:
     return [
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from floodmodeller_api import diff
+from floodmodeller_api.diff import check_item_with_dataframe_equal
+
+
+@pytest.fixture()
+def section_data():
+    return pd.DataFrame(
+        {
+            "X": np.arange(1000.0),
+            "Y": np.arange(1000.0) * 2,
+            "Marker": [""] * 1000,
+        },
+    )
+
+
+def test_changed_cells_reported(section_data):
+    changed = section_data.copy()
+    changed.loc[10, "Y"] = 99.0
+    changed.loc[500, "Marker"] = "LEFT"
+    changed.loc[20, "X"] = np.nan
+    section_data.loc[30, "X"] = np.nan
+    changed.loc[30, "X"] = np.nan
+
+    result, differences = check_item_with_dataframe_equal(section_data, changed, "data", [])
+    assert not result
+    assert differences == [
+        (
+            "data",
+            "3 row(s) not equal:\n"
+            "    Row: 10, Col: 'Y' - left: 20.0, right: 99.0\n"
+            "    Row: 20, Col: 'X' - left: 20.0, right: nan\n"
+            "    Row: 500, Col: 'Marker' - left: , right: LEFT",
+        ),
+    ]
+
+
+def test_rows_aligned_by_label(section_data):
+    removed = section_data.drop(index=[100, 200])
+    removed["Extra"] = 1.0
+
+    result, differences = check_item_with_dataframe_equal(section_data, removed, "data", [])
+    assert not result
+    assert differences == [
+        (
+            "data",
+            "2 row(s) not equal:\n"
+            "    Row(s) only in left: [100, 200]\n"
+            "    Col(s) only in right: ['Extra']",
+        ),
+    ]
+
+
+def test_max_report(section_data):
+    changed = section_data.copy()
+    changed["Y"] += 1
+
+    _, differences = check_item_with_dataframe_equal(
+        section_data,
+        changed,
+        "data",
+        [],
+        max_report=2,
+    )
+    assert differences[0][1].splitlines() == [
+        "1000 row(s) not equal:",
+        "    Row: 0, Col: 'Y' - left: 0.0, right: 1.0",
+        "    Row: 1, Col: 'Y' - left: 2.0, right: 3.0",
+        "    ...and 998 more cell(s) not equal",
+    ]
+
+
+def test_float_tolerance(section_data, monkeypatch):
+    changed = section_data.copy()
+    changed["Y"] += 1e-9
+    assert not check_item_with_dataframe_equal(section_data, changed, "data", [])[0]
+
+    monkeypatch.setattr(diff, "FLOAT_TOLERANCE", 1e-6)
+    assert check_item_with_dataframe_equal(section_data, changed, "data", []) == (True, [])
+    assert diff.check_digest_equal(section_data, changed) is None
+
+
+def test_dtype_mismatch():
+    result, differences = check_item_with_dataframe_equal(
+        pd.Series([1, 2], name="a"),
+        pd.Series([1.0, 2.0], name="b"),
+        "series",
+        [],
+    )
+    assert not result
+    assert differences == [
+        ("series", "0 row(s) not equal:\n    Col: 'a' - dtype left: int64, right: float64"),
+    ]
+
+
+def test_reordered_rows(section_data):
+    reordered = section_data.iloc[[1, 0, *range(2, 1000)]]
+
+    result, differences = check_item_with_dataframe_equal(section_data, reordered, "data", [])
+    assert not result
+    assert differences == [
+        ("data", "2 row(s) not equal:\n    Row(s) in a different order: [0, 1]"),
+    ]
+
+    reordered = section_data[["Y", "X", "Marker"]]
+    result, differences = check_item_with_dataframe_equal(section_data, reordered, "data", [])
+    message = "0 row(s) not equal:\n    Col(s) in a different order: ['X', 'Y']"
+    assert not result
+    assert differences == [("data", message)]
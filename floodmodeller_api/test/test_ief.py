@@ -5,6 +5,7 @@ import pytest
 
 from floodmodeller_api import IEF
 from floodmodeller_api.ief import FlowTimeProfile
+from floodmodeller_api.logs import summarise_exy
 from floodmodeller_api.test.util import id_from_path, parameterise_glob
 from floodmodeller_api.util import FloodModellerAPIError
 
@@ -250,3 +251,33 @@ def test_renaming_eventdata(multievent_ief, tmpdir):
         "New Title": "..\\ied_02.IED",
         "<1>": "..\\ied_03.IED",
     }
+
+
+def test_exy_summary(ief: IEF):
+    """Check the exy summary counts messages by code range"""
+    summary = ief.get_exy_summary(max_messages_per_code=1)
+    assert (summary.errors, summary.warnings, summary.notes) == (0, 1, 0)
+    assert summary.code_counts == {2019: 1}
+    assert summary.messages[2019][0].summary == (
+        "Water level rose beyond the max level of section data."
+    )
+    assert not summary.failed
+    assert ief._summarise_exy() == (
+        0,
+        "Simulation Completed! - (0 Error(s), 1 Warning(s), 0 Note(s) ) - Check ZZD for more details.",
+    )
+
+
+def test_exy_summary_keeps_first_messages(tmp_path: Path):
+    exy_path = tmp_path / "test.exy"
+    lines = [f'"NODE{i}",  {i}.0000, 1, 1001,"Error, with comma {i}"' for i in range(5)]
+    lines += [f'" ",  {i}.0000, 2, 3005,"Note {i}"' for i in range(3)]
+    exy_path.write_text("\n".join(lines) + "\n")
+
+    summary = summarise_exy(exy_path, max_messages_per_code=2)
+    assert (summary.errors, summary.warnings, summary.notes) == (5, 0, 3)
+    assert summary.failed
+    assert len(summary.messages[1001]) == 2
+    assert len(summary.messages[3005]) == 2
+    assert summary.messages[1001][1].node == "NODE1"
+    assert summary.messages[1001][1].summary == "Error, with comma 1"
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import io
 import json
+from functools import singledispatch
 from itertools import chain
 from pathlib import Path
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
+import pandas as pd
 import pytest
 
-from floodmodeller_api import DAT, IED, IEF, INP, XML2D
+from floodmodeller_api import DAT, IED, IEF, INP, XML2D, xml2d_schema
 from floodmodeller_api.test.util import id_from_path, parameterise_glob
-from floodmodeller_api.to_from_json import is_jsonable
+from floodmodeller_api.to_from_json import (
+    is_jsonable,
+    recursive_from_json,
+    recursive_to_json,
+    to_json,
+    write_json,
+)
 from floodmodeller_api.units import (
     FLOODPLAIN,
     INTERPOLATE,
@@ -23,9 +33,20 @@ if TYPE_CHECKING:
     from floodmodeller_api._base import FMFile
 
 
+@pytest.fixture(autouse=True)
+def bundled_schema(monkeypatch, tmp_path: Path):
+    """Uses the schema bundled with the API, so that the expected JSON doesn't depend on network
+    access or previously downloaded schemas"""
+    monkeypatch.setattr(xml2d_schema, "ALLOW_SCHEMA_DOWNLOAD", False)
+    monkeypatch.setattr(xml2d_schema, "SCHEMA_CACHE_DIR", tmp_path / "schemas")
+    xml2d_schema.clear_schema_registry()
+    yield
+    xml2d_schema.clear_schema_registry()
+
+
 def create_expected_json_files():
     """Helper function to recreate all the expected JSON files if needed at any point due to updates
-    to the to_json code"""
+    to the to_json code. XML2D files should be recreated using the bundled schema, as in the tests"""
 
     test_workspace = Path(__file__).parent / "test_data"
     for file in [
@@ -126,6 +147,45 @@ def test_obj_reproduces_from_json_for_all_test_api_files(file_path):
     assert api_class(file_path) == api_class.from_json(api_class(file_path).to_json())
 
 
+@pytest.mark.parametrize(
+    "file_path",
+    list(chain(*(parameterise_glob(ext) for ext in ["*.dat", "*.ied", "*.xml", "*.ief", "*.inp"]))),
+    ids=id_from_path,
+)
+def test_obj_reproduces_from_streamed_json(file_path):
+    """JSON:  To test that JSON written by write_json() reproduces the same object"""
+    if file_path.name.startswith("duplicate_unit_test"):
+        pytest.skip("Skipping as invalid file (duplicate units)")
+
+    api_class = {
+        ".dat": DAT,
+        ".ied": IED,
+        ".xml": XML2D,
+        ".ief": IEF,
+        ".inp": INP,
+    }[file_path.suffix.lower()]
+
+    obj = api_class(file_path)
+    stream = io.StringIO()
+    obj.write_json(stream)
+    assert json.loads(stream.getvalue())["API Class"] == json.loads(obj.to_json())["API Class"]
+    assert obj == api_class.from_json(stream.getvalue())
+
+
+def test_streamed_json_keeps_column_dtypes():
+    """JSON:  Columns of different dtypes are written by write_json() as they are by to_json()"""
+    table = pd.DataFrame({"int": [1, 2], "float": [0.5, 1.5], "str": ["a", None]})
+    stream = io.StringIO()
+    write_json(table, stream)
+    streamed = recursive_from_json(json.loads(stream.getvalue()))
+
+    pd.testing.assert_frame_equal(streamed, table)
+    pd.testing.assert_series_equal(
+        streamed.dtypes,
+        recursive_from_json(json.loads(to_json(table))).dtypes,
+    )
+
+
 @pytest.mark.parametrize(
     "unit",
     [
@@ -152,3 +212,38 @@ def test_is_jsonable_with_non_jsonable_object():
             pass
 
     assert not is_jsonable(NonJsonable())
+
+
+def test_to_json_serialises_once(test_workspace):
+    """JSON: The object tree is only serialised once, rather than trialled at every level"""
+    dat = DAT(Path(test_workspace, "EX18.DAT"))
+    with patch("floodmodeller_api.to_from_json.json.dumps", wraps=json.dumps) as dumps:
+        dat.to_json()
+    dumps.assert_called_once()
+
+
+def test_registered_json_encoder():
+    """JSON: Other types can register how they are converted to JSON"""
+
+    class Custom:
+        def __init__(self, value):
+            self.value = value
+
+    # registered on a copy of the converter, so that the registration doesn't outlive the test
+    converter = singledispatch(recursive_to_json.registry[object])
+    for cls, func in recursive_to_json.registry.items():
+        converter.register(cls, func)
+
+    @converter.register(Custom)
+    def _(obj: Custom, is_top_level: bool = True) -> dict:
+        return {"custom": converter(obj.value, is_top_level=False)}
+
+    obj = {"a": Custom((1, Path("b"))), "b": [Custom(None)]}
+    expected = {"a": {"custom": {"python_tuple": [1, "b"]}}, "b": [{"custom": None}]}
+    with patch("floodmodeller_api.to_from_json.recursive_to_json", converter):
+        assert json.loads(to_json(obj)) == expected
+        stream = io.StringIO()
+        write_json(obj, stream)
+        assert json.loads(stream.getvalue()) == expected
+
+    assert recursive_to_json.dispatch(Custom) is recursive_to_json.registry[object]
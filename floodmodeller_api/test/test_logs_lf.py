@@ -1,4 +1,6 @@
 import logging
+import os
+from contextlib import ExitStack
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -7,7 +9,8 @@ import pytest
 from freezegun import freeze_time
 
 from floodmodeller_api import IEF, LF1
-from floodmodeller_api.logs import create_lf
+from floodmodeller_api.logs import LogWatcher, create_lf, discover_lf
+from floodmodeller_api.logs.lf_helpers import Parser
 
 
 @pytest.fixture()
@@ -82,7 +85,7 @@ def test_log_file_unsupported(caplog):
     assert lf is None
     assert (
         caplog.text
-        == "WARNING  root:lf.py:332 No progress bar as log file must have suffix lf1 or lf2. Simulation will continue as usual.\n"
+        == "WARNING  root:lf.py:396 No progress bar as log file must have suffix lf1 or lf2. Simulation will continue as usual.\n"
     )
 
 
@@ -96,7 +99,7 @@ def test_log_file_timeout(caplog):
     assert lf is None
     assert (
         caplog.text
-        == "WARNING  root:lf.py:332 No progress bar as log file is expected but not detected. Simulation will continue as usual.\n"
+        == "WARNING  root:lf.py:396 No progress bar as log file is expected but not detected. Simulation will continue as usual.\n"
     )
 
 
@@ -112,7 +115,7 @@ def test_log_file_from_old_run(caplog):
     assert lf is None
     assert (
         caplog.text
-        == "WARNING  root:lf.py:332 No progress bar as log file is from previous run. Simulation will continue as usual.\n"
+        == "WARNING  root:lf.py:396 No progress bar as log file is from previous run. Simulation will continue as usual.\n"
     )
 
 
@@ -129,6 +132,26 @@ def test_log_file_found():
     lf1.assert_called_once_with(lf_filepath)
 
 
+def test_discover_lf_does_not_block(lf1_fp_simple: Path, tmp_path: Path):
+    """LF1: Check discover_lf() returns straight away and resolves once the log file is new"""
+    lf1_fp = tmp_path / "run.lf1"
+    future = discover_lf(lf1_fp, "lf1", timeout=5, poll_interval=0.01)
+    assert not future.done()
+
+    lf1_fp.write_text(lf1_fp_simple.read_text())
+    lf1 = future.result(timeout=5)
+
+    assert isinstance(lf1, LF1)
+    assert lf1.report_progress() == 100
+
+
+def test_discover_lf_cancel(tmp_path: Path):
+    """LF1: Check discover_lf() can be cancelled while waiting"""
+    future = discover_lf(tmp_path / "run.lf1", "lf1", timeout=5, poll_interval=0.01)
+    assert future.cancel()
+    assert future.cancelled()
+
+
 def test_lf1_info_dict_all_params_present(lf1_fp_complex: Path):
     """LF1: Check info dictionary contains all params required"""
     lf1 = LF1(lf1_fp_complex)
@@ -166,3 +189,117 @@ def test_lf1_info_dict_all_params_present(lf1_fp_complex: Path):
         "mass_balance_error_2",
     }
     assert expected_keys == lf1.info.keys()
+
+
+@pytest.mark.parametrize("lf1_name", ["ex3.lf1", "lf_complex_ex.lf1"])
+def test_lf1_buffered_parsers_match_line_by_line(test_workspace: Path, lf1_name: str):
+    """LF1: Check bulk conversion of buffered values matches converting each line"""
+    lf1_fp = Path(test_workspace, lf1_name)
+    lf1 = LF1(lf1_fp)
+
+    buffered_classes = [cls for cls in Parser.__subclasses__() if cls.buffered]
+    assert buffered_classes
+    with ExitStack() as stack:
+        for cls in buffered_classes:
+            stack.enter_context(patch.object(cls, "buffered", False))
+        lf1_line_by_line = LF1(lf1_fp)
+
+    assert lf1.info == lf1_line_by_line.info
+    pd.testing.assert_frame_equal(
+        lf1.to_dataframe(include_tuflow=True),
+        lf1_line_by_line.to_dataframe(include_tuflow=True),
+    )
+
+
+def test_lf1_cache(lf1_fp_simple: Path, tmp_path: Path):
+    """LF1: Check a cached log file is reused until the log file changes"""
+    lf1_fp = tmp_path / "ex3.lf1"
+    lf1_fp.write_text(lf1_fp_simple.read_text())
+    lf1 = LF1(lf1_fp, use_cache=True)
+    assert (tmp_path / "ex3.lf1.cache").is_file()
+
+    with patch.object(LF1, "_read") as read:
+        lf1_cached = LF1(lf1_fp, use_cache=True)
+    read.assert_not_called()
+    assert lf1_cached.info == lf1.info
+    assert lf1_cached.report_progress() == 100
+    pd.testing.assert_frame_equal(lf1_cached.to_dataframe(), lf1.to_dataframe())
+
+    with open(lf1_fp, "a") as lf1_file:
+        lf1_file.write("\n")
+    with patch.object(LF1, "_read", autospec=True, side_effect=LF1._read) as read:
+        LF1(lf1_fp, use_cache=True)
+    read.assert_called_once()
+
+
+def test_lf1_cache_of_growing_log(lf1_fp_simple: Path, tmp_path: Path):
+    """LF1: Check lines written to the log while it is read aren't skipped when it is reopened"""
+    lf1_fp = tmp_path / "ex3.lf1"
+    lines = lf1_fp_simple.read_text().splitlines(keepends=True)
+    lf1_fp.write_text("".join(lines[: len(lines) // 2]))
+    read = LF1._read
+
+    def read_then_grow(lf1, *args, **kwargs):
+        read(lf1, *args, **kwargs)
+        with open(lf1_fp, "a") as lf1_file:
+            lf1_file.write("".join(lines[len(lines) // 2 :]))
+
+    with patch.object(LF1, "_read", autospec=True, side_effect=read_then_grow):
+        LF1(lf1_fp, use_cache=True)
+
+    with patch.object(LF1, "_read", autospec=True, side_effect=read) as reread:
+        lf1_reopened = LF1(lf1_fp, use_cache=True)
+    reread.assert_called_once()
+    assert lf1_reopened.info == LF1(lf1_fp).info
+
+
+def test_log_watcher_matches_lf1(lf1_fp_simple: Path, lf1_fp_complex: Path):
+    """LogWatcher: Check latest values match those read by LF1"""
+    watcher = LogWatcher([lf1_fp_simple, lf1_fp_complex], fresh_only=False)
+    latest_df = watcher.refresh()
+
+    assert list(latest_df.index) == [lf1_fp_simple, lf1_fp_complex]
+    for lf1_fp in (lf1_fp_simple, lf1_fp_complex):
+        lf1 = LF1(lf1_fp)
+        row = latest_df.xs(lf1_fp)
+        assert row["status"] == "active"
+        assert row["progress"] == lf1.info["progress"]
+        for parameter in ("mass_error", "timestep", "elapsed"):
+            assert row[parameter] == getattr(lf1, parameter)[parameter].iloc[-1]
+
+
+def test_log_watcher_reads_incrementally(lf1_fp_simple: Path, tmp_path: Path):
+    """LogWatcher: Check only complete, newly written lines are read on refresh"""
+    lines = lf1_fp_simple.read_text().splitlines(keepends=True)
+    split_idx = next(idx for idx, line in enumerate(lines) if "Progress1  50%" in line)
+    lf1_fp = tmp_path / "run.lf1"
+    lf1_fp.write_text("".join(lines[: split_idx + 1]) + "!!Progress1  5")
+
+    watcher = LogWatcher([lf1_fp, tmp_path / "missing.lf1"])
+    latest_df = watcher.refresh()
+    assert latest_df.xs(lf1_fp)["progress"] == 50
+    assert latest_df.xs(tmp_path / "missing.lf1")["status"] == "waiting"
+
+    with open(lf1_fp, "a") as lf1_file:
+        lf1_file.write("1%\n")
+    assert watcher.refresh().xs(lf1_fp)["progress"] == 51
+
+    with open(lf1_fp, "a") as lf1_file:
+        lf1_file.write("".join(lines[split_idx + 1 :]))
+    assert watcher.refresh().xs(lf1_fp)["progress"] == 100
+
+
+@pytest.mark.usefixtures("log_timeout")
+def test_log_watcher_does_not_block(tmp_path: Path):
+    """LogWatcher: Check missing and old log files are reported rather than waited on"""
+    old_fp = tmp_path / "old.lf1"
+    old_fp.touch()
+    os.utime(old_fp, (0, 0))
+    watcher = LogWatcher([tmp_path / "missing.lf2", old_fp])
+    latest_df = watcher.refresh()
+    assert latest_df.xs(tmp_path / "missing.lf2")["status"] == "not found"
+    assert latest_df.xs(old_fp)["status"] == "previous run"
+    assert latest_df["progress"].isna().all()
+
+    with pytest.raises(ValueError, match="must have suffix lf1 or lf2"):
+        watcher.add(tmp_path / "log.txt")
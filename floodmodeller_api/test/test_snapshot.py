@@ -0,0 +1,66 @@
+from itertools import chain
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from floodmodeller_api import DAT, IED, IEF, INP, XML2D
+from floodmodeller_api.test.util import id_from_path, parameterise_glob
+from floodmodeller_api.version import __version__
+
+
+@pytest.mark.parametrize(
+    "file_path",
+    list(chain(*(parameterise_glob(ext) for ext in ["*.dat", "*.ied", "*.xml", "*.ief", "*.inp"]))),
+    ids=id_from_path,
+)
+def test_snapshot_reproduces_obj(file_path, tmp_path):
+    """Snapshots reproduce the same object for all test files"""
+    if file_path.name.startswith("duplicate_unit_test"):
+        pytest.skip("Skipping as invalid file (duplicate units)")
+
+    api_class = {
+        ".dat": DAT,
+        ".ied": IED,
+        ".xml": XML2D,
+        ".ief": IEF,
+        ".inp": INP,
+    }[file_path.suffix.lower()]
+
+    obj = api_class(file_path)
+    obj.to_snapshot(tmp_path / "snapshot.fms")
+    from_snapshot = api_class.from_snapshot(tmp_path / "snapshot.fms")
+
+    assert type(from_snapshot) is api_class
+    assert from_snapshot == obj
+    assert from_snapshot._write() == obj._write()
+
+
+def test_snapshot_keeps_dtypes(test_workspace, tmp_path):
+    dat = DAT(Path(test_workspace, "EX18.DAT"))
+    dat.to_snapshot(tmp_path / "snapshot.fms")
+    from_snapshot = DAT.from_snapshot(tmp_path / "snapshot.fms")
+
+    for name, unit in dat.sections.items():
+        if hasattr(unit, "data"):
+            pd.testing.assert_frame_equal(from_snapshot.sections[name].data, unit.data)
+
+    # the loaded object is independent of the snapshot and can be edited and saved
+    from_snapshot.sections["S3"].data.iloc[0, 1] += 1
+    from_snapshot.save(tmp_path / "edited.dat")
+    assert DAT(tmp_path / "edited.dat") != dat
+
+
+def test_snapshot_errors(test_workspace, tmp_path, monkeypatch):
+    dat = DAT(Path(test_workspace, "EX18.DAT"))
+    dat.to_snapshot(tmp_path / "snapshot.fms")
+
+    with pytest.raises(TypeError, match="Snapshot contains a DAT object, not IED"):
+        IED.from_snapshot(tmp_path / "snapshot.fms")
+
+    with pytest.raises(ValueError, match="not a Flood Modeller API snapshot"):
+        DAT.from_snapshot(Path(test_workspace, "EX18.DAT"))
+
+    monkeypatch.setattr("floodmodeller_api.snapshot.__version__", "0.0.0")
+    with pytest.raises(ValueError, match=f"written by version {__version__}"):
+        DAT.from_snapshot(tmp_path / "snapshot.fms")
@@ -1,10 +1,22 @@
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from floodmodeller_api import XML2D
+from floodmodeller_api import XML2D, xml2d_schema
 from floodmodeller_api.test.util import id_from_path, parameterise_glob
 from floodmodeller_api.util import FloodModellerAPIError
+from floodmodeller_api.xml2d import _restore_changed, _snapshot_data
+
+
+@pytest.fixture(autouse=True)
+def schema_download(monkeypatch, tmp_path: Path):
+    """Uses the published schemas, as some tests rely on differences between versions"""
+    monkeypatch.setattr(xml2d_schema, "ALLOW_SCHEMA_DOWNLOAD", True)
+    monkeypatch.setattr(xml2d_schema, "SCHEMA_CACHE_DIR", tmp_path / "schemas")
+    xml2d_schema.clear_schema_registry()
+    yield
+    xml2d_schema.clear_schema_registry()
 
 
 @pytest.fixture()
@@ -239,3 +251,127 @@ def test_xml2d_nested_multivalue_update_keeps_topography_2_entries_separate():
     assert updated_shape_path in updated_xml
     assert updated_xml.count(updated_raster_path) == 1
     assert updated_xml.count(updated_shape_path) == 1
+
+
+def test_xml2d_schema_shared_between_instances(xml_fp: Path):
+    x2d = XML2D(xml_fp)
+    with patch.object(xml2d_schema.etree, "XMLSchema") as xml_schema:
+        second_x2d = XML2D(xml_fp)
+    xml_schema.assert_not_called()
+    assert x2d._xsdschema is second_x2d._xsdschema
+    assert x2d._multi_value_keys is second_x2d._multi_value_keys
+
+
+def test_xml2d_schema_not_downloaded_by_default(monkeypatch, xml_fp: Path):
+    monkeypatch.setattr(xml2d_schema, "ALLOW_SCHEMA_DOWNLOAD", False)
+    with patch.object(xml2d_schema.requests, "get") as get:
+        x2d = XML2D(xml_fp)
+    get.assert_not_called()
+    assert x2d._xsd is xml2d_schema.get_schema("7.3").xsd
+    assert xml2d_schema.get_schema("7.3").source == "bundled"
+
+
+def test_xml2d_schema_loaded_from_disk_cache(monkeypatch, xml_fp: Path):
+    monkeypatch.setattr(xml2d_schema, "ALLOW_SCHEMA_DOWNLOAD", False)
+    xml2d_schema.SCHEMA_CACHE_DIR.mkdir()
+    cached_xsd = xml2d_schema.SCHEMA_CACHE_DIR / "2d_7.3.xsd"
+    cached_xsd.write_bytes(xml2d_schema.BUNDLED_SCHEMA_PATH.read_bytes())
+
+    XML2D(xml_fp)
+    assert xml2d_schema.get_schema("7.3").source == "cache"
+
+
+def test_xml2d_schema_element_order_matches_xsd_search():
+    schema = xml2d_schema.get_schema("7.3")
+    w3 = xml2d_schema.W3_SCHEMA
+    names = {elem.attrib["name"] for elem in schema.xsd.iter(f"{w3}*") if "name" in elem.attrib}
+
+    for name in names:
+        schema_elem = schema.xsd.find(f".//{w3}*[@name='{name}']")
+        if "type" in schema_elem.attrib:
+            schema_elem = schema.xsd.find(f".//{w3}*[@name='{schema_elem.attrib['type']}']")
+        else:
+            schema_elem = schema_elem.find(f"{w3}complexType")
+        seq = None if schema_elem is None else schema_elem.find(f"{w3}sequence")
+
+        if seq is None:
+            assert name not in schema.element_order
+        else:
+            expected = {sub_element.attrib["name"]: idx for idx, sub_element in enumerate(seq)}
+            assert schema.element_order[name] == expected
+
+
+def test_xml2d_write_only_walks_changed_data(xml_fp: Path, data_before):
+    x2d = XML2D(xml_fp)
+    with patch.object(
+        XML2D,
+        "_recursive_update_xml",
+        autospec=True,
+        side_effect=XML2D._recursive_update_xml,
+    ) as update_xml:
+        assert x2d._write() == data_before
+        update_xml.assert_not_called()
+
+        domain = next(iter(x2d.domains))
+        x2d.domains[domain]["run_data"]["scheme"] = "TVD"
+        assert "TVD" in x2d._write()
+        # root, domain and run_data only
+        assert update_xml.call_count == 3
+
+    assert x2d._raw_snapshot == _snapshot_data(x2d._data)
+
+
+def test_xml2d_read_keeps_compact_raw_data(xml_fp: Path):
+    """XML2D: Check only digests of the data as read are held, and the data is only read back
+    from the tree where it changes"""
+    x2d = XML2D(xml_fp)
+    assert all(isinstance(digest, bytes) for digest in x2d._raw_snapshot.values())
+
+    x2d._update_dict()
+    domain = next(iter(x2d.domains))
+    orig_scheme = x2d.domains[domain]["run_data"]["scheme"]
+    x2d.domains[domain]["run_data"]["scheme"] = "TVD"
+    _, _, tree_data = XML2D._iterparse(xml_fp)
+    raw_data = _restore_changed(
+        x2d._data,
+        _snapshot_data(x2d._data),
+        x2d._raw_snapshot,
+        tree_data,
+    )
+
+    assert raw_data["domain"][0]["run_data"]["scheme"] == orig_scheme
+    assert raw_data["domain"] is tree_data["domain"]
+    assert raw_data["logfile"] is x2d._data["logfile"]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_xml2d_generate_variants(xml_fp: Path, tmp_path: Path, workers: int):
+    template = XML2D(xml_fp)
+    domain = next(iter(template.domains))
+    schemes = ["TVD", "ADI", "FAST", "FAST Dynamic"]
+    overrides = [
+        {"domains": {domain: {"run_data": {"scheme": scheme}}}, "logfile": f"{scheme}.log"}
+        for scheme in schemes
+    ]
+
+    variant_fps = template.generate_variants(overrides, tmp_path / "variants", workers=workers)
+
+    assert [fp.name for fp in variant_fps] == [f"Domain1_Q_{idx}.xml" for idx in range(4)]
+    for variant_fp, scheme in zip(variant_fps, schemes):
+        expected = XML2D(xml_fp)
+        expected.domains[domain]["run_data"]["scheme"] = scheme
+        expected.logfile = f"{scheme}.log"
+        assert XML2D(variant_fp)._write() == expected._write()
+
+    # template is unchanged
+    assert template == XML2D(xml_fp)
+
+
+def test_xml2d_generate_variants_named(xml_fp: Path, tmp_path: Path):
+    template = XML2D(xml_fp)
+    variant_fps = template.generate_variants({"short": {"name": "Short run"}}, tmp_path)
+    assert variant_fps == [tmp_path / "short.xml"]
+    assert XML2D(variant_fps[0]).name == "Short run"
+
+    with pytest.raises(FloodModellerAPIError, match="Unable to override 'domain'"):
+        template.generate_variants([{"domain": {}}], tmp_path)
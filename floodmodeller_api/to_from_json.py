@@ -17,14 +17,22 @@ address: Jacobs UK Limited, Flood Modeller, Cottons Centre, Cottons Lane, London
 from __future__ import annotations
 
 import json
-from pathlib import Path
-from typing import Any
+from functools import singledispatch
+from pathlib import Path, PurePath
+from typing import TYPE_CHECKING, Any
 
+import numpy as np
 import pandas as pd
 from pandas import Index
 
 from .version import __version__
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterator
+    from typing import TextIO
+
+_encoder = json.JSONEncoder(separators=(",", ":"))
+
 
 def to_json(obj: Any) -> str:
     """
@@ -39,6 +47,123 @@ def to_json(obj: Any) -> str:
     return json.dumps(recursive_to_json(obj), indent=2)
 
 
+def write_json(obj: Any, fp: TextIO) -> None:
+    """
+    Function to write any flood modeller object as JSON straight to a file object, without first
+    building the whole nested dictionary in memory. The output is compact, and DataFrames and Series
+    are written in their 'split' orientation. It can be read in the same way as ``to_json`` output.
+
+    Args:
+        obj (object):  Any flood modeller object (dat, ied, ief, cross sections...)
+        fp (TextIO): A text file object to write to.
+    """
+    for chunk in _iter_json(obj, is_top_level=True):
+        fp.write(chunk)
+
+
+def _iter_json(obj: Any, is_top_level: bool = False) -> Iterator[str]:
+    """Yields the JSON for an object in pieces, converting it in the same way as
+    ``recursive_to_json``. Containers and API classes are written item by item, and all other
+    types are converted whole by the function registered for them"""
+    convert = recursive_to_json.dispatch(type(obj))
+    if convert in _streamed:
+        yield from _streamed[convert](obj)
+    elif convert is recursive_to_json.registry[object] and _is_api_class(obj):
+        yield '{"API Class":' + _encoder.encode(str(obj.__class__)[8:-2])
+        if is_top_level:
+            yield ',"API Version":' + _encoder.encode(__version__)
+        yield ',"Object Attributes":'
+        yield from _iter_json_dict(obj.__dict__)
+        yield "}"
+    else:
+        yield _encoder.encode(convert(obj, is_top_level=is_top_level))
+
+
+def _iter_json_list(items) -> Iterator[str]:
+    yield "["
+    for idx, item in enumerate(items):
+        if idx:
+            yield ","
+        yield from _iter_json(item)
+    yield "]"
+
+
+def _iter_json_tuple(obj: tuple) -> Iterator[str]:
+    yield '{"python_tuple":'
+    yield from _iter_json_list(obj)
+    yield "}"
+
+
+def _iter_json_set(obj: set) -> Iterator[str]:
+    yield '{"python_set":'
+    yield from _iter_json_list(sorted(obj))
+    yield "}"
+
+
+def _iter_json_dict(obj: dict) -> Iterator[str]:
+    yield "{"
+    for idx, (key, value) in enumerate(obj.items()):
+        # keys are converted to strings in the same way as json.dumps
+        json_key = key if isinstance(key, str) else json.dumps(key)
+        yield ("," if idx else "") + _encoder.encode(json_key) + ":"
+        yield from _iter_json(value)
+    yield "}"
+
+
+def _iter_pandas_json(obj: pd.DataFrame | pd.Series) -> Iterator[str]:
+    if isinstance(obj, pd.DataFrame):
+        columns = obj.columns
+        # multi-level column labels are written as the string of each tuple
+        labels = (
+            pd.Index(map(str, columns.values)) if isinstance(columns, pd.MultiIndex) else columns
+        )
+        header: dict[str, Hashable] = {"class": "pandas.DataFrame", "orient": "split"}
+        # converted to objects, so each value keeps the type of its own column rather than all
+        # being cast to a common type
+        split = {"index": obj.index, "columns": labels, "data": obj.to_numpy(dtype=object)}
+    else:
+        header = {
+            "class": "pandas.Series",
+            "orient": "split",
+            "variable_name": obj.name,
+            "index_name": obj.index.name,
+        }
+        split = {"index": obj.index, "data": obj.to_numpy()}
+
+    yield _encoder.encode(header)[:-1] + ',"object":{'
+    for idx, (key, values) in enumerate(split.items()):
+        yield ("," if idx else "") + _encoder.encode(key) + ":"
+        yield _encoder.encode(_to_json_values(values))
+    yield "}}"
+
+
+def _to_json_values(values) -> list:
+    # tolist() converts numpy scalars to their python equivalents, except in object arrays
+    values = values.tolist()
+    if values and isinstance(values[0], list):
+        return [[_to_json_value(value) for value in row] for row in values]
+    return [_to_json_value(value) for value in values]
+
+
+def _to_json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+def _is_api_class(obj: Any) -> bool:
+    from ._base import FMFile
+    from .backup import File
+    from .ief import FlowTimeProfile
+    from .units import IIC
+    from .units._base import Unit
+    from .urban1d._base import UrbanSubsection, UrbanUnit
+
+    return isinstance(obj, (FMFile, Unit, IIC, File, UrbanSubsection, UrbanUnit, FlowTimeProfile))
+
+
 def is_jsonable(obj: Any) -> bool:
     try:
         json.dumps(obj)
@@ -64,10 +189,18 @@ def pandas_to_json(obj: pd.DataFrame | pd.Series) -> dict:
     }
 
 
-def recursive_to_json(obj: Any, is_top_level: bool = True) -> Any:  # noqa: PLR0911
+@singledispatch
+def recursive_to_json(obj: Any, is_top_level: bool = True) -> Any:
     """
     Function to undertake a recursion through the different elements of the python object
 
+    The conversion is chosen by the type of the object, so other types can be supported by
+    registering a function which returns their JSON serializable form, e.g.
+
+    >>> @recursive_to_json.register
+    ... def _(obj: MyUnit, is_top_level: bool = True) -> dict:
+    ...     return {"my_unit": recursive_to_json(obj.data, is_top_level=False)}
+
     Args:
         Obj (object):  Any flood modeller object (dat, ied, ief, cross sections...)
 
@@ -75,46 +208,8 @@ def recursive_to_json(obj: Any, is_top_level: bool = True) -> Any:  # noqa: PLR0
         if the object is serializable, it creates the object to go to the function to_json and to create the JSON file,
         otherwise, it will move back through this function recursively until the object is finally serializable.
     """
-    from ._base import FMFile
-    from .backup import File
-    from .ief import FlowTimeProfile
-    from .units import IIC
-    from .units._base import Unit
-    from .urban1d._base import UrbanSubsection, UrbanUnit
-
-    if isinstance(obj, tuple):
-        return {
-            "python_tuple": [recursive_to_json(item, is_top_level=False) for item in obj],
-        }
-
-    if is_jsonable(obj):
-        return obj
-
-    if isinstance(obj, (pd.DataFrame, pd.Series)):
-        return pandas_to_json(obj)
-
-    # To convert WindowsPath, no serializable, objects to string, serializable.
-    if isinstance(obj, Path):
-        return str(obj)
-
-    if isinstance(obj, set):
-        # create list and append
-        return {"python_set": [recursive_to_json(item, is_top_level=False) for item in sorted(obj)]}
-
-    # Case list or dict of non-jsonable stuff
-    if isinstance(obj, list):
-        # create list and append
-        return [recursive_to_json(item, is_top_level=False) for item in obj]
-
-    # Dictionary to the all the serializable objects
-    if isinstance(obj, dict):
-        return {key: recursive_to_json(value, is_top_level=False) for key, value in obj.items()}
-
     # Either a type of FM API Class
-    if isinstance(
-        obj,
-        (FMFile, Unit, IIC, File, UrbanSubsection, UrbanUnit, FlowTimeProfile),
-    ):
+    if _is_api_class(obj):
         # Information from the flood modeller object will be included in the JSON output
         # slicing undertaken to remove quotation marks
         return_dict: dict[str, Any] = {"API Class": str(obj.__class__)[8:-2]}
@@ -130,6 +225,61 @@ def recursive_to_json(obj: Any, is_top_level: bool = True) -> Any:  # noqa: PLR0
     return None
 
 
+@recursive_to_json.register(str)
+@recursive_to_json.register(int)
+@recursive_to_json.register(float)
+@recursive_to_json.register(type(None))
+def _(obj: Any, is_top_level: bool = True) -> Any:
+    return obj
+
+
+@recursive_to_json.register
+def _(obj: np.generic, is_top_level: bool = True) -> Any:
+    return obj.item()
+
+
+@recursive_to_json.register
+def _(obj: tuple, is_top_level: bool = True) -> dict:
+    return {"python_tuple": [recursive_to_json(item, is_top_level=False) for item in obj]}
+
+
+@recursive_to_json.register
+def _(obj: list, is_top_level: bool = True) -> list:
+    return [recursive_to_json(item, is_top_level=False) for item in obj]
+
+
+@recursive_to_json.register
+def _(obj: dict, is_top_level: bool = True) -> dict:
+    return {key: recursive_to_json(value, is_top_level=False) for key, value in obj.items()}
+
+
+@recursive_to_json.register
+def _(obj: set, is_top_level: bool = True) -> dict:
+    return {"python_set": [recursive_to_json(item, is_top_level=False) for item in sorted(obj)]}
+
+
+@recursive_to_json.register
+def _(obj: PurePath, is_top_level: bool = True) -> str:
+    # To convert WindowsPath, no serializable, objects to string, serializable.
+    return str(obj)
+
+
+@recursive_to_json.register(pd.DataFrame)
+@recursive_to_json.register(pd.Series)
+def _(obj: pd.DataFrame | pd.Series, is_top_level: bool = True) -> dict:
+    return pandas_to_json(obj)
+
+
+# containers which write_json writes item by item, keyed by their conversion in recursive_to_json
+_streamed: dict[Callable, Callable[[Any], Iterator[str]]] = {
+    recursive_to_json.registry[list]: _iter_json_list,
+    recursive_to_json.registry[tuple]: _iter_json_tuple,
+    recursive_to_json.registry[set]: _iter_json_set,
+    recursive_to_json.registry[dict]: _iter_json_dict,
+    recursive_to_json.registry[pd.DataFrame]: _iter_pandas_json,
+}
+
+
 def from_json(obj: str | dict) -> dict:
     """
     Function to convert a JSON string back into Python objects
@@ -149,7 +299,7 @@ def from_json(obj: str | dict) -> dict:
     return recursive_from_json(obj_dict)
 
 
-def recursive_from_json(obj: dict | Any) -> Any:  # noqa: C901
+def recursive_from_json(obj: dict | Any) -> Any:  # noqa: C901, PLR0911
     """
     Function to undertake a recursion through the different elements of the JSON object
 
@@ -166,6 +316,9 @@ def recursive_from_json(obj: dict | Any) -> Any:  # noqa: C901
 
         return api_class_mapping[class_type].from_json(obj)
 
+    if obj.get("orient") == "split":
+        return pandas_from_split_json(obj)
+
     if "class" in obj and obj["class"] == "pandas.DataFrame":
         reconstructed_df = pd.DataFrame.from_dict(obj["object"])
         reconstructed_df.index = convert_dataframe_index(reconstructed_df.index)
@@ -205,6 +358,19 @@ def recursive_from_json(obj: dict | Any) -> Any:  # noqa: C901
     return obj
 
 
+def pandas_from_split_json(obj: dict) -> pd.DataFrame | pd.Series:
+    """Reconstructs a DataFrame or Series written by ``write_json``"""
+    split = obj["object"]
+    if obj["class"] == "pandas.DataFrame":
+        return pd.DataFrame(split["data"], index=split["index"], columns=split["columns"])
+
+    return pd.Series(
+        split["data"],
+        index=pd.Index(split["index"], name=obj["index_name"]),
+        name=obj["variable_name"],
+    )
+
+
 def convert_dataframe_index(index: Index) -> Index:
     try:
         return index.astype("int")
@@ -230,6 +396,19 @@ class Jsonable:
         """
         return to_json(self)
 
+    def write_json(self, fp: str | Path | TextIO) -> None:
+        """Writes the object instance as JSON straight to a file, which is much faster and uses less
+        memory than ``to_json()`` for large models. The JSON can be read using ``from_json()``.
+
+        Args:
+            fp (str | Path | TextIO): Filepath or text file object to write to.
+        """
+        if isinstance(fp, (str, Path)):
+            with open(fp, "w", encoding="utf-8") as json_file:
+                write_json(self, json_file)
+        else:
+            write_json(self, fp)
+
     @classmethod
     def from_json(cls, json_string: str):
         """Creates an object instance from a JSON string.
@@ -27,7 +27,7 @@ from typing import Any
 
 import pandas as pd
 
-from ..diff import check_item_with_dataframe_equal
+from ..diff import check_digest_equal, check_item_with_dataframe_equal, forget_digest
 from ..to_from_json import Jsonable
 from ._helpers import join_10_char, join_n_char_ljust, split_10_char, to_float, to_str
 
@@ -37,6 +37,7 @@ class Unit(Jsonable):
     _subtype: str | None = None
     _name: str | None = None
     _location: tuple[float, float] | None = None
+    _digest_cached = True  # see diff.fixed_digest
 
     def __init__(self, unit_block=None, n=12, from_json: bool = False, **kwargs):
         if from_json:
@@ -155,20 +156,38 @@ class Unit(Jsonable):
     def _write(self):
         raise NotImplementedError
 
-    def _diff(self, other):
-        diff = self._get_diff(other)
+    def _diff(self, other, max_report=None):
+        diff = self._get_diff(other, max_report=max_report)
         if diff[0]:
             logging.info("No difference, units are equivalent")
         else:
             logging.info("\n".join([f"{name}:  {reason}" for name, reason in diff[1]]))
 
-    def _get_diff(self, other):
-        return self.__eq__(other, return_diff=True)  # pylint: disable=unnecessary-dunder-call
+    def _get_diff(self, other, max_report=None):
+        return self.__eq__(  # pylint: disable=unnecessary-dunder-call
+            other,
+            return_diff=True,
+            max_report=max_report,
+        )
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        forget_digest(self)
+        super().__setattr__(name, value)
 
-    def __eq__(self, other, return_diff=False):
+    def _get_digest_state(self) -> dict:
+        # Reset data attributes before digesting, for units which have them
+        getattr(self, "data", None)
+        return self.__dict__
+
+    def __eq__(self, other, return_diff=False, max_report=None):
         if not isinstance(other, Unit):
             return NotImplemented if not return_diff else (False, ["Type mismatch"])
 
+        if not return_diff:
+            result = check_digest_equal(self, other)
+            if result is not None:
+                return result
+
         result = True
         diff = []
         # Reset data attributes before checking equivalent
@@ -180,6 +199,7 @@ class Unit(Jsonable):
             other.__dict__,
             name=f"{self._unit}.{self._subtype or ''}.{self._name}",
             diff=diff,
+            max_report=max_report,
         )
         return (result, diff) if return_diff else result
 
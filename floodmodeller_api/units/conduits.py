@@ -14,7 +14,10 @@ If you have any query about this program or this License, please contact us at s
 address: Jacobs UK Limited, Flood Modeller, Cottons Centre, Cottons Lane, London, SE1 2QG, United Kingdom.
 """
 
+from __future__ import annotations
+
 import logging
+from typing import TYPE_CHECKING
 
 import pandas as pd
 
@@ -30,6 +33,19 @@ from ._helpers import (
     to_int,
     to_str,
 )
+from .conveyance import (
+    calculate_cross_section_conveyance_cached,
+    circular_conduit_geometry,
+    colebrook_white_to_mannings,
+    rectangular_conduit_geometry,
+    symmetric_conduit_geometry,
+)
+
+if TYPE_CHECKING:
+    from .conveyance import SectionGeometry
+
+# conduit subtypes which conveyance can be calculated for
+CONVEYANCE_SUBTYPES = ("SECTION", "RECTANGULAR", "CIRCULAR")
 
 
 class CONDUIT(Unit):
@@ -265,6 +281,63 @@ class CONDUIT(Unit):
             )
             self._raw_block = c_block
 
+    @property
+    def conveyance(self) -> pd.Series:
+        """Calculate and return the conveyance curve of the conduit, from its invert to its
+        soffit. Only 'SECTION', 'RECTANGULAR' and 'CIRCULAR' conduits are supported.
+
+        Note:
+            Slots are ignored, and circular conduits are approximated by straight segments.
+            Colebrook-White friction values are converted to an approximately equivalent
+            Manning's n, so the curve is a guide to the shape of the conveyance rather than an
+            exact match for Flood Modeller.
+
+        Raises:
+            ValueError: Raised if conveyance is not supported for the conduit subtype.
+
+        Returns:
+            pd.Series: A pandas Series containing the conveyance values indexed by water levels.
+        """
+        return calculate_cross_section_conveyance_cached(
+            *self._get_conveyance_geometry(),
+            closed=True,
+        )
+
+    def _get_conveyance_geometry(self) -> SectionGeometry:
+        """Returns the closed geometry of the conduit, with the Manning's n of each segment"""
+        if self._subtype == "SECTION":
+            return symmetric_conduit_geometry(
+                self.coords.x.to_numpy(),
+                self.coords.y.to_numpy(),
+                colebrook_white_to_mannings(self.coords.cw_friction.to_numpy()),
+            )
+
+        if self._subtype not in CONVEYANCE_SUBTYPES:
+            msg = f"Conveyance is not supported for '{self._subtype}' conduits."
+            raise ValueError(msg)
+
+        def mannings(friction: float) -> float:
+            if self.friction_eq.upper() == "MANNING":
+                return friction
+            return colebrook_white_to_mannings(friction)
+
+        if self._subtype == "RECTANGULAR":
+            return rectangular_conduit_geometry(
+                self.invert,
+                self.width,
+                self.height,
+                mannings(self.friction_on_invert),
+                mannings(self.friction_on_walls),
+                mannings(self.friction_on_soffit),
+            )
+
+        return circular_conduit_geometry(
+            self.invert,
+            self.diameter,
+            mannings(self.friction_below_axis),
+            mannings(self.friction_above_axis),
+        )
+
     def _write(self):
         """Function to write a valid CONDUIT block"""
         _validate_unit(self)  # Function to check the params are valid for CONDUIT unit
@@ -1,23 +1,63 @@
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import TYPE_CHECKING
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, overload
 
 import numpy as np
 import pandas as pd
 
+from ..version import __version__
+
 if TYPE_CHECKING:
-    from numpy.typing import NDArray
+    from collections.abc import Callable, Sequence
 
-MINIMUM_PERIMETER_THRESHOLD = 1e-8
+    from numpy.typing import NDArray
 
+    # x, y, Manning's n, relative path length and panel markers of a cross-section
+    SectionGeometry = tuple[
+        NDArray[np.float64],
+        NDArray[np.float64],
+        NDArray[np.float64],
+        NDArray[np.float64],
+        NDArray[np.float64],
+    ]
+    # the geometry and water levels of a section in a batch, and whether it is closed
+    BatchInput = tuple[
+        NDArray[np.float64],
+        NDArray[np.float64],
+        NDArray[np.float64],
+        NDArray[np.float64],
+        NDArray[np.float64],
+        NDArray[np.float64],
+        bool,
+    ]
 
-def calculate_cross_section_conveyance(
+MINIMUM_PERIMETER_THRESHOLD = 1e-8
+# water levels are sampled at this interval between the elevations of each section
+WATER_LEVEL_INTERVAL = 0.05
+# adaptive sampling stops refining an interval once the conveyance at its midpoint differs from a
+# straight line between its ends by less than this proportion of the maximum conveyance
+ADAPTIVE_TOLERANCE = 1e-3
+# number of straight segments used to represent the perimeter of a circular conduit
+CIRCULAR_CONDUIT_SEGMENTS = 64
+# maximum number of (section, water level, point) values calculated together in a batch
+MAX_BATCH_SIZE = 2_000_000
+
+
+def calculate_cross_section_conveyance(  # noqa: PLR0913
     x: NDArray[np.float64],
     y: NDArray[np.float64],
     n: NDArray[np.float64],
     rpl: NDArray[np.float64],
     panel_markers: NDArray[np.float64],
+    max_levels: int | None = None,
 ) -> pd.Series:
     """
     Calculate the conveyance of a cross-section by summing the conveyance
@@ -29,6 +69,8 @@ def calculate_cross_section_conveyance(
         n (NDArray[np.float64]): Manning's n values for each segment.
         rpl (NDArray[np.float64]): Relative Path Length values for each segment.
         panel_markers (NDArray[np.float64]): Boolean array indicating the start of each panel.
+        max_levels (int, optional): If given, water levels are sampled adaptively, up to this
+            many levels. See ``sample_conveyance``. Defaults to None, meaning every level.
 
     Returns:
         pd.Series: A pandas Series containing the conveyance values indexed by water levels.
@@ -44,44 +86,397 @@ def calculate_cross_section_conveyance(
             result = calculate_cross_section_conveyance(x, y, n, rpl, panel_markers)
             print(result)
     """
-    water_levels = insert_intermediate_wls(np.unique(y), threshold=0.05)
-    area, length, mannings = calculate_geometry(x, y, n, water_levels)
+
+    def conveyance(water_levels: NDArray[np.float64]) -> pd.Series:
+        area, length, mannings = calculate_geometry(x, y, n, water_levels)
+        return sum_conveyance(y, rpl, panel_markers, water_levels, area, length, mannings)
+
+    return sample_conveyance(conveyance, y, max_levels)
+
+
+def sum_conveyance(  # noqa: PLR0913
+    y: NDArray[np.float64],
+    rpl: NDArray[np.float64],
+    panel_markers: NDArray[np.float64],
+    water_levels: NDArray[np.float64],
+    area: NDArray[np.float64],
+    length: NDArray[np.float64],
+    mannings: NDArray[np.float64],
+) -> pd.Series:
+    """
+    Sum the conveyance of each wet section within each panel of a cross-section, from the
+    geometry of each segment below each water level.
+
+    Args:
+        y (NDArray[np.float64]): The y-coordinates of the cross-section.
+        rpl (NDArray[np.float64]): Relative Path Length values for each segment.
+        panel_markers (NDArray[np.float64]): Boolean array indicating the start of each panel.
+        water_levels (NDArray[np.float64]): The water levels to calculate conveyance at.
+        area (NDArray[np.float64]): Area of each segment below each water level.
+        length (NDArray[np.float64]): Wetted length of each segment below each water level.
+        mannings (NDArray[np.float64]): Manning's n integrated along each wetted segment.
+
+    Returns:
+        pd.Series: A pandas Series containing the conveyance values indexed by water levels.
+    """
+    if len(y) < 2:  # noqa: PLR2004
+        # a single point has no segments to convey any flow
+        return pd.Series(np.zeros_like(water_levels, dtype=np.float64), index=water_levels)
+
     panel = panel_markers.cumsum()[:-1]
 
     intersection = (y[:-2] < water_levels[:, np.newaxis]) & (y[1:-1] >= water_levels[:, np.newaxis])
     section_markers = np.hstack([np.full((intersection.shape[0], 1), False), intersection])
     section = section_markers.cumsum(axis=1)
 
-    conveyance = np.zeros_like(water_levels)
+    # each combination of panel and (wet) section is summed separately, which is done for all
+    # water levels at once by giving every combination at every level its own bin
+    n_sections = section.max() + 1
+    groups, group_idx = np.unique((panel * n_sections + section).ravel(), return_inverse=True)
+    n_levels = len(water_levels)
+    bins = group_idx.reshape(section.shape) + np.arange(n_levels)[:, np.newaxis] * len(groups)
+
+    def sum_groups(values: NDArray[np.float64]) -> NDArray[np.float64]:
+        sums = np.bincount(bins.ravel(), weights=values.ravel(), minlength=n_levels * len(groups))
+        # weighted counts are already floats, so this doesn't copy them
+        return sums.astype(np.float64, copy=False).reshape(n_levels, len(groups))
+
+    total_area = sum_groups(area)
+    total_length = sum_groups(length)
+    total_mannings = sum_groups(mannings)
 
-    for i in range(panel.max() + 1):
-        in_panel = panel == i
-        if not in_panel.any():
-            continue
+    # relative path length of each panel is taken from its first segment
+    panels, first_segment = np.unique(panel, return_index=True)
+    rpl_panels = np.sqrt(rpl[:-1][first_segment])
+    rpl_panels[rpl_panels == 0] = 1
+    rpl_groups = rpl_panels[np.searchsorted(panels, groups // n_sections)]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        conveyance = np.where(
+            total_length >= MINIMUM_PERIMETER_THRESHOLD,
+            total_area ** (5 / 3) * total_length ** (1 / 3) / (total_mannings * rpl_groups),
+            0,
+        ).sum(axis=1)
 
-        rpl_panel = np.sqrt(rpl[:-1][in_panel][0])
-        rpl_panel = 1 if rpl_panel == 0 else rpl_panel
+    return pd.Series(conveyance, index=water_levels)
+
+
+def calculate_closed_conveyance(
+    x: NDArray[np.float64],
+    y: NDArray[np.float64],
+    n: NDArray[np.float64],
+    max_levels: int | None = None,
+) -> pd.Series:
+    """
+    Calculate the conveyance of a closed cross-section, such as a conduit, up to its soffit.
+
+    The section is a closed polygon traversed anticlockwise, so that the invert runs from left
+    to right and the soffit from right to left. The area above the soffit is then subtracted
+    from the area above the invert, and the wetted soffit is included in the perimeter.
+
+    Args:
+        x (NDArray[np.float64]): The x-coordinates of the polygon, ending at its first point.
+        y (NDArray[np.float64]): The y-coordinates of the polygon, ending at its first point.
+        n (NDArray[np.float64]): Manning's n values for each segment.
+        max_levels (int, optional): If given, water levels are sampled adaptively, up to this
+            many levels. See ``sample_conveyance``. Defaults to None, meaning every level.
+
+    Returns:
+        pd.Series: A pandas Series containing the conveyance values indexed by water levels.
+    """
+
+    def conveyance(water_levels: NDArray[np.float64]) -> pd.Series:
+        area, length, mannings = calculate_geometry(x, y, n, water_levels)
+        return sum_closed_conveyance(water_levels, area, length, mannings)
+
+    return sample_conveyance(conveyance, y, max_levels)
+
+
+def sample_conveyance(
+    conveyance: Callable[[NDArray[np.float64]], pd.Series],
+    y: NDArray[np.float64],
+    max_levels: int | None = None,
+) -> pd.Series:
+    """
+    Sample the conveyance of a cross-section at water levels between its elevations.
+
+    By default, conveyance is calculated at every elevation of the section and at intervals of
+    ``WATER_LEVEL_INTERVAL`` between them. If ``max_levels`` is given, at most this many of these
+    levels are calculated instead, in two passes:
+
+    1. Every elevation of the section and the level just above it, as this is where any spikes
+       in conveyance begin, plus evenly spaced levels between them, using up to half of
+       ``max_levels``.
+    2. Every level within the intervals of the first pass where conveyance decreases, or where it
+       curves by more than ``ADAPTIVE_TOLERANCE`` of the maximum conveyance, in order of
+       curvature until ``max_levels`` is reached.
+
+    Args:
+        conveyance (Callable[[NDArray[np.float64]], pd.Series]): Function calculating the
+            conveyance of the section at an array of water levels.
+        y (NDArray[np.float64]): The y-coordinates of the cross-section.
+        max_levels (int, optional): Maximum number of water levels to calculate. This is
+            exceeded only if the section has more than ``max_levels / 2`` unique elevations, as
+            these are always calculated along with the level just above each. Defaults to None,
+            meaning every level.
+
+    Returns:
+        pd.Series: A pandas Series containing the conveyance values indexed by water levels.
+    """
+    water_levels = insert_intermediate_wls(np.unique(y), threshold=WATER_LEVEL_INTERVAL)
+    if max_levels is None:
+        return conveyance(water_levels)
+
+    initial = initial_level_indices(water_levels, y, max_levels)
+    initial_conveyance = conveyance(water_levels[initial])
+    refined = refined_level_indices(water_levels, initial, initial_conveyance, max_levels)
+    if len(refined) == 0:
+        return initial_conveyance
+    return pd.concat([initial_conveyance, conveyance(water_levels[refined])]).sort_index()
+
+
+def initial_level_indices(
+    water_levels: NDArray[np.float64],
+    y: NDArray[np.float64],
+    max_levels: int,
+) -> NDArray[np.int64]:
+    """Returns the indices of the water levels calculated in the first pass of adaptive
+    sampling, being every elevation of the section and the level just above it, so that any
+    spike starting there is seen, and evenly spaced levels between them"""
+    if max_levels >= len(water_levels):
+        return np.arange(len(water_levels))
+    elevations = np.searchsorted(water_levels, np.unique(y))
+    elevations = np.union1d(elevations, np.minimum(elevations + 1, len(water_levels) - 1))
+    spare = max(max_levels // 2 - len(elevations), 1)
+    step = -(-len(water_levels) // spare)
+    return np.union1d(elevations, np.arange(0, len(water_levels), step))
+
+
+def refined_level_indices(
+    water_levels: NDArray[np.float64],
+    initial: NDArray[np.int64],
+    initial_conveyance: pd.Series,
+    max_levels: int,
+) -> NDArray[np.int64]:
+    """Returns the indices of the water levels calculated in the second pass of adaptive
+    sampling, filling in the intervals of the first pass where conveyance decreases or curves"""
+    values = initial_conveyance.to_numpy()
+    levels = water_levels[initial]
+
+    # deviation of each level from a straight line between the levels either side
+    deviation = np.zeros(len(values))
+    if len(values) > 2:  # noqa: PLR2004
+        fraction = (levels[1:-1] - levels[:-2]) / (levels[2:] - levels[:-2])
+        deviation[1:-1] = np.abs(values[1:-1] - values[:-2] - fraction * (values[2:] - values[:-2]))
+
+    # intervals are scored by the curvature at either end, and always refined near a decrease
+    score = np.maximum(deviation[:-1], deviation[1:])
+    decreasing = np.diff(values) < 0
+    near_decrease = decreasing.copy()
+    near_decrease[1:] |= decreasing[:-1]
+    near_decrease[:-1] |= decreasing[1:]
+    score[near_decrease] = np.inf
+
+    tolerance = ADAPTIVE_TOLERANCE * max(np.max(values), np.finfo(np.float64).tiny)
+    gaps = np.diff(initial) - 1
+    budget = max_levels - len(initial)
+    refined = []
+    for interval in np.argsort(-score, kind="stable"):
+        if score[interval] <= tolerance:
+            break
+        if 0 < gaps[interval] <= budget:
+            refined.append(np.arange(initial[interval] + 1, initial[interval + 1]))
+            budget -= gaps[interval]
+    if not refined:
+        return np.array([], dtype=np.int64)
+    return np.sort(np.concatenate(refined))
+
+
+def sum_closed_conveyance(
+    water_levels: NDArray[np.float64],
+    area: NDArray[np.float64],
+    length: NDArray[np.float64],
+    mannings: NDArray[np.float64],
+) -> pd.Series:
+    """
+    Sum the conveyance of a closed cross-section, which is treated as a single panel.
 
-        for j in range(section.max() + 1):
-            in_section = section == j
-            in_panel_and_section = in_panel & in_section
-            if not in_panel_and_section.any():
-                continue
+    Args:
+        water_levels (NDArray[np.float64]): The water levels to calculate conveyance at.
+        area (NDArray[np.float64]): Signed area of each segment below each water level.
+        length (NDArray[np.float64]): Wetted length of each segment below each water level.
+        mannings (NDArray[np.float64]): Manning's n integrated along each wetted segment.
 
-            total_area = np.where(in_panel_and_section, area, 0).sum(axis=1)
-            total_length = np.where(in_panel_and_section, length, 0).sum(axis=1)
-            total_mannings = np.where(in_panel_and_section, mannings, 0).sum(axis=1)
+    Returns:
+        pd.Series: A pandas Series containing the conveyance values indexed by water levels.
+    """
+    # rounding can leave a tiny negative area at the invert
+    total_area = np.maximum(area.sum(axis=-1), 0)
+    total_length = length.sum(axis=-1)
+    total_mannings = mannings.sum(axis=-1)
 
-            with np.errstate(divide="ignore", invalid="ignore"):
-                conveyance += np.where(
-                    total_length >= MINIMUM_PERIMETER_THRESHOLD,
-                    total_area ** (5 / 3) * total_length ** (1 / 3) / (total_mannings * rpl_panel),
-                    0,
-                )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        conveyance = np.where(
+            total_length >= MINIMUM_PERIMETER_THRESHOLD,
+            total_area ** (5 / 3) * total_length ** (1 / 3) / total_mannings,
+            0,
+        )
 
     return pd.Series(conveyance, index=water_levels)
 
 
+@overload
+def colebrook_white_to_mannings(ks: float) -> float: ...
+
+
+@overload
+def colebrook_white_to_mannings(ks: NDArray[np.float64]) -> NDArray[np.float64]: ...
+
+
+def colebrook_white_to_mannings(ks: float | NDArray[np.float64]) -> float | NDArray[np.float64]:
+    """Approximates Manning's n from a Colebrook-White roughness height (m), using the Strickler
+    relation n = ks^(1/6) / (8.25 * sqrt(g)). This is only valid for fully rough turbulent flow,
+    so conveyance calculated this way is an approximation of that used by Flood Modeller."""
+    return np.power(ks, 1 / 6) / (8.25 * np.sqrt(9.81))
+
+
+def rectangular_conduit_geometry(  # noqa: PLR0913
+    invert: float,
+    width: float,
+    height: float,
+    n_invert: float,
+    n_walls: float,
+    n_soffit: float,
+) -> SectionGeometry:
+    """Returns the closed geometry of a rectangular conduit, with the Manning's n of each side"""
+    x = np.array([0, 0, width, width, 0], dtype=np.float64)
+    y = np.array([height, 0, 0, height, height], dtype=np.float64) + invert
+    n = np.array([n_walls, n_invert, n_walls, n_soffit, n_soffit], dtype=np.float64)
+    return _closed_geometry(x, y, n)
+
+
+def circular_conduit_geometry(
+    invert: float,
+    diameter: float,
+    n_below_axis: float,
+    n_above_axis: float,
+) -> SectionGeometry:
+    """Returns the closed geometry of a circular conduit, approximated by
+    ``CIRCULAR_CONDUIT_SEGMENTS`` straight segments starting from the left of its axis"""
+    radius = diameter / 2
+    segments = np.arange(CIRCULAR_CONDUIT_SEGMENTS + 1)
+    theta = np.pi + 2 * np.pi * segments / CIRCULAR_CONDUIT_SEGMENTS
+    x = radius + radius * np.cos(theta)
+    y = invert + radius + radius * np.sin(theta)
+    # start and end exactly on the axis, and at the invert and crown, despite rounding
+    x[[0, -1]] = 0
+    y[[0, -1]] = invert + radius
+    y[CIRCULAR_CONDUIT_SEGMENTS // 4] = invert
+    y[3 * CIRCULAR_CONDUIT_SEGMENTS // 4] = invert + diameter
+    n = np.where(segments < CIRCULAR_CONDUIT_SEGMENTS // 2, n_below_axis, n_above_axis)
+    return _closed_geometry(x, y, n.astype(np.float64))
+
+
+def symmetric_conduit_geometry(
+    x: NDArray[np.float64],
+    y: NDArray[np.float64],
+    n: NDArray[np.float64],
+) -> SectionGeometry:
+    """Returns the closed geometry of a conduit defined by the half-widths and elevations of its
+    right hand side, from invert to crown, with the Manning's n of each segment. The crown is
+    closed by a horizontal segment using the last Manning's n."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    # down the left hand side, across the invert, up the right hand side and across the crown
+    x = np.concatenate([-x[::-1], x, x[-1:] * -1])
+    y = np.concatenate([y[::-1], y, y[-1:]])
+    n = np.concatenate([n[-2::-1], n[:1], n[:-1], n[-1:], n[-1:]])
+    return _closed_geometry(x, y, n)
+
+
+def _closed_geometry(
+    x: NDArray[np.float64],
+    y: NDArray[np.float64],
+    n: NDArray[np.float64],
+) -> SectionGeometry:
+    # closed sections are a single panel, so relative path length and panels have no effect
+    return x, y, n, np.ones_like(x), np.zeros_like(x, dtype=np.bool_)
+
+
+def interpolate_geometry(
+    upstream: SectionGeometry,
+    downstream: SectionGeometry,
+    weight: float,
+) -> SectionGeometry:
+    """
+    Interpolate the geometry of a cross-section between an upstream and downstream section.
+
+    Points of both sections are matched by their proportional distance along each section, so
+    the interpolated section has a point wherever either section does. Coordinates are
+    interpolated linearly between the sections, as are the Manning's n and relative path length
+    of each segment, while panel markers are taken from the nearest section.
+
+    Args:
+        upstream (SectionGeometry): The geometry of the upstream section.
+        downstream (SectionGeometry): The geometry of the downstream section.
+        weight (float): Proportion of the distance from the upstream to the downstream section.
+
+    Returns:
+        SectionGeometry: The x, y, Manning's n, relative path length and panel markers of the
+        interpolated section.
+    """
+    upstream_fraction = _fraction_along(upstream[0], upstream[1])
+    downstream_fraction = _fraction_along(downstream[0], downstream[1])
+    fraction = np.union1d(upstream_fraction, downstream_fraction)
+
+    def blend(
+        upstream_values: NDArray[np.float64],
+        downstream_values: NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        return (1 - weight) * upstream_values + weight * downstream_values
+
+    # coordinates are interpolated between points, whereas each segment takes its values from
+    # the segment containing its first point
+    x, y = (
+        blend(
+            np.interp(fraction, upstream_fraction, upstream[idx]),
+            np.interp(fraction, downstream_fraction, downstream[idx]),
+        )
+        for idx in (0, 1)
+    )
+    n, rpl = (
+        blend(
+            _segment_values(fraction, upstream_fraction, upstream[idx]),
+            _segment_values(fraction, downstream_fraction, downstream[idx]),
+        )
+        for idx in (2, 3)
+    )
+
+    nearest, nearest_fraction = (
+        (upstream, upstream_fraction) if weight <= 0.5 else (downstream, downstream_fraction)  # noqa: PLR2004
+    )
+    panel_markers = np.isin(fraction, nearest_fraction[np.asarray(nearest[4], dtype=np.bool_)])
+    return x, y, n, rpl, panel_markers.astype(np.float64)
+
+
+def _fraction_along(x: NDArray[np.float64], y: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Returns the proportional distance of each point along a section"""
+    distance = np.concatenate([[0], np.cumsum(np.hypot(np.diff(x), np.diff(y)))])
+    if distance[-1] == 0:
+        return np.linspace(0, 1, len(x))
+    return distance / distance[-1]
+
+
+def _segment_values(
+    fraction: NDArray[np.float64],
+    section_fraction: NDArray[np.float64],
+    values: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    idx = np.searchsorted(section_fraction, fraction, side="right") - 1
+    return np.asarray(values, dtype=np.float64)[np.clip(idx, 0, len(values) - 1)]
+
+
 def calculate_geometry(
     x: NDArray[np.float64],
     y: NDArray[np.float64],
@@ -92,23 +487,24 @@ def calculate_geometry(
     Calculate area, length, weighted mannings for piecewise linear curve (x, y) below water_level.
 
     Args:
-        x (NDArray[np.float64]): 1D array of x-coordinates.
-        y (NDArray[np.float64]): 1D array of y-coordinates.
-        n (NDArray[np.float64]): 1D array to integrate over the length.
-        water_levels (NDArray[np.float64]): The horizontal reference line.
+        x (NDArray[np.float64]): 1D array of x-coordinates, or 2D for a batch of curves.
+        y (NDArray[np.float64]): 1D array of y-coordinates, or 2D for a batch of curves.
+        n (NDArray[np.float64]): 1D array to integrate over the length, or 2D for a batch.
+        water_levels (NDArray[np.float64]): The horizontal reference line, or 2D for a batch.
 
     Returns:
         NDArray[np.float64]: The area above the curve and under the reference line.
         NDArray[np.float64]: The length of the curve under the reference line.
         NDArray[np.float64]: Manning's n integrated along the curve under the reference line.
     """
-    h = water_levels[:, np.newaxis] - y
+    # leading dimensions (e.g. for a batch of sections) are broadcast
+    h = water_levels[..., np.newaxis] - y[..., np.newaxis, :]
 
-    x1 = x[:-1]
-    x2 = x[1:]
-    h1 = h[:, :-1]
-    h2 = h[:, 1:]
-    n1 = n[:-1]
+    x1 = x[..., np.newaxis, :-1]
+    x2 = x[..., np.newaxis, 1:]
+    h1 = h[..., :-1]
+    h2 = h[..., 1:]
+    n1 = n[..., np.newaxis, :-1]
 
     dx = x2 - x1
 
@@ -162,31 +558,382 @@ def insert_intermediate_wls(arr: NDArray[np.float64], threshold: float) -> NDArr
     # Calculate the number of points needed for each gap
     num_points = (gaps // threshold).astype(int)
 
-    # Prepare lists to hold the new points and results
-    new_points = [
-        np.linspace(start, end, num + 2, endpoint=False)
-        for start, end, num in zip(arr[:-1], arr[1:], num_points)
-    ]
+    # Each gap is split into num + 2 equal steps, as np.linspace(start, end, num + 2,
+    # endpoint=False) would, but for all gaps at once
+    num_steps = num_points + 2
+    gap_starts = np.cumsum(num_steps) - num_steps
+    step_idx = np.arange(num_steps.sum()) - np.repeat(gap_starts, num_steps)
+    new_points = step_idx * np.repeat(gaps / num_steps, num_steps) + np.repeat(arr[:-1], num_steps)
     end = np.array([arr[-1]])
-    return np.concatenate([*new_points, end])
+    return np.concatenate([new_points, end])
+
 
+@dataclass()
+class ConveyanceCacheStats:
+    """Class to hold statistics on the use of a ``ConveyanceCache``.
 
-@lru_cache
-def calculate_cross_section_conveyance_cached(
-    x: tuple[float],
-    y: tuple[float],
-    n: tuple[float],
-    rpl: tuple[float],
-    panel_markers: tuple[float],
+    Args:
+        hits (int): Number of curves found in the cache, in memory or on disk.
+        misses (int): Number of curves which had to be calculated.
+        evictions (int): Number of curves removed from memory to stay within the limits.
+        size (int): Number of curves currently held in memory.
+        nbytes (int): Memory currently used by the curves held in memory.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    nbytes: int
+
+
+class ConveyanceCache:
+    """Least recently used cache of conveyance curves, keyed on a digest of the section geometry
+    rather than the geometry itself.
+
+    The limits can be changed at any time by setting the attributes, and are applied when the
+    next curve is added.
+
+    Args:
+        max_size (int, optional): Maximum number of curves held in memory. Defaults to 4096.
+        max_bytes (int, optional): Maximum memory used by the curves held in memory. Defaults to
+            64 MiB.
+        directory (str | Path, optional): If given, curves are also saved to this directory so
+            that they can be reused in later sessions. Defaults to None.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4096,
+        max_bytes: int = 64 * 2**20,
+        directory: str | Path | None = None,
+    ):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.directory = None if directory is None else Path(directory)
+        self._curves: OrderedDict[str, pd.Series] = OrderedDict()
+        self._nbytes = 0
+        self._hits = self._misses = self._evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(
+        geometry: SectionGeometry,
+        closed: bool = False,
+        max_levels: int | None = None,
+    ) -> str:
+        """Returns a digest of the section geometry and how it is sampled, identifying its
+        conveyance curve"""
+        digest = hashlib.blake2b(__version__.encode(), digest_size=16)
+        if closed:
+            digest.update(b"closed")
+        if max_levels is not None:
+            digest.update(f"max_levels={max_levels}".encode())
+        for values, dtype in zip(geometry, (np.float64,) * 4 + (np.bool_,)):
+            array = np.ascontiguousarray(values, dtype=dtype)
+            digest.update(str(array.shape).encode())
+            digest.update(array.tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> pd.Series | None:
+        """Returns a copy of the conveyance curve for the key, or None if it isn't cached"""
+        with self._lock:
+            curve = self._curves.get(key)
+            if curve is not None:
+                self._curves.move_to_end(key)
+                self._hits += 1
+                return curve.copy()
+
+        curve = self._load(key)
+        with self._lock:
+            if curve is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._add(key, curve)
+            return curve.copy()
+
+    def put(self, key: str, curve: pd.Series) -> None:
+        """Adds a conveyance curve to the cache, evicting the least recently used curves as
+        needed"""
+        curve = curve.copy()
+        with self._lock:
+            self._add(key, curve)
+        self._save(key, curve)
+
+    def clear(self) -> None:
+        """Removes all curves held in memory and resets the statistics. Any curves saved to the
+        directory are kept"""
+        with self._lock:
+            self._curves.clear()
+            self._nbytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    @property
+    def stats(self) -> ConveyanceCacheStats:
+        with self._lock:
+            return ConveyanceCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._curves),
+                nbytes=self._nbytes,
+            )
+
+    def _add(self, key: str, curve: pd.Series) -> None:
+        if key in self._curves:
+            self._nbytes -= self._curves.pop(key).memory_usage(index=True)
+        self._curves[key] = curve
+        self._nbytes += curve.memory_usage(index=True)
+        while len(self._curves) > self.max_size or (
+            self._nbytes > self.max_bytes and len(self._curves) > 1
+        ):
+            _, evicted = self._curves.popitem(last=False)
+            self._nbytes -= evicted.memory_usage(index=True)
+            self._evictions += 1
+
+    def _load(self, key: str) -> pd.Series | None:
+        if self.directory is None:
+            return None
+        filepath = self.directory / f"{key}.npy"
+        if not filepath.is_file():
+            return None
+        try:
+            water_levels, conveyance = np.load(filepath)
+        except (OSError, ValueError):
+            logging.info("Ignoring unreadable cached conveyance curve: %s", filepath)
+            return None
+        return pd.Series(conveyance, index=water_levels)
+
+    def _save(self, key: str, curve: pd.Series) -> None:
+        if self.directory is None:
+            return
+        filepath = self.directory / f"{key}.npy"
+        # written to a temporary file first, so other processes never read a partial curve
+        temp_filepath = filepath.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with open(temp_filepath, "wb") as temp_file:
+                np.save(temp_file, np.vstack([curve.index.to_numpy(), curve.to_numpy()]))
+            temp_filepath.replace(filepath)
+        except OSError:
+            logging.info("Unable to save conveyance curve to %s", self.directory)
+
+
+# used by RIVER.conveyance, CONDUIT.conveyance and DAT.conveyance_curves
+CONVEYANCE_CACHE = ConveyanceCache()
+
+
+def calculate_cross_section_conveyance_cached(  # noqa: PLR0913
+    x: NDArray[np.float64],
+    y: NDArray[np.float64],
+    n: NDArray[np.float64],
+    rpl: NDArray[np.float64],
+    panel_markers: NDArray[np.float64],
+    closed: bool = False,
+    max_levels: int | None = None,
 ) -> pd.Series:
-    """Dummy function to allow for caching of the conveyance function as numpy arrays are not
-    hashable
+    """Calculate the conveyance of a cross-section, reusing the result from ``CONVEYANCE_CACHE``
+    if the same geometry has been calculated before. If ``closed``, the section is calculated
+    with ``calculate_closed_conveyance`` instead.
+    """
+    geometry = (x, y, n, rpl, panel_markers)
+    key = ConveyanceCache.key(geometry, closed, max_levels)
+    conveyance = CONVEYANCE_CACHE.get(key)
+    if conveyance is None:
+        x, y, n, rpl, panel_markers = map(np.asarray, geometry)
+        conveyance = _calculate_section(x, y, n, rpl, panel_markers, closed, max_levels)
+        CONVEYANCE_CACHE.put(key, conveyance)
+    return conveyance
+
+
+def calculate_conveyance_curves(
+    geometries: Sequence[SectionGeometry],
+    workers: int = 1,
+    cache: ConveyanceCache | None = None,
+    closed: Sequence[bool] | None = None,
+    max_levels: int | None = None,
+) -> list[pd.Series]:
     """
+    Calculate the conveyance curves of many cross-sections at once.
 
-    return calculate_cross_section_conveyance(
-        np.array(x),
-        np.array(y),
-        np.array(n),
-        np.array(rpl),
-        np.array(panel_markers),
+    Sections of a similar size are grouped into batches, and the geometry of all sections in a
+    batch is calculated together using arrays padded to the size of the largest section. The
+    results are identical to calling ``calculate_cross_section_conveyance`` for each section, or
+    ``calculate_closed_conveyance`` for each closed section.
+
+    Args:
+        geometries (Sequence[SectionGeometry]): The x, y, Manning's n, relative path length and
+            panel markers of each cross-section.
+        workers (int, optional): Number of processes used to calculate batches in parallel.
+            Defaults to 1, which calculates all batches in the current process.
+        cache (ConveyanceCache, optional): If given, curves are taken from the cache where
+            possible and any others are added to it once calculated. Defaults to None.
+        closed (Sequence[bool], optional): Whether each section is closed, such as a conduit.
+            Defaults to None, meaning no sections are closed.
+        max_levels (int, optional): If given, water levels of each section are sampled
+            adaptively, up to this many levels. See ``sample_conveyance``. Defaults to None,
+            meaning every level.
+
+    Returns:
+        list[pd.Series]: Conveyance curve for each cross-section, in the same order as
+        ``geometries``.
+    """
+    if closed is None:
+        closed = [False] * len(geometries)
+    conveyances: dict[int, pd.Series] = {}
+    keys = []
+    if cache is not None:
+        keys = [
+            ConveyanceCache.key(geometry, is_closed, max_levels)
+            for geometry, is_closed in zip(geometries, closed)
+        ]
+        for idx, key in enumerate(keys):
+            conveyance = cache.get(key)
+            if conveyance is not None:
+                conveyances[idx] = conveyance
+
+    pending = [idx for idx in range(len(geometries)) if idx not in conveyances]
+    water_levels = {
+        idx: insert_intermediate_wls(np.unique(geometries[idx][1]), threshold=WATER_LEVEL_INTERVAL)
+        for idx in pending
+    }
+    if max_levels is None:
+        conveyances.update(_calculate_batches(geometries, closed, water_levels, workers))
+    else:
+        # the two passes of adaptive sampling are each calculated for all sections together
+        initial = {
+            idx: initial_level_indices(water_levels[idx], geometries[idx][1], max_levels)
+            for idx in pending
+        }
+        initial_conveyances = _calculate_batches(
+            geometries,
+            closed,
+            {idx: water_levels[idx][initial[idx]] for idx in pending},
+            workers,
+        )
+        refined = {
+            idx: refined_level_indices(
+                water_levels[idx],
+                initial[idx],
+                initial_conveyances[idx],
+                max_levels,
+            )
+            for idx in pending
+        }
+        refined_conveyances = _calculate_batches(
+            geometries,
+            closed,
+            {idx: water_levels[idx][refined[idx]] for idx in pending if len(refined[idx])},
+            workers,
+        )
+        for idx in pending:
+            if idx in refined_conveyances:
+                conveyances[idx] = pd.concat(
+                    [initial_conveyances[idx], refined_conveyances[idx]],
+                ).sort_index()
+            else:
+                conveyances[idx] = initial_conveyances[idx]
+
+    if cache is not None:
+        for idx in sorted(water_levels):  # i.e. the calculated curves, in their original order
+            cache.put(keys[idx], conveyances[idx])
+    return [conveyances[idx] for idx in range(len(geometries))]
+
+
+def _calculate_batches(
+    geometries: Sequence[SectionGeometry],
+    closed: Sequence[bool],
+    water_levels: dict[int, NDArray[np.float64]],
+    workers: int,
+) -> dict[int, pd.Series]:
+    """Calculates the conveyance of each section at the given water levels, in batches"""
+    batches = _group_into_batches(
+        {idx: (len(levels), len(geometries[idx][0])) for idx, levels in water_levels.items()},
     )
+    batch_inputs: list[list[BatchInput]] = [
+        [(*geometries[idx], water_levels[idx], closed[idx]) for idx in batch] for batch in batches
+    ]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            batch_results = list(executor.map(_calculate_batch, batch_inputs))
+    else:
+        batch_results = [_calculate_batch(inputs) for inputs in batch_inputs]
+
+    conveyances: dict[int, pd.Series] = {}
+    for batch, batch_conveyances in zip(batches, batch_results):
+        conveyances.update(zip(batch, batch_conveyances))
+    return conveyances
+
+
+def _group_into_batches(sizes: dict[int, tuple[int, int]]) -> list[list[int]]:
+    """Groups sections of a similar size, given by their number of water levels and points, so
+    that no padded batch is larger than ``MAX_BATCH_SIZE``"""
+    batches: list[list[int]] = []
+    batch: list[int] = []
+    max_levels = max_points = 0
+    for idx in sorted(sizes, key=lambda idx: sizes[idx][0] * sizes[idx][1]):
+        n_levels = max(max_levels, sizes[idx][0])
+        n_points = max(max_points, sizes[idx][1])
+        if batch and (len(batch) + 1) * n_levels * n_points > MAX_BATCH_SIZE:
+            batches.append(batch)
+            batch = []
+            n_levels, n_points = sizes[idx]
+        batch.append(idx)
+        max_levels, max_points = n_levels, n_points
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def _calculate_section(  # noqa: PLR0913
+    x: NDArray[np.float64],
+    y: NDArray[np.float64],
+    n: NDArray[np.float64],
+    rpl: NDArray[np.float64],
+    panel_markers: NDArray[np.float64],
+    closed: bool,
+    max_levels: int | None,
+) -> pd.Series:
+    if closed:
+        return calculate_closed_conveyance(x, y, n, max_levels)
+    return calculate_cross_section_conveyance(x, y, n, rpl, panel_markers, max_levels)
+
+
+def _calculate_batch(batch: list[BatchInput]) -> list[pd.Series]:
+    """Calculates the geometry of a batch of sections together, before summing each section"""
+    n_levels = max(len(inputs[5]) for inputs in batch)
+    n_points = max(len(inputs[0]) for inputs in batch)
+
+    def pad(values: NDArray[np.float64], size: int) -> NDArray[np.float64]:
+        # repeating the last point adds zero-width segments, which are excluded afterwards
+        return np.pad(values.astype(np.float64), (0, size - len(values)), mode="edge")
+
+    x = np.stack([pad(inputs[0], n_points) for inputs in batch])
+    y = np.stack([pad(inputs[1], n_points) for inputs in batch])
+    n = np.stack([pad(inputs[2], n_points) for inputs in batch])
+    water_levels = np.stack(
+        [
+            np.pad(inputs[5], (0, n_levels - len(inputs[5])), constant_values=np.nan)
+            for inputs in batch
+        ],
+    )
+    area, length, mannings = calculate_geometry(x, y, n, water_levels)
+
+    conveyances = []
+    for idx, (_, y_i, _, rpl, panel_markers, wls, closed) in enumerate(batch):
+        wet = (idx, slice(len(wls)), slice(len(y_i) - 1))
+        if closed:
+            conveyance = sum_closed_conveyance(wls, area[wet], length[wet], mannings[wet])
+        else:
+            conveyance = sum_conveyance(
+                y_i,
+                rpl,
+                panel_markers,
+                wls,
+                area[wet],
+                length[wet],
+                mannings[wet],
+            )
+        conveyances.append(conveyance)
+    return conveyances
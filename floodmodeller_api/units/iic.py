@@ -85,10 +85,17 @@ class IIC(Jsonable):
     def update_label(self, old, new):
         self.data.loc[self.data["label"] == old, "label"] = new
 
-    def _get_diff(self, other):
-        return self.__eq__(other, return_diff=True)  # pylint: disable=unnecessary-dunder-call
+    def _get_diff(self, other, max_report=None):
+        return self.__eq__(  # pylint: disable=unnecessary-dunder-call
+            other,
+            return_diff=True,
+            max_report=max_report,
+        )
+
+    def _get_digest_state(self) -> dict:
+        return self.__dict__
 
-    def __eq__(self, other, return_diff=False):
+    def __eq__(self, other, return_diff=False, max_report=None):
         result = True
         diff = []
         result, diff = check_item_with_dataframe_equal(
@@ -96,5 +103,6 @@ class IIC(Jsonable):
             other.__dict__,
             name="Initial Conditions",
             diff=diff,
+            max_report=max_report,
         )
         return (result, diff) if return_diff else result
@@ -17,6 +17,7 @@ address: Jacobs UK Limited, Flood Modeller, Cottons Centre, Cottons Lane, London
 from __future__ import annotations
 
 import logging
+from typing import TYPE_CHECKING
 
 import pandas as pd
 
@@ -33,6 +34,9 @@ from ._helpers import (
 )
 from .conveyance import calculate_cross_section_conveyance_cached
 
+if TYPE_CHECKING:
+    from .conveyance import SectionGeometry
+
 
 class RIVER(Unit):
     """Class to hold and process RIVER unit type. Currently only river units that are 'SECTION' types are supported.
@@ -313,12 +317,16 @@ class RIVER(Unit):
         Returns:
             pd.Series: A pandas Series containing the conveyance values indexed by water levels.
         """
-        return calculate_cross_section_conveyance_cached(
-            x=tuple(self._data.X.values),
-            y=tuple(self._data.Y.values),
-            n=tuple(self._data["Mannings n"].values),
-            rpl=tuple(self._data.RPL.values),
-            panel_markers=tuple(self._data.Panel.values),
+        return calculate_cross_section_conveyance_cached(*self._get_conveyance_geometry())
+
+    def _get_conveyance_geometry(self) -> SectionGeometry:
+        """Returns the x, y, Manning's n, relative path length and panel markers of the section"""
+        return (
+            self._data.X.to_numpy(),
+            self._data.Y.to_numpy(),
+            self._data["Mannings n"].to_numpy(),
+            self._data.RPL.to_numpy(),
+            self._data.Panel.to_numpy(),
         )
 
     @property
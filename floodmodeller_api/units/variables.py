@@ -72,10 +72,17 @@ class Variables(Jsonable):
 
         return var_block
 
-    def _get_diff(self, other):
-        return self.__eq__(other, return_diff=True)  # pylint: disable=unnecessary-dunder-call
+    def _get_diff(self, other, max_report=None):
+        return self.__eq__(  # pylint: disable=unnecessary-dunder-call
+            other,
+            return_diff=True,
+            max_report=max_report,
+        )
+
+    def _get_digest_state(self) -> dict:
+        return self.__dict__
 
-    def __eq__(self, other, return_diff=False):
+    def __eq__(self, other, return_diff=False, max_report=None):
         result = True
         diff = []
         result, diff = check_item_with_dataframe_equal(
@@ -83,5 +90,6 @@ class Variables(Jsonable):
             other.__dict__,
             name="Variables",
             diff=diff,
+            max_report=max_report,
         )
         return (result, diff) if return_diff else result
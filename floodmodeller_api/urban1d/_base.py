@@ -64,17 +64,24 @@ class UrbanUnit(Jsonable):
     def _write(self):
         raise NotImplementedError
 
-    def _diff(self, other):
-        diff = self._get_diff(other)
+    def _diff(self, other, max_report=None):
+        diff = self._get_diff(other, max_report=max_report)
         if diff[0]:
             logging.info("No difference, units are equivalent")
         else:
             logging.info("\n".join([f"{name}:  {reason}" for name, reason in diff[1]]))
 
-    def _get_diff(self, other):
-        return self.__eq__(other, return_diff=True)  # pylint: disable=unnecessary-dunder-call
+    def _get_diff(self, other, max_report=None):
+        return self.__eq__(  # pylint: disable=unnecessary-dunder-call
+            other,
+            return_diff=True,
+            max_report=max_report,
+        )
+
+    def _get_digest_state(self) -> dict:
+        return self.__dict__
 
-    def __eq__(self, other, return_diff=False):
+    def __eq__(self, other, return_diff=False, max_report=None):
         result = True
         diff = []
         result, diff = check_item_with_dataframe_equal(
@@ -82,6 +89,7 @@ class UrbanUnit(Jsonable):
             other.__dict__,
             name=f"{self._unit}.{self._subtype or ''}.{self._name}",
             diff=diff,
+            max_report=max_report,
         )
         return (result, diff) if return_diff else result
 
@@ -162,17 +170,24 @@ class UrbanSubsection(Jsonable):
 
         return block
 
-    def _diff(self, other):
-        diff = self._get_diff(other)
+    def _diff(self, other, max_report=None):
+        diff = self._get_diff(other, max_report=max_report)
         if diff[0]:
             logging.info("No difference, units are equivalent")
         else:
             logging.info("\n".join([f"{name}:  {reason}" for name, reason in diff[1]]))
 
-    def _get_diff(self, other):
-        return self.__eq__(other, return_diff=True)  # pylint: disable=unnecessary-dunder-call
+    def _get_diff(self, other, max_report=None):
+        return self.__eq__(  # pylint: disable=unnecessary-dunder-call
+            other,
+            return_diff=True,
+            max_report=max_report,
+        )
+
+    def _get_digest_state(self) -> dict:
+        return self.__dict__
 
-    def __eq__(self, other, return_diff=False):
+    def __eq__(self, other, return_diff=False, max_report=None):
         result = True
         diff = []
         result, diff = check_item_with_dataframe_equal(
@@ -180,5 +195,6 @@ class UrbanSubsection(Jsonable):
             other.__dict__,
             name=f"{self._attribute.upper()}",
             diff=diff,
+            max_report=max_report,
         )
         return (result, diff) if return_diff else result
@@ -16,15 +16,20 @@ address: Jacobs UK Limited, Flood Modeller, Cottons Centre, Cottons Lane, London
 
 from __future__ import annotations
 
+import hashlib
 import io
+import json
 import logging
+import marshal
+import threading
 import time
-from copy import deepcopy
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy, deepcopy
 from pathlib import Path
 from subprocess import DEVNULL, Popen
 from typing import Callable
 
-import requests
 from lxml import etree
 from tqdm import trange
 
@@ -41,6 +46,7 @@ from .constants import (
 from .logs import LF2, create_lf, error_2d_dict
 from .regexs import float_re, int_re, version_re
 from .util import handle_exception
+from .xml2d_schema import get_schema
 from .xml2d_template import xml2d_template
 from .xml_utilities import copy_tree_with_new_namespace
 
@@ -62,6 +68,94 @@ def value_from_string(value: str | list[str]):
     return str_value
 
 
+def _get_schema_version(root: etree._Element) -> str | None:
+    schema_location = root.attrib.get(XSI_SCHEMA_LOCATION_KEY)
+    if schema_location:
+        version_matches = version_re.findall(schema_location)
+        if version_matches:
+            return version_matches[0]
+    return None
+
+
+def _add_element_text(
+    elem: etree._Element,
+    element_dict: dict,
+    parent_dict: dict,
+    key: str,
+    multi_value_keys: set[str],
+) -> None:
+    """Adds the text of a fully read element to its dictionary, or replaces the dictionary with
+    the text if the element has no attributes"""
+    text = "" if elem.text is None else elem.text.strip()
+    if text == "":
+        return  # attributes and children have already been added
+    value: str | list[str] = text
+    if "\n" in text:
+        value = text.split("\n")  # Only used for output variables
+
+    no_attributes = len(elem.attrib)
+    if no_attributes == 0:
+        if key in multi_value_keys:
+            parent_dict[key][-1] = value_from_string(value)  # replace unused dict
+        else:
+            parent_dict[key] = value_from_string(value)
+
+    elif len(element_dict) == no_attributes:
+        element_dict["value"] = value_from_string(value)
+
+    else:
+        # keep the value straight after the attributes, before any children
+        items = list(element_dict.items())
+        element_dict.clear()
+        element_dict.update(items[:no_attributes])
+        element_dict["value"] = value_from_string(value)
+        element_dict.update(items[no_attributes:])
+
+
+def _snapshot_data(data: dict) -> dict[str, bytes]:
+    """Digests each entry of the data, so that the entries which have changed since the data was
+    last read or written can be found without holding a copy of it"""
+    return {key: _item_digest(item) for key, item in data.items()}
+
+
+def _item_digest(item) -> bytes:
+    try:
+        # version 2 doesn't depend on how many references there are to each object
+        serialised = marshal.dumps(item, 2)
+    except ValueError:
+        serialised = json.dumps(item, default=str).encode()
+    return hashlib.blake2b(serialised, digest_size=16).digest()
+
+
+def _restore_changed(data: dict, snapshot: dict, raw_snapshot: dict, tree_data: dict) -> dict:
+    """Returns the data as it was when raw_snapshot was taken, where snapshot is that of the
+    current data. The entries which have changed since are taken from tree_data, i.e. the data
+    read back from the unchanged XML tree, and all others are the current data themselves"""
+    return {
+        key: data[key] if snapshot.get(key) == digest else tree_data.get(key)
+        for key, digest in raw_snapshot.items()
+    }
+
+
+def _get_list_item(orig_dict, key, list_idx):
+    """Returns orig_dict[key][list_idx], or None if there is no such item"""
+    if not isinstance(orig_dict, dict):
+        return None
+    orig_list = orig_dict.get(key)
+    if not isinstance(orig_list, list) or list_idx >= len(orig_list):
+        return None
+    return orig_list[list_idx]
+
+
+def _merge_dict(target: dict, overrides: dict) -> None:
+    """Recursively merges overrides into target, replacing anything that isn't a dict"""
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge_dict(target[key], value)
+        else:
+            target[key] = deepcopy(value)
+
+
 def categorical_sort(itm, order, ns):
     try:
         return order[itm.tag.replace(ns, "")]
@@ -74,6 +168,8 @@ class XML2D(FMFile):
 
     Args:
         xml_filepath (str, optional): Full filepath to xml file.
+        backup (bool, optional): Whether to back up the file when it is loaded. Defaults to None,
+            which uses ``floodmodeller_api.backup.BACKUPS_ENABLED``.
 
     Output:
         Initiates 'XML2D' class object
@@ -89,32 +185,41 @@ class XML2D(FMFile):
     _schema_version: str | None = None
     OLD_FILE = 5
     GOOD_EXIT_CODE = 100
+    _attribute_names: tuple[str, ...] = (
+        "name",
+        "link1d",
+        "logfile",
+        "domains",
+        "restart_options",
+        "advanced_options",
+        "processor",
+        "unit_system",
+        "description",
+    )
 
     @handle_exception(when="read")
-    def __init__(self, xml_filepath: str | Path | None = None, from_json: bool = False):
+    def __init__(
+        self,
+        xml_filepath: str | Path | None = None,
+        from_json: bool = False,
+        backup: bool | None = None,
+    ):
         if from_json:
             return
         if xml_filepath is not None:
-            FMFile.__init__(self, xml_filepath)
+            FMFile.__init__(self, xml_filepath, backup=backup)
             self._read()
             self._log_path = self._filepath.with_suffix(".lf2")
         else:
             self._read(from_blank=True)
 
     def _read(self, from_blank=False):
-        # Read xml data
-
+        # Read xml data, building the tree and dictionary in a single pass
         if from_blank:
-            self._xmltree = etree.parse(io.StringIO(xml2d_template))
+            root, version, xml_dict = self._iterparse(io.BytesIO(xml2d_template.encode()))
         else:
-            self._xmltree = etree.parse(self._filepath)
-
-        version = None
-        schema_location = self._xmltree.getroot().attrib.get(XSI_SCHEMA_LOCATION_KEY)
-        if schema_location:
-            version_matches = version_re.findall(schema_location)
-            if version_matches:
-                version = version_matches[0]
+            root, version, xml_dict = self._iterparse(str(self._filepath))
+        self._xmltree = etree.ElementTree(root)
 
         if version is None:
             msg = rf"""
@@ -129,26 +234,68 @@ Fm2dXmlSchemaVersions for all available versions.
 
         self._update_schema_version(version)
 
-        self._create_dict()
+        self._data = xml_dict
+        self._raw_snapshot = _snapshot_data(self._data)
         for key, data in self._data.items():
             if key == "domain":
                 self.domains = {domain["domain_id"]: domain for domain in data}
             else:
                 setattr(self, key, data)
-        for attr in [
-            "name",
-            "link1d",
-            "logfile",
-            "domains",
-            "restart_options",
-            "advanced_options",
-            "processor",
-            "unit_system",
-            "description",
-        ]:
+        for attr in self._attribute_names:
             if attr not in self.__dict__:
                 setattr(self, attr, None)
 
+    @staticmethod
+    def _iterparse(source) -> tuple[etree._Element, str | None, dict]:
+        """Parses the XML, adding each element to the dictionary as soon as it has been read.
+
+        Some elements can have multiple instances e.g. domains. In these cases we need to have
+        the id of that instance as a new key on the domain
+        e.g. xml.domains[domain_id]["computational_area"]... etc
+
+        Returns:
+            tuple[etree._Element, str | None, dict]: Root element, schema version (if stated)
+            and dictionary of all elements
+        """
+        root = None
+        version = None
+        multi_value_keys: set[str] = set()
+        xml_dict: dict = {}
+        # (dict of the element's attributes and children, dict of its parent, element name)
+        stack: list[tuple[dict, dict, str]] = []
+        for event, elem in etree.iterparse(source, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = elem
+                    version = _get_schema_version(elem)
+                    str_version = str(LATEST_SCHEMA_VERSION if version is None else version)
+                    multi_value_keys = get_schema(str_version).multi_value_keys
+                    xml_dict["name"] = elem.attrib["name"]
+                    stack.append((xml_dict, {}, ""))
+                    continue
+
+                parent_dict = stack[-1][0]
+                key = elem.tag.rpartition("}")[2]
+                if key in multi_value_keys:
+                    parent_dict.setdefault(key, []).append({})
+                    child_dict = parent_dict[key][-1]
+                else:
+                    parent_dict[key] = {}  # Create new key for element
+                    child_dict = parent_dict[key]
+                child_dict.update(elem.attrib)
+                stack.append((child_dict, parent_dict, key))
+                continue
+
+            child_dict, parent_dict, key = stack.pop()
+            if elem is root:
+                break
+            _add_element_text(elem, child_dict, parent_dict, key, multi_value_keys)
+
+        if root is None:
+            msg = "XML file has no root element"
+            raise ValueError(msg)
+        return root, version, xml_dict
+
     def _update_schema_version(self, version: str | None = None):
         update_to_different_version = version != self._schema_version
         str_version = str(LATEST_SCHEMA_VERSION if version is None else version)
@@ -178,66 +325,33 @@ Fm2dXmlSchemaVersions for all available versions.
             self._xmltree._setroot(new_root)
 
         self._ns_key = "{" + self._xmltree.getroot().nsmap[None] + "}"
-
-        xsi_loc = schema_location.split()[1]
-        try:
-            xsd_bin = requests.get(xsi_loc).content
-            self._xsd = etree.parse(io.BytesIO(xsd_bin))
-            self._xsdschema = etree.XMLSchema(self._xsd)
-        except Exception:
-            self._xsd = etree.parse(Path(__file__).parent / "xsd_backup.xml")
-            self._xsdschema = etree.XMLSchema(self._xsd)
-        self._get_multi_value_keys()
-
-    def _create_dict(self):
-        """Iterate through XML Tree to add all elements as class attributes"""
-        xml_dict = {}
-        root = self._xmltree.getroot()
-
-        xml_dict.update({"name": root.attrib["name"]})
-
-        xml_dict = self._recursive_elements_to_dict(xml_dict, root)
-        self._raw_data = xml_dict
-        self._data = deepcopy(self._raw_data)
-
-    def _recursive_elements_to_dict(self, xml_dict, tree):
-        # Some elements can have multiple instances e.g. domains.
-        # In these cases we need to have the id of that instance as a new key on the domain
-        # e.g. xml.domains[domain_id]["computational_area"]... etc
-
-        for child in tree:
-            if isinstance(child, etree._Comment):
-                continue  # Skips comments in xml
-            child_key = child.tag.replace(self._ns_key, "")
-            if child_key in self._multi_value_keys:
-                if child_key in xml_dict:
-                    xml_dict[child_key].append({})
-                else:
-                    xml_dict[child_key] = [{}]
-                child_dict = xml_dict[child_key][-1]
-            else:
-                xml_dict[child_key] = {}  # Create new key for element
-                child_dict = xml_dict[child_key]
-            value = "" if child.text is None else child.text.strip()
-            if "\n" in value:
-                value = value.split("\n")  # Only used for output variables
-            if len(child.attrib) != 0:
-                child_dict.update(child.attrib)
-                if value != "":
-                    child_dict.update({"value": value_from_string(value)})
-
-                self._recursive_elements_to_dict(child_dict, child)
-
-            elif value == "":
-                self._recursive_elements_to_dict(child_dict, child)
-
-            elif child_key in self._multi_value_keys:
-                xml_dict[child_key] = xml_dict[child_key][:-1]  # remove unused dict
-                xml_dict[child_key].append(value_from_string(value))
-            else:
-                xml_dict[child_key] = value_from_string(value)
-
-        return xml_dict
+        self._set_schema()
+
+    def _set_schema(self):
+        # parsed and compiled schemas are shared between instances, see xml2d_schema
+        schema = get_schema(self._schema_version)
+        self._schema = schema
+        self._xsd = schema.xsd
+        self._xsdschema = schema.xmlschema
+        self._multi_value_keys = schema.multi_value_keys
+
+    def _get_snapshot_state(self) -> dict:
+        # lxml trees and compiled schemas can't be pickled, so the tree is stored as bytes and the
+        # schema is looked up again when the snapshot is read
+        state = {
+            key: value
+            for key, value in self.__dict__.items()
+            if key not in ("_schema", "_xsd", "_xsdschema")
+        }
+        if self._xmltree is not None:
+            state["_xmltree"] = etree.tostring(self._xmltree)
+        return state
+
+    def _set_snapshot_state(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if self._xmltree is not None:
+            self._xmltree = etree.ElementTree(etree.fromstring(self._xmltree))
+        self._set_schema()
 
     def _recursive_reorder_xml(self, parent="ROOT"):
         if parent == "ROOT":
@@ -249,26 +363,12 @@ Fm2dXmlSchemaVersions for all available versions.
                 self._recursive_reorder_xml(child)
 
     def _sort_from_schema(self, parent):
-        # find element in schema
+        # find order of child elements in schema
         parent_name = parent.tag.replace(self._ns_key, "")
-        schema_elem = self._xsd.find(
-            f".//{self._w3_schema}*[@name='{parent_name}']",
-        )
-        if schema_elem is not None:
-            if "type" in schema_elem.attrib:
-                schema_elem = self._xsd.find(
-                    f".//{self._w3_schema}*[@name='{schema_elem.attrib['type']}']",
-                )
-            else:
-                schema_elem = schema_elem.find(f"{self._w3_schema}complexType")
-        if schema_elem is None:
-            return parent.getchildren()
-
-        seq = schema_elem.find(f"{self._w3_schema}sequence")
-        if seq is None:
+        categorical_order = self._schema.element_order.get(parent_name)
+        if categorical_order is None:
             return parent.getchildren()
 
-        categorical_order = {sub_element.attrib["name"]: idx for idx, sub_element in enumerate(seq)}
         return sorted(
             parent.getchildren(),
             key=lambda x: categorical_sort(x, categorical_order, self._ns_key),
@@ -318,6 +418,9 @@ Fm2dXmlSchemaVersions for all available versions.
                     orig_dict[key] = None
 
         for key, item in new_dict.items():
+            if key in orig_dict and item == orig_dict[key]:
+                continue  # unchanged since last read or write, so already matches the tree
+
             if parent is None:
                 if parent_key == "ROOT":
                     parent = self._xmltree.getroot()
@@ -341,12 +444,18 @@ Fm2dXmlSchemaVersions for all available versions.
                 )
             elif isinstance(item, list) and isinstance(item[0], dict):
                 child_elems = parent.findall(f"{self._ns_key}{key}")
+                # the tree may hold a single element where the data now has a list of them
+                orig_items = (
+                    orig_dict[key] if isinstance(orig_dict[key], list) else [orig_dict[key]]
+                )
                 for i, _item in enumerate(item):
+                    if _item is _get_list_item(orig_dict, key, i):
+                        continue  # unchanged, e.g. other domains when only one has changed
                     if isinstance(_item, dict):
                         try:
                             self._recursive_update_xml(
                                 _item,
-                                orig_dict[key][i],
+                                orig_items[i],
                                 key,
                                 parent=child_elems[i],
                             )
@@ -467,9 +576,10 @@ Fm2dXmlSchemaVersions for all available versions.
                 new_element = etree.SubElement(parent, f"{self._ns_key}{add_key}")
                 new_element.text = str(add_item)
 
-    def _recursive_remove_data_xml(self, new_dict, parent, list_idx=None):
+    def _recursive_remove_data_xml(self, new_dict, parent, orig_dict=None):
         # This method will recursively work through the original dictionary and remove any
-        # items that are not in the new_dictionary and need to be removed.
+        # items that are not in the new_dictionary and need to be removed. Elements whose data
+        # is unchanged from orig_dict are skipped, as they already match the tree.
         list_idx = 0
         list_idx_key = ""
         for elem in parent:
@@ -482,30 +592,26 @@ Fm2dXmlSchemaVersions for all available versions.
                     list_idx_key = elem_key
                     list_idx = 0
                 try:
-                    self._recursive_remove_data_xml(new_dict[elem_key][list_idx], elem)
+                    new_item = new_dict[elem_key][list_idx]
+                    orig_item = _get_list_item(orig_dict, elem_key, list_idx)
+                    if new_item != orig_item:
+                        self._recursive_remove_data_xml(new_item, elem, orig_item)
                     list_idx += 1
                 except (IndexError, KeyError):
                     parent.remove(elem)
 
             elif elem_key in new_dict:
-                self._recursive_remove_data_xml(new_dict[elem_key], elem)
+                new_item = new_dict[elem_key]
+                orig_item = orig_dict.get(elem_key) if isinstance(orig_dict, dict) else None
+                if new_item != orig_item:
+                    self._recursive_remove_data_xml(new_item, elem, orig_item)
 
             else:
                 parent.remove(elem)
 
     def _update_dict(self):
         self._data = {}
-        for attr in [
-            "name",
-            "link1d",
-            "logfile",
-            "domains",
-            "restart_options",
-            "advanced_options",
-            "processor",
-            "unit_system",
-            "description",
-        ]:
+        for attr in self._attribute_names:
             if getattr(self, attr) is not None:
                 if attr == "domains":
                     self._data["domain"] = [domain for _, domain in self.domains.items()]
@@ -518,8 +624,16 @@ Fm2dXmlSchemaVersions for all available versions.
     @handle_exception(when="write")
     def _write(self) -> str:
         self._update_dict()
-        self._recursive_update_xml(self._data, self._raw_data, "ROOT")
-        self._recursive_remove_data_xml(self._data, self._xmltree.getroot())
+        snapshot = _snapshot_data(self._data)
+        if snapshot != self._raw_snapshot:
+            # the tree still holds the data as last read or written, so the changed entries are
+            # read back from it rather than keeping a copy of the data
+            _, _, tree_data = self._iterparse(io.BytesIO(etree.tostring(self._xmltree)))
+            raw_data = _restore_changed(self._data, snapshot, self._raw_snapshot, tree_data)
+            self._recursive_update_xml(self._data, raw_data, "ROOT")
+            self._recursive_remove_data_xml(self._data, self._xmltree.getroot(), raw_data)
+            # taken again, as updating the tree can reshape the data (e.g. single items to lists)
+            snapshot = _snapshot_data(self._data)
         etree.indent(self._xmltree, space="    ")
         try:
             self._validate()
@@ -527,19 +641,16 @@ Fm2dXmlSchemaVersions for all available versions.
             self._recursive_reorder_xml()
             self._validate()
 
-        self._raw_data = deepcopy(self._data)  # reset raw data to equal data
+        self._raw_snapshot = snapshot  # reset raw data to equal data
 
         return f'<?xml version="1.0" standalone="yes"?>\n{etree.tostring(self._xmltree.getroot()).decode()}'
 
-    def _get_multi_value_keys(self):
-        self._multi_value_keys = []
-        root = self._xsd.getroot()
-        for elem in root.findall(f".//{self._w3_schema}element"):
-            if elem.attrib.get("maxOccurs") not in (None, "0", "1"):
-                self._multi_value_keys.append(elem.attrib["name"])
-        self._multi_value_keys = set(self._multi_value_keys)
-
-    def diff(self, other: XML2D, force_print: bool = False) -> None:
+    def diff(
+        self,
+        other: XML2D,
+        force_print: bool = False,
+        max_report: int | None = None,
+    ) -> None:
         """Compares the XML2D class against another XML2D class to check whether they are
         equivalent, or if not, what the differences are. Two instances of a XML2D class are
         deemed equivalent if all of their attributes are equal except for the filepath and
@@ -555,8 +666,10 @@ Fm2dXmlSchemaVersions for all available versions.
             other (floodmodeller_api.XML2D): Other instance of a XML2D class
             force_print (bool): Forces the API to print every difference found, rather than
                 just the first 25 differences. Defaults to False.
+            max_report (int, optional): Maximum number of changed cells to list for each table of
+                data, such as river section data. Defaults to None, which lists every changed cell.
         """
-        self._diff(other, force_print=force_print)
+        self._diff(other, force_print=force_print, max_report=max_report)
 
     def update(self, version: str | Fm2dXmlSchemaVersions | None = None) -> None:
         """Updates the existing XML based on any altered attributes"""
@@ -589,6 +702,81 @@ Fm2dXmlSchemaVersions for all available versions.
         self._read()
         self._log_path = self._filepath.with_suffix(".lf2")
 
+    @handle_exception(when="generate variants from")
+    def generate_variants(
+        self,
+        overrides: Iterable[dict] | Mapping[str, dict],
+        out_dir: str | Path,
+        workers: int = 1,
+    ) -> list[Path]:
+        """Writes a new XML file for each set of overrides, using this XML2D as a template.
+
+        The template is validated once and each variant is then written from a copy of its XML
+        tree, so that only the overridden values are updated. Each set of overrides is a nested
+        dictionary of the values to change, which are merged into the template's attributes.
+        For example ``{"domains": {"Domain 1": {"time": {"total": 2.0}}}}`` changes only the
+        total time of 'Domain 1'. Lists are replaced as a whole.
+
+        Args:
+            overrides (Iterable[dict] | Mapping[str, dict]): Overrides for each variant. If given
+                as a mapping, the keys are used as the variant filenames (without '.xml'),
+                otherwise variants are named after the template with a numbered suffix.
+            out_dir (str | Path): Directory to write the variants to.
+            workers (int, optional): Number of threads used to write variants. Defaults to 1.
+
+        Returns:
+            list[Path]: Filepaths of the variants, in the same order as ``overrides``.
+        """
+        if isinstance(overrides, Mapping):
+            named_overrides = list(overrides.items())
+        else:
+            stem = self._filepath.stem if hasattr(self, "_filepath") else "variant"
+            named_overrides = [
+                (f"{stem}_{idx}", override) for idx, override in enumerate(overrides)
+            ]
+
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self._write()  # validates the template and brings its tree up to date
+
+        thread_local = threading.local()
+
+        def write_variant(name: str, override: dict) -> Path:
+            variant = self._copy()
+            if workers > 1:
+                # compiled schemas are not shared between threads
+                if not hasattr(thread_local, "xsdschema"):
+                    thread_local.xsdschema = etree.XMLSchema(self._xsd)
+                variant._xsdschema = thread_local.xsdschema
+            variant._apply_overrides(override)
+            variant._save(out_dir / f"{name}.xml")
+            return variant._filepath
+
+        if workers <= 1:
+            return [write_variant(name, override) for name, override in named_overrides]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda item: write_variant(*item), named_overrides))
+
+    def _copy(self) -> XML2D:
+        """Copies the XML tree and data, sharing everything else (e.g. the schema)"""
+        variant = copy(self)
+        variant._xmltree = deepcopy(self._xmltree)
+        for attr in self._attribute_names:
+            setattr(variant, attr, deepcopy(getattr(self, attr)))
+        return variant
+
+    def _apply_overrides(self, overrides: dict) -> None:
+        for key, value in overrides.items():
+            if key not in self._attribute_names:
+                msg = f"Unable to override '{key}', must be one of: {', '.join(self._attribute_names)}"
+                raise ValueError(msg)
+            current = getattr(self, key)
+            if isinstance(value, dict) and isinstance(current, dict):
+                _merge_dict(current, value)
+            else:
+                setattr(self, key, deepcopy(value))
+
     @handle_exception(when="simulate")
     def simulate(  # noqa: C901, PLR0912, PLR0913
         self,
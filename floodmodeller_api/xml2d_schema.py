@@ -0,0 +1,197 @@
+"""
+Flood Modeller Python API
+Copyright (C) 2025 Jacobs U.K. Limited
+
+This program is free software: you can redistribute it and/or modify it under the terms of the GNU General Public License
+as published by the Free Software Foundation, either version 3 of the License, or (at your option) any later version.
+
+This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without even the implied warranty
+of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License along with this program.  If not, see https://www.gnu.org/licenses/.
+
+If you have any query about this program or this License, please contact us at support@floodmodeller.com or write to the following
+address: Jacobs UK Limited, Flood Modeller, Cottons Centre, Cottons Lane, London, SE1 2QG, United Kingdom.
+"""
+
+from __future__ import annotations
+
+import io
+import logging
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+from lxml import etree
+
+from .constants import SCHEMA_URI_TPL
+
+W3_SCHEMA = r"{http://www.w3.org/2001/XMLSchema}"
+BUNDLED_SCHEMA_PATH = Path(__file__).parent / "xsd_backup.xml"
+SCHEMA_CACHE_DIR = Path(tempfile.gettempdir(), "floodmodeller_api_schemas")
+
+# Schemas are only downloaded from schema.floodmodeller.com when this is set to True
+ALLOW_SCHEMA_DOWNLOAD = False
+SCHEMA_DOWNLOAD_TIMEOUT = 10
+
+_registry: dict[str, XML2DSchema] = {}
+_bundled_schema: XML2DSchema | None = None
+_registry_lock = threading.Lock()
+
+
+@dataclass(eq=False)
+class XML2DSchema:
+    """Class to hold a parsed and compiled Flood Modeller 2D XML schema, shared by all XML2D
+    instances using the same schema version.
+
+    Args:
+        version (str): Schema version, e.g. '7.3'.
+        source (str): Where the schema was loaded from; 'download', 'cache' or 'bundled'.
+        xsd (etree._ElementTree): Parsed XSD document.
+        xmlschema (etree.XMLSchema): Compiled schema used for validation.
+        multi_value_keys (set[str]): Names of elements which may occur more than once.
+        element_order (dict[str, dict[str, int]]): Position of each child element within the
+            schema sequence of its parent, keyed by parent element name.
+    """
+
+    version: str
+    source: str
+    xsd: etree._ElementTree
+    xmlschema: etree.XMLSchema
+    multi_value_keys: set[str]
+    element_order: dict[str, dict[str, int]]
+
+    @classmethod
+    def from_xsd(cls, version: str, source: str, xsd: etree._ElementTree) -> XML2DSchema:
+        return cls(
+            version=version,
+            source=source,
+            xsd=xsd,
+            xmlschema=etree.XMLSchema(xsd),
+            multi_value_keys=_get_multi_value_keys(xsd),
+            element_order=_get_element_order(xsd),
+        )
+
+
+def _get_multi_value_keys(xsd: etree._ElementTree) -> set[str]:
+    return {
+        str(elem.attrib["name"])
+        for elem in xsd.getroot().findall(f".//{W3_SCHEMA}element")
+        if elem.attrib.get("maxOccurs") not in (None, "0", "1")
+    }
+
+
+def _get_element_order(xsd: etree._ElementTree) -> dict[str, dict[str, int]]:
+    """Finds the child sequence for every named schema element in a single pass over the XSD,
+    resolving named types in the same way as a search for the first element with that name"""
+
+    first_named: dict[str, etree._Element] = {}
+    for elem in xsd.getroot().iterdescendants(f"{W3_SCHEMA}*"):
+        if "name" in elem.attrib:
+            first_named.setdefault(str(elem.attrib["name"]), elem)
+
+    element_order: dict[str, dict[str, int]] = {}
+    for name, elem in first_named.items():
+        if "type" in elem.attrib:
+            definition = first_named.get(str(elem.attrib["type"]))
+        else:
+            definition = elem.find(f"{W3_SCHEMA}complexType")
+        if definition is None:
+            continue
+
+        seq = definition.find(f"{W3_SCHEMA}sequence")
+        if seq is None:
+            continue
+
+        element_order[name] = {
+            str(sub_element.attrib["name"]): idx
+            for idx, sub_element in enumerate(seq)
+            if "name" in sub_element.attrib
+        }
+    return element_order
+
+
+def _cache_path(version: str) -> Path:
+    return SCHEMA_CACHE_DIR / f"2d_{version}.xsd"
+
+
+def _load_from_cache(version: str) -> XML2DSchema | None:
+    cache_path = _cache_path(version)
+    if not cache_path.is_file():
+        return None
+    try:
+        return XML2DSchema.from_xsd(version, "cache", etree.parse(cache_path))
+    except Exception:
+        logging.info("Ignoring unreadable cached schema: %s", cache_path)
+        return None
+
+
+def _download(version: str) -> XML2DSchema | None:
+    try:
+        response = requests.get(SCHEMA_URI_TPL.format(version), timeout=SCHEMA_DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+        schema = XML2DSchema.from_xsd(
+            version,
+            "download",
+            etree.parse(io.BytesIO(response.content)),
+        )
+    except Exception:
+        logging.info("Unable to download schema version %s, using bundled schema", version)
+        return None
+
+    try:
+        SCHEMA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _cache_path(version).write_bytes(response.content)
+    except OSError:
+        logging.info("Unable to cache schema version %s", version)
+    return schema
+
+
+def _load_bundled() -> XML2DSchema:
+    # every version falling back to the bundled schema shares a single compiled copy
+    global _bundled_schema
+    if _bundled_schema is None:
+        _bundled_schema = XML2DSchema.from_xsd(
+            "bundled",
+            "bundled",
+            etree.parse(BUNDLED_SCHEMA_PATH),
+        )
+    return _bundled_schema
+
+
+def get_schema(version: str) -> XML2DSchema:
+    """Returns the schema for a given Flood Modeller 2D XML schema version.
+
+    Schemas are loaded once per process, first from the on-disk cache of previously downloaded
+    schemas and otherwise from the schema bundled with the API. The schema is only downloaded if
+    ``ALLOW_SCHEMA_DOWNLOAD`` has been set to True, in which case it is also saved to the on-disk
+    cache for future use.
+
+    Args:
+        version (str): Schema version, e.g. '7.3'.
+
+    Returns:
+        XML2DSchema: Parsed and compiled schema.
+    """
+    with _registry_lock:
+        if version in _registry:
+            return _registry[version]
+
+        schema = _load_from_cache(version)
+        if schema is None and ALLOW_SCHEMA_DOWNLOAD:
+            # a failed download is remembered too, so it is only attempted once per process
+            schema = _download(version) or _load_bundled()
+        if schema is None:
+            # not remembered, so the schema is still downloaded if later allowed
+            return _load_bundled()
+
+        _registry[version] = schema
+        return schema
+
+
+def clear_schema_registry() -> None:
+    """Clears all schemas held in memory, so that they are loaded again when next needed"""
+    with _registry_lock:
+        _registry.clear()